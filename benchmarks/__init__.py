@@ -0,0 +1,6 @@
+"""Benchmarks for ``statham``, runnable as modules, e.g.
+
+.. code-block:: bash
+
+    $ python -m benchmarks.orderer
+"""
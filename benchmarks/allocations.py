@@ -0,0 +1,148 @@
+"""Benchmark the memory allocated by validation, using ``tracemalloc``.
+
+Each case validates a representative value once its validators have
+been computed, reporting the peak memory allocated per node of the
+value, including the result. The command fails if any case allocates
+more than its budget, and the test suite checks the same budgets.
+"""
+from argparse import ArgumentParser
+import gc
+import re
+import sys
+import tracemalloc
+from typing import Any, List, NamedTuple
+
+from statham.schema.elements import (
+    AnyOf,
+    Array,
+    Element,
+    Integer,
+    Object,
+    OneOf,
+    String,
+)
+from statham.schema.exceptions import ValidationError
+from statham.schema.property import Property
+
+from benchmarks.suite import (
+    build_deep,
+    build_options,
+    build_wide,
+    deep_value,
+    Flat,
+    FLAT_VALUE,
+)
+
+
+class Case(NamedTuple):
+    """A value to validate, and the bytes it may allocate per node."""
+
+    name: str
+    element: Element
+    value: Any
+    budget: int
+
+
+CASES: List[Case] = [
+    Case("string", String(minLength=1, pattern="^[a-z]"), "value", 5120),
+    Case("integer", Integer(minimum=0, maximum=10), 3, 2560),
+    Case("flat", Flat, FLAT_VALUE, 1024),
+    Case(
+        "sparse",
+        Object.inline(
+            "Sparse",
+            properties={f"value{idx}": Property(String()) for idx in range(20)},
+        ),
+        {"value0": "value"},
+        2560,
+    ),
+    Case(
+        "wide",
+        build_wide(200),
+        {f"value{idx}": str(idx) for idx in range(200)},
+        192,
+    ),
+    Case("deep", build_deep(50), deep_value(50), 1024),
+    Case("array", Array(Flat), [FLAT_VALUE] * 100, 160),
+    Case(
+        "unique",
+        Array(Integer(), uniqueItems=True),
+        list(range(100)),
+        256,
+    ),
+    Case("any_of", AnyOf(*build_options(10)), {"kind": 0}, 3072),
+    Case("one_of", OneOf(*build_options(10)), {"kind": 9}, 20480),
+]
+"""Values to validate, from scalars to nested models and compositions.
+
+Budgets are roughly twice what is allocated by CPython 3.11.
+"""
+
+
+def nodes(value: Any) -> int:
+    """Count a value and the values nested within it."""
+    count = 0
+    stack = [value]
+    while stack:
+        current = stack.pop()
+        count += 1
+        if isinstance(current, dict):
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+    return count
+
+
+def allocated(element: Element, value: Any) -> int:
+    """Measure the peak memory allocated by validating a value, in bytes.
+
+    The value is validated once beforehand, so that the validators of
+    each element are already computed.
+    """
+    _validate(element, value)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _validate(element, value)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _validate(element: Element, value: Any) -> Any:
+    try:
+        return element(value)
+    except (TypeError, ValidationError):
+        return None
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--filter",
+        default="",
+        help="Regular expression matching the cases to run.",
+    )
+    args = parser.parse_args()
+    failed = False
+    print(f"{'case':<12} {'nodes':>6} {'bytes/node':>12} {'budget':>8}")
+    for case in CASES:
+        if not re.search(args.filter, case.name):
+            continue
+        count = nodes(case.value)
+        per_node = allocated(case.element, case.value) / count
+        flag = ""
+        if per_node > case.budget:
+            failed = True
+            flag = " !"
+        print(
+            f"{case.name:<12} {count:>6} {per_node:>12.0f} "
+            f"{case.budget:>8}{flag}"
+        )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
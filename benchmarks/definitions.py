@@ -0,0 +1,67 @@
+"""Benchmark JSON serialization with a large map of definitions.
+
+Each model has properties referring to definitions, and to a sub-schema
+shared between all models.
+"""
+from argparse import ArgumentParser
+import random
+from timeit import Timer
+from typing import Dict, List, Tuple
+
+from statham.schema.elements import Array, Element, Integer, Object, String
+from statham.schema.property import Property
+from statham.serializers import serialize_json
+
+
+def build_schema(
+    count: int, seed: int = 0
+) -> Tuple[List[Element], Dict[str, Element]]:
+    """Build ``count`` models and ``count`` definitions."""
+    rand = random.Random(seed)
+    definitions: Dict[str, Element] = {
+        f"code{idx}": String(pattern=f"^[A-Z]{{{idx}}}$")
+        for idx in range(count)
+    }
+    shared = Array(Integer(minimum=0), maxItems=10)
+    models: List[Element] = []
+    for idx in range(count):
+        properties = {
+            f"code{dep_idx}": Property(
+                String(pattern=f"^[A-Z]{{{rand.randrange(count)}}}$")
+            )
+            for dep_idx in range(3)
+        }
+        properties["values"] = Property(shared)
+        models.append(Object.inline(f"Model{idx}", properties=properties))
+    root = Object.inline(
+        "Root",
+        properties={
+            f"model{idx}": Property(model) for idx, model in enumerate(models)
+        },
+    )
+    return [root], definitions
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 500, 1000, 2000],
+        help="Numbers of models and definitions to serialize.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'models':>8} {'seconds':>10} {'us/model':>10}")
+    for size in args.sizes:
+        elements, definitions = build_schema(size)
+        timer = Timer(
+            lambda: serialize_json(*elements, definitions=definitions)
+        )
+        seconds = min(timer.repeat(repeat=args.repeat, number=1))
+        print(f"{size:>8} {seconds:>10.4f} {seconds / size * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
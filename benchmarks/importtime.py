@@ -0,0 +1,102 @@
+"""Benchmark the time taken to import ``statham`` modules, using
+``python -X importtime``.
+
+Each module is imported in a fresh interpreter, reporting the median
+cumulative import time and the slowest of its dependencies. The command
+fails if a module loads any of the dependencies it should defer, such as
+``dateutil`` when importing :mod:`statham.schema.elements`, so it may be
+used as a regression check.
+"""
+from argparse import ArgumentParser
+from statistics import median
+import subprocess
+import sys
+from typing import Dict, List
+
+
+FORBIDDEN: Dict[str, List[str]] = {
+    "statham.schema.elements": [
+        "dateutil",
+        "json_ref_dict",
+        "statham.schema.optimizer",
+        "statham.schema.parser",
+        "yaml",
+    ],
+}
+"""Dependencies which each module should not load when imported."""
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Import a module in a new interpreter.
+
+    :return: The cumulative import time of each loaded module, in
+        microseconds.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times: Dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def forbidden_imports(module: str, times: Dict[str, int]) -> List[str]:
+    """List the dependencies loaded by a module which it should defer."""
+    return [
+        forbidden
+        for forbidden in FORBIDDEN.get(module, [])
+        if any(
+            name == forbidden or name.startswith(f"{forbidden}.")
+            for name in times
+        )
+    ]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--modules",
+        nargs="+",
+        default=["statham", "statham.schema.elements", "statham.__main__"],
+        help="Modules to import.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="Number of the slowest dependencies to report.",
+    )
+    args = parser.parse_args()
+    failed = False
+    print(f"{'module':<32} {'ms':>8}")
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        print(
+            f"{module:<32} {median(run[module] for run in runs) / 1000:>8.1f}"
+        )
+        slowest = sorted(
+            (name for name in runs[-1] if name != module),
+            key=lambda name: runs[-1][name],
+            reverse=True,
+        )
+        for name in slowest[: args.top]:
+            print(f"  {name:<30} {runs[-1][name] / 1000:>8.1f}")
+        forbidden = forbidden_imports(module, runs[-1])
+        if forbidden:
+            failed = True
+            print(f"  {module} should not import: {', '.join(forbidden)}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark parsing a schema with many repeated sub-schemas, with and
+without interning.
+
+Reports the time taken to parse, and the memory retained by the parsed
+elements.
+"""
+from argparse import ArgumentParser
+import gc
+from time import perf_counter
+import tracemalloc
+from typing import Any, Dict, Optional
+
+from statham.schema.interning import Interner
+from statham.schema.parser import parse
+
+
+def build_schema(count: int) -> Dict[str, Any]:
+    """Build a schema with ``count`` models, with similar properties."""
+    return {
+        "type": "object",
+        "title": "Root",
+        "properties": {
+            f"model{idx}": {
+                "type": "object",
+                "title": f"Model{idx}",
+                "properties": {
+                    "id": {"type": "string", "format": "uuid"},
+                    "name": {"type": "string", "minLength": 1},
+                    "tags": {"type": "array", "items": {"type": "string"}},
+                    "size": {"type": "integer", "minimum": idx % 10},
+                    "extra": {"anyOf": [{"type": "string"}, {"type": "null"}]},
+                },
+            }
+            for idx in range(count)
+        },
+    }
+
+
+def measure(schema: Dict[str, Any], interner: Optional[Interner]):
+    """Parse a schema, returning the seconds taken and bytes retained."""
+    gc.collect()
+    tracemalloc.start()
+    start = perf_counter()
+    elements = parse(schema, interner=interner)
+    seconds = perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del elements
+    return seconds, retained
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 5000],
+        help="Numbers of models to parse.",
+    )
+    args = parser.parse_args()
+    print(f"{'models':>8} {'interned':>9} {'seconds':>10} {'KiB':>10}")
+    for size in args.sizes:
+        schema = build_schema(size)
+        for interner in (None, Interner()):
+            seconds, retained = measure(schema, interner)
+            print(
+                f"{size:>8} {str(interner is not None):>9} "
+                f"{seconds:>10.4f} {retained / 1024:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark how declaration ordering scales with the number of models.
+
+Each model refers to a few of the models declared before it, so that the
+models form a DAG with shared dependencies.
+"""
+from argparse import ArgumentParser
+import random
+from timeit import Timer
+from typing import List
+
+from statham.schema.elements import Array, Element, Object, String
+from statham.schema.property import Property
+from statham.serializers.orderer import orderer
+
+
+def build_models(count: int, seed: int = 0) -> List[Element]:
+    """Build ``count`` models, each depending on up to three others."""
+    rand = random.Random(seed)
+    models: List[Element] = []
+    for idx in range(count):
+        properties = {"name": Property(String())}
+        for dep_idx in range(min(idx, 3)):
+            dependency = rand.choice(models)
+            properties[f"dep{dep_idx}"] = Property(
+                Array(dependency) if dep_idx % 2 else dependency
+            )
+        models.append(Object.inline(f"Model{idx}", properties=properties))
+    return models
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[500, 1000, 2000, 5000],
+        help="Numbers of models to order.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'models':>8} {'seconds':>10} {'us/model':>10}")
+    for size in args.sizes:
+        models = build_models(size)
+        timer = Timer(lambda: list(orderer(*reversed(models))))
+        seconds = min(timer.repeat(repeat=args.repeat, number=1))
+        print(f"{size:>8} {seconds:>10.4f} {seconds / size * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
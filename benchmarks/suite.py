@@ -0,0 +1,449 @@
+"""Benchmark validation, model construction, parsing and code generation.
+
+Results are written as JSON, so that they may be compared between
+commits, e.g.
+
+.. code-block:: bash
+
+    $ python -m benchmarks.suite --output before.json
+    $ git checkout my-branch
+    $ python -m benchmarks.suite --compare before.json
+
+Each benchmark reports the time per operation, where an operation is
+validating one value, constructing one instance, or parsing or
+serializing one schema or definition, along with the peak memory
+allocated by a single run.
+"""
+from argparse import ArgumentParser
+from functools import partial
+import gc
+import json
+import os
+import platform
+import re
+from statistics import median
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from timeit import Timer
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from json_ref_dict import RefDict
+
+import statham
+from statham.schema.elements import (
+    AllOf,
+    AnyOf,
+    Array,
+    Boolean,
+    Element,
+    Integer,
+    Not,
+    Null,
+    Number,
+    Object,
+    OneOf,
+    String,
+)
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.parser import parse
+from statham.schema.property import Property
+from statham.serializers import serialize_python
+from statham.serializers.orderer import orderer
+
+
+SCHEMA_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "tests", "jsonschemas"
+)
+
+DEFINITION_COUNTS = [50, 200, 800]
+"""Numbers of definitions in synthetic schemas.
+
+Time per definition should not grow with the number of definitions.
+"""
+
+
+class Benchmark(NamedTuple):
+    """A function to time, which performs ``ops`` operations per call."""
+
+    name: str
+    run: Callable[[], Any]
+    ops: int
+
+
+BENCHMARKS: List[Callable[[], Iterator[Benchmark]]] = []
+
+
+def benchmark(
+    function: Callable[[], Iterator[Benchmark]]
+) -> Callable[[], Iterator[Benchmark]]:
+    """Register a function which yields benchmarks."""
+    BENCHMARKS.append(function)
+    return function
+
+
+def _validate(name: str, element: Element, values: List[Any]) -> Benchmark:
+    return Benchmark(
+        name, lambda: [element(value) for value in values], len(values)
+    )
+
+
+@benchmark
+def validation() -> Iterator[Benchmark]:
+    """Validate values of each type."""
+    yield _validate(
+        "validate.string",
+        String(minLength=1, maxLength=100, pattern="^[a-z]"),
+        [f"value{idx}" for idx in range(1000)],
+    )
+    yield _validate(
+        "validate.string.format",
+        String(format="uuid"),
+        [f"c9b0a3b4-1d2e-4f5a-8b6c-{idx:012d}" for idx in range(1000)],
+    )
+    yield _validate(
+        "validate.integer",
+        Integer(minimum=0, maximum=10000, multipleOf=1),
+        list(range(1000)),
+    )
+    yield _validate(
+        "validate.number",
+        Number(minimum=0, exclusiveMaximum=1000),
+        [idx / 3 for idx in range(1000)],
+    )
+    yield _validate("validate.boolean", Boolean(), [True, False] * 500)
+    yield _validate("validate.null", Null(), [None] * 1000)
+    yield _validate(
+        "validate.array",
+        Array(Integer(), minItems=1, uniqueItems=True),
+        [list(range(idx, idx + 10)) for idx in range(100)],
+    )
+
+
+class Flat(Object):
+    id = Property(String(format="uuid"), required=True)
+    name = Property(String(minLength=1), required=True)
+    size = Property(Integer(minimum=0))
+    price = Property(Number())
+    active = Property(Boolean(default=True))
+    tags = Property(Array(String()))
+
+
+FLAT_VALUE = {
+    "id": "c9b0a3b4-1d2e-4f5a-8b6c-7d8e9f0a1b2c",
+    "name": "flat",
+    "size": 3,
+    "price": 2.5,
+    "tags": ["a", "b"],
+}
+
+
+def build_wide(count: int) -> Element:
+    """Build a model with ``count`` properties."""
+    return Object.inline(
+        "Wide",
+        properties={
+            f"value{idx}": Property(String(), required=idx % 2 == 0)
+            for idx in range(count)
+        },
+    )
+
+
+def build_deep(depth: int) -> Element:
+    """Build ``depth`` models, each nested in the one before."""
+    model: Element = Object.inline(
+        "Deep0", properties={"value": Property(Integer())}
+    )
+    for idx in range(1, depth):
+        model = Object.inline(
+            f"Deep{idx}",
+            properties={
+                "value": Property(Integer()),
+                "child": Property(model),
+            },
+        )
+    return model
+
+
+def deep_value(depth: int) -> Dict[str, Any]:
+    value: Dict[str, Any] = {"value": 0}
+    for idx in range(1, depth):
+        value = {"value": idx, "child": value}
+    return value
+
+
+@benchmark
+def construction() -> Iterator[Benchmark]:
+    """Construct instances of flat, wide and deeply nested models."""
+    yield _validate("construct.flat", Flat, [FLAT_VALUE] * 200)
+    yield _validate(
+        "construct.wide",
+        build_wide(200),
+        [{f"value{idx}": str(idx) for idx in range(200)}] * 10,
+    )
+    yield _validate("construct.deep", build_deep(50), [deep_value(50)] * 10)
+    yield _validate("construct.array", Array(Flat), [[FLAT_VALUE] * 100])
+
+
+def build_options(count: int) -> List[Element]:
+    """Build ``count`` models, distinguished by the value of ``kind``."""
+    return [
+        Object.inline(
+            f"Option{idx}",
+            required=["kind"],
+            properties={
+                "kind": Property(Integer(const=idx)),
+                "value": Property(String()),
+            },
+        )
+        for idx in range(count)
+    ]
+
+
+@benchmark
+def composition() -> Iterator[Benchmark]:
+    """Validate values against composed elements.
+
+    Values match the last option, so that each option is tried.
+    """
+    options = build_options(10)
+    values = [{"kind": 9, "value": str(idx)} for idx in range(100)]
+    yield _validate("compose.any_of", AnyOf(*options), values)
+    yield _validate("compose.one_of", OneOf(*options), values)
+    yield _validate(
+        "compose.all_of",
+        AllOf(
+            String(minLength=1),
+            String(maxLength=20),
+            String(pattern="^value"),
+        ),
+        [f"value{idx}" for idx in range(1000)],
+    )
+    yield _validate("compose.not", Not(OneOf(*options)), [{"kind": 10}] * 100)
+
+
+def _parse_uri(uri: str) -> List[Element]:
+    return parse(RefDict.from_uri(uri))
+
+
+def _order(elements: List[Element]) -> List[ObjectMeta]:
+    return list(orderer(*elements))
+
+
+@benchmark
+def fixtures() -> Iterator[Benchmark]:
+    """Parse and serialize each schema in ``tests/jsonschemas``."""
+    for filename in sorted(os.listdir(SCHEMA_DIRECTORY)):
+        if not filename.endswith(".json"):
+            continue
+        name = filename[: -len(".json")]
+        uri = os.path.join(SCHEMA_DIRECTORY, f"{filename}#/")
+        yield Benchmark(f"parse.{name}", partial(_parse_uri, uri), 1)
+        elements = _parse_uri(uri)
+        yield Benchmark(
+            f"serialize.{name}",
+            partial(serialize_python, *elements),
+            1,
+        )
+
+
+def build_schema(count: int) -> Dict[str, Any]:
+    """Build a schema with ``count`` object definitions.
+
+    Each definition refers to up to two definitions before it.
+    """
+    definitions: Dict[str, Any] = {}
+    for idx in range(count):
+        properties: Dict[str, Any] = {
+            "name": {"type": "string", "minLength": 1},
+            "size": {"type": "integer", "minimum": idx % 10},
+        }
+        if idx:
+            properties["first"] = {
+                "$ref": f"#/definitions/model{(idx * 7) % idx}"
+            }
+            properties["second"] = {
+                "type": "array",
+                "items": {"$ref": f"#/definitions/model{idx - 1}"},
+            }
+        definitions[f"model{idx}"] = {
+            "type": "object",
+            "title": f"Model{idx}",
+            "properties": properties,
+        }
+    return {
+        "type": "object",
+        "title": "Root",
+        "properties": {"root": {"$ref": f"#/definitions/model{count - 1}"}},
+        "definitions": definitions,
+    }
+
+
+@benchmark
+def definitions() -> Iterator[Benchmark]:
+    """Parse, order and serialize schemas with many definitions."""
+    with TemporaryDirectory() as directory:
+        for count in DEFINITION_COUNTS:
+            path = os.path.join(directory, f"definitions{count}.json")
+            with open(path, "w", encoding="utf8") as file:
+                json.dump(build_schema(count), file)
+            uri = f"{path}#/"
+            elements = _parse_uri(uri)
+            yield Benchmark(
+                f"parse.definitions.{count}",
+                partial(_parse_uri, uri),
+                count,
+            )
+            yield Benchmark(
+                f"order.definitions.{count}",
+                partial(_order, elements),
+                count,
+            )
+            yield Benchmark(
+                f"serialize.definitions.{count}",
+                partial(serialize_python, *elements),
+                count,
+            )
+
+
+def peak_memory(function: Callable[[], Any]) -> int:
+    """Measure the peak memory allocated by calling ``function``, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(bench: Benchmark, repeat: int) -> Dict[str, Any]:
+    """Time a benchmark, returning its machine-readable result."""
+    bench.run()
+    timer = Timer(bench.run)
+    number, _ = timer.autorange()
+    times = [
+        seconds / number / bench.ops
+        for seconds in timer.repeat(repeat=repeat, number=number)
+    ]
+    return {
+        "ops": bench.ops,
+        "calls": number * repeat,
+        "min": min(times),
+        "median": median(times),
+        "peak_memory": peak_memory(bench.run),
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(pattern: str = "", repeat: int = 5) -> Dict[str, Any]:
+    """Run each benchmark with a name matching ``pattern``.
+
+    :return: Results, keyed by benchmark name, along with the
+        environment in which they were measured.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for function in BENCHMARKS:
+        for bench in function():
+            if not re.search(pattern, bench.name):
+                continue
+            results[bench.name] = result = measure(bench, repeat)
+            sys.stderr.write(
+                f"{bench.name:<36} {result['min'] * 1e6:>12.2f} us/op "
+                f"{result['peak_memory'] / 1024:>10.0f} KiB\n"
+            )
+    return {
+        "statham": statham.__version__,
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "benchmarks": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Print the change in time per operation from a baseline.
+
+    :return: Names of benchmarks which are slower by more than
+        ``threshold``, as a fraction of the baseline.
+    """
+    regressions = []
+    print(f"{'benchmark':<36} {'before':>12} {'after':>12} {'change':>8}")
+    for name, result in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if not before:
+            continue
+        change = result["min"] / before["min"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = " !"
+        print(
+            f"{name:<36} {before['min'] * 1e6:>12.2f} "
+            f"{result['min'] * 1e6:>12.2f} {change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--filter",
+        default="",
+        help="Regular expression matching the benchmarks to run.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--output", help="Path to write results to, instead of stdout."
+    )
+    parser.add_argument(
+        "--compare",
+        help="Path to previous results, to compare against. Exits with "
+        "an error if any benchmark is slower by more than the threshold.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Fraction by which a benchmark may be slower than before.",
+    )
+    args = parser.parse_args()
+    results = run(args.filter, repeat=args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as file:
+            json.dump(results, file, indent=2)
+    elif not args.compare:
+        json.dump(results, sys.stdout, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf8") as file:
+            baseline = json.load(file)
+        if compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
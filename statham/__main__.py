@@ -1,15 +1,26 @@
 from argparse import ArgumentParser, RawTextHelpFormatter
 from contextlib import contextmanager
 from logging import getLogger, INFO
-from os import path
-from typing import Iterator, TextIO, Tuple
+from os import makedirs, path
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+import sys
 from sys import argv, stdout
 
-from json_ref_dict import materialize, RefDict
+from json_ref_dict import RefDict
 
+from statham.bench import bench, format_bench, load_samples
+from statham.batch import (
+    BatchResult,
+    collect_inputs,
+    format_report,
+    generate_batch,
+    is_batch,
+)
+from statham.cache import SchemaCache
+from statham.watch import watch
 from statham.schema.parser import parse
-from statham.serializers import serialize_python
-from statham.titles import title_labeller
+from statham.serializers import serialize_python, serialize_python_package
 
 
 LOGGER = getLogger(__name__)
@@ -27,12 +38,12 @@ def parse_input_arg(input_arg: str) -> str:
     return input_arg
 
 
-@contextmanager
-def parse_args(args) -> Iterator[Tuple[str, TextIO]]:
-    """Parse arguments, abstracting IO in a context manager."""
-
+def build_parser() -> ArgumentParser:
+    """Build the parser for command-line arguments."""
     parser = ArgumentParser(
-        description="Generate statham models from JSON Schema files.",
+        description="""Generate statham models from JSON Schema files.
+
+To measure how a schema performs, see `statham bench --help`.""",
         formatter_class=RawTextHelpFormatter,
         add_help=False,
     )
@@ -47,6 +58,10 @@ If the target schema is not at the root of a document, specify the
 JSON Pointer in the same format as a JSON Schema `$ref`, e.g.
 `--input path/to/document.json#/definitions/schema`
 
+To generate many schemas at once, specify a directory or a glob
+pattern, e.g. `--input "schemas/**/*.json"`. The `--output`
+directory is then required.
+
 """,
     )
     optional = parser.add_argument_group("Optional arguments")
@@ -60,6 +75,82 @@ If the provided path is a directory, the command will derive the name
 from the input argument. If not passed, the command will write to
 stdout.
 
+""",
+    )
+    optional.add_argument(
+        "--select",
+        type=str,
+        action="append",
+        default=None,
+        metavar="NAME",
+        help="""Name of a definition in the input schema to generate. May be
+given more than once.
+
+Only the selected definitions, and the models they refer to, are
+parsed and generated.
+
+""",
+    )
+    optional.add_argument(
+        "--package",
+        action="store_true",
+        help="""Write a package to the `--output` directory, with a module for
+each model. Models are only imported from the package when they
+are first used.
+
+""",
+    )
+    optional.add_argument(
+        "--compiled",
+        action="store_true",
+        help="""Also generate a compiled function for each model, with which its
+instances are validated and constructed more quickly.
+
+""",
+    )
+    optional.add_argument(
+        "--cache",
+        type=str,
+        default=None,
+        help="""Directory in which to cache generated models.
+
+The cache is keyed by the content of every document referenced by
+the input, so unchanged schemas are not parsed again.
+
+""",
+    )
+    optional.add_argument(
+        "--manifest",
+        action="store_true",
+        help="""Treat the input as a manifest file, listing one schema to be
+generated per line.
+
+""",
+    )
+    optional.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="""Number of processes to use when generating many schemas.
+
+Defaults to the number of CPUs.
+
+""",
+    )
+    optional.add_argument(
+        "--incremental",
+        action="store_true",
+        help="""Only regenerate outputs whose referenced documents have changed
+since they were last generated.
+
+""",
+    )
+    optional.add_argument(
+        "--watch",
+        action="store_true",
+        help="""Regenerate outputs whenever their referenced documents change,
+until interrupted.
+
 """,
     )
     optional.add_argument(
@@ -68,7 +159,86 @@ stdout.
         action="help",
         help="Display this help message and exit.",
     )
-    parsed = parser.parse_args(args)
+    return parser
+
+
+def build_bench_parser() -> ArgumentParser:
+    """Build the parser for arguments to ``statham bench``."""
+    parser = ArgumentParser(
+        prog="statham bench",
+        description="Measure how a schema performs, from parsing to "
+        "validation.",
+        formatter_class=RawTextHelpFormatter,
+        add_help=False,
+    )
+    required = parser.add_argument_group("Required arguments")
+    required.add_argument(
+        "--input",
+        type=str,
+        required=True,
+        help="""Specify the path to the JSON Schema to be measured.
+
+Sample values are validated against the schema at this path.
+
+""",
+    )
+    optional = parser.add_argument_group("Optional arguments")
+    optional.add_argument(
+        "--samples",
+        type=str,
+        default=None,
+        help="""JSON file containing an array of sample values, or JSON Lines
+file, ending `.jsonl`, containing one sample value per line.
+
+If not passed, samples are generated from the schema.
+
+""",
+    )
+    optional.add_argument(
+        "--count",
+        type=int,
+        default=100,
+        help="""Number of samples to generate, if `--samples` is not passed.
+
+""",
+    )
+    optional.add_argument(
+        "--repeat",
+        type=int,
+        default=10,
+        help="""Number of times to validate each sample.
+
+""",
+    )
+    optional.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="""Seed with which to generate samples.
+
+""",
+    )
+    optional.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="""Number of the most expensive elements and keywords to list.
+
+""",
+    )
+    optional.add_argument(
+        "-h",
+        "--help",
+        action="help",
+        help="Display this help message and exit.",
+    )
+    return parser
+
+
+@contextmanager
+def parse_args(args) -> Iterator[Tuple[str, TextIO, Optional[str]]]:
+    """Parse arguments, abstracting IO in a context manager."""
+    parsed = build_parser().parse_args(args)
     input_arg: str = parse_input_arg(parsed.input)
     if parsed.output:
         if path.isdir(parsed.output):
@@ -77,23 +247,160 @@ stdout.
         else:
             output_path = parsed.output
         with open(output_path, "w", encoding="utf8") as file:
-            yield input_arg, file
+            yield input_arg, file, parsed.cache
         return
-    yield input_arg, stdout
+    yield input_arg, stdout, parsed.cache
     return
 
 
-def main(input_uri: str) -> str:
+def main(
+    input_uri: str,
+    cache: Optional[SchemaCache] = None,
+    select: Optional[List[str]] = None,
+    compiled: bool = False,
+) -> str:
     """Get a schema from a URI, and then return the generated python module.
 
     :param input_uri: URI of the target schema. This must follow the conventions
         of a JSON Schema ``"$ref"`` attribute.
+    :param cache: Optional :class:`~statham.cache.SchemaCache` from which to
+        load the generated module.
+    :param select: Optional names of definitions in the target schema. If
+        provided, only models reachable from these definitions are
+        generated.
+    :param compiled: Whether to generate a compiled function for each
+        model. See :mod:`statham.schema.compiled`.
     :return: Python module contents for generated models, as a string.
     """
-    schema = materialize(
-        RefDict.from_uri(input_uri), context_labeller=title_labeller()
+    if cache is not None:
+        entry = cache.load(input_uri, select=select)
+        if not compiled:
+            return entry.module
+        elements = entry.elements
+    else:
+        elements = parse(RefDict.from_uri(input_uri), select=select)
+    return serialize_python(*elements, compiled=compiled)
+
+
+def package_main(args) -> int:
+    """Generate a package of models described by command-line arguments,
+    including ``--package``.
+
+    :return: Exit code for the command.
+    """
+    parser = build_parser()
+    parsed = parser.parse_args(args)
+    if not parsed.output:
+        parser.error("--output is required when generating a package.")
+    if (
+        parsed.manifest
+        or parsed.incremental
+        or parsed.watch
+        or is_batch(parsed.input)
+    ):
+        parser.error("--package is not supported when generating many schemas.")
+    input_uri = parse_input_arg(parsed.input)
+    if parsed.cache:
+        elements = (
+            SchemaCache(parsed.cache)
+            .load(input_uri, select=parsed.select)
+            .elements
+        )
+    else:
+        elements = parse(RefDict.from_uri(input_uri), select=parsed.select)
+    write_package(
+        parsed.output,
+        serialize_python_package(*elements, compiled=parsed.compiled),
+    )
+    return 0
+
+
+def write_package(directory: str, modules: Dict[str, str]):
+    """Write the modules of a package to a directory.
+
+    :param directory: The package directory. This is created if it does
+        not exist.
+    :param modules: The contents of each module, keyed by file name, as
+        returned by :func:`~statham.serializers.serialize_python_package`.
+    """
+    makedirs(directory, exist_ok=True)
+    for filename, content in modules.items():
+        with open(path.join(directory, filename), "w", encoding="utf8") as file:
+            file.write(content)
+
+
+def batch_main(args) -> int:
+    """Generate models for each schema described by batch arguments.
+
+    Used where the input is a directory, glob pattern or manifest, or
+    where generation is incremental. A line is reported to stderr for each
+    schema, including the time taken to generate it.
+
+    :return: Exit code for the command, which is non-zero if any schema
+        failed.
+    """
+    parser = build_parser()
+    parsed = parser.parse_args(args)
+    if not parsed.output:
+        parser.error("--output is required when generating many schemas.")
+    if parsed.select:
+        parser.error("--select is not supported when generating many schemas.")
+    if parsed.compiled:
+        parser.error(
+            "--compiled is not supported when generating many schemas."
+        )
+    inputs = collect_inputs(parsed.input, manifest=parsed.manifest)
+    if not inputs:
+        parser.error(f"No schemas found for input '{parsed.input}'.")
+    if parsed.watch:
+        watch(
+            parsed.input,
+            parsed.output,
+            manifest=parsed.manifest,
+            cache_dir=parsed.cache,
+            report=_report,
+        )
+        return 0
+    start = perf_counter()
+    results = generate_batch(
+        inputs,
+        parsed.output,
+        jobs=parsed.jobs,
+        cache_dir=parsed.cache,
+        incremental=parsed.incremental,
+    )
+    sys.stderr.write(format_report(results, perf_counter() - start))
+    return 1 if any(result.error for result in results) else 0
+
+
+def _report(results: List[BatchResult], seconds: float):
+    """Report each regeneration while watching for changes."""
+    sys.stderr.write(format_report(results, seconds))
+
+
+def bench_main(args) -> int:
+    """Measure how the schema described by the command-line arguments
+    following ``statham bench`` performs, writing the timings to stdout.
+
+    :return: Exit code for the command.
+    """
+    parser = build_bench_parser()
+    parsed = parser.parse_args(args)
+    samples = None
+    if parsed.samples:
+        try:
+            samples = load_samples(parsed.samples)
+        except (OSError, ValueError) as exc:
+            parser.error(f"Could not load samples: {exc}")
+    report = bench(
+        parse_input_arg(parsed.input),
+        samples,
+        count=parsed.count,
+        repeat=parsed.repeat,
+        seed=parsed.seed,
     )
-    return serialize_python(*parse(schema))
+    sys.stdout.write(format_bench(report, top=parsed.top))
+    return 0
 
 
 def entry_point():
@@ -101,8 +408,29 @@ def entry_point():
 
     Parse arguments, read from input and write to output.
     """
-    with parse_args(argv[1:]) as (uri, output):  # pragma: no cover
-        output.write(main(uri))  # pragma: no cover
+    args = argv[1:]  # pragma: no cover
+    if args[:1] == ["bench"]:  # pragma: no cover
+        raise SystemExit(bench_main(args[1:]))  # pragma: no cover
+    parsed = build_parser().parse_args(args)  # pragma: no cover
+    if parsed.package:  # pragma: no cover
+        raise SystemExit(package_main(args))  # pragma: no cover
+    if (
+        parsed.manifest
+        or parsed.incremental
+        or parsed.watch
+        or is_batch(parsed.input)
+    ):  # pragma: no cover
+        raise SystemExit(batch_main(args))  # pragma: no cover
+    with parse_args(args) as (uri, output, cache_dir):  # pragma: no cover
+        cache = SchemaCache(cache_dir) if cache_dir else None
+        output.write(
+            main(
+                uri,
+                cache=cache,
+                select=parsed.select,
+                compiled=parsed.compiled,
+            )
+        )  # pragma: no cover
 
 
 if __name__ == "__main__":  # pragma: no cover
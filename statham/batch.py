@@ -0,0 +1,322 @@
+"""Generate models for many schemas at once, using a pool of processes.
+
+Each worker process keeps the local documents it has loaded, reloading
+one only once its content changes, so schemas handled by the same worker
+share any documents they reference. Inputs are sorted and handed to
+workers in contiguous chunks, so that neighbouring schemas, which commonly
+share references, tend to be handled by the same worker.
+
+The documents resolved for each output are recorded, along with their
+content hashes, in a :class:`DependencyManifest` in the output directory.
+Incremental batches only regenerate outputs whose documents have changed.
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from glob import glob
+import json
+import math
+import os
+from time import perf_counter
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlparse
+
+from json_ref_dict import RefDict
+from json_ref_dict.exceptions import DocumentParseError
+
+from statham import __version__
+from statham.cache import document_hash, record_documents, SchemaCache
+from statham.schema.parser import parse
+from statham.serializers import serialize_python
+
+
+SCHEMA_EXTENSIONS = (".json", ".yaml", ".yml")
+
+
+MANIFEST_NAME = ".statham-manifest.json"
+
+
+class BatchResult(NamedTuple):
+    """Outcome of generating models for a single input."""
+
+    input: str
+    output: str
+    seconds: float
+    error: Optional[str] = None
+    """Description of the exception raised, if generation failed."""
+
+    documents: Optional[Dict[str, str]] = None
+    """Content hash of each document resolved, by base URI."""
+
+    skipped: bool = False
+    """Whether the output was already up to date."""
+
+
+class Dependencies(NamedTuple):
+    """Documents from which an output was generated."""
+
+    input: str
+    version: str
+    documents: Dict[str, str]
+    """Content hash of each document resolved, by base URI."""
+
+
+class DependencyManifest:
+    """Record of the documents from which each output was generated.
+
+    Outputs are recorded by their path relative to the manifest.
+
+    :param path: Path of the manifest file. It is read if it exists, and
+        ignored if it can't be read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dependencies] = {}
+        try:
+            with open(path, encoding="utf8") as file:
+                content = json.load(file)
+            self.entries = {
+                output: Dependencies(**entry)
+                for output, entry in content.items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+
+    def record(self, output: str, dependencies: Dependencies):
+        """Record the dependencies of a generated output."""
+        self.entries[self._key(output)] = dependencies
+
+    def discard(self, output: str):
+        """Forget the dependencies of an output."""
+        self.entries.pop(self._key(output), None)
+
+    def is_current(
+        self, uri: str, output: str, hasher: Callable[[str], str]
+    ) -> bool:
+        """Check whether an output is up to date.
+
+        :param uri: URI of the schema from which to generate the output.
+        :param output: Path of the output.
+        :param hasher: Function returning the current content hash of a
+            document, such as :func:`~statham.cache.document_hash`.
+        :return: ``True`` if the output exists, and was generated from the
+            same input by the current version of ``statham``, from
+            documents which are unchanged.
+        """
+        entry = self.entries.get(self._key(output))
+        if not entry or (entry.input, entry.version) != (uri, __version__):
+            return False
+        if not os.path.isfile(output):
+            return False
+        try:
+            return all(
+                hasher(document) == digest
+                for document, digest in entry.documents.items()
+            )
+        except (OSError, DocumentParseError):
+            return False
+
+    def save(self):
+        """Write the manifest to its path."""
+        content = {
+            output: entry._asdict()
+            for output, entry in sorted(self.entries.items())
+        }
+        with open(self.path, "w", encoding="utf8") as file:
+            json.dump(content, file, indent=2)
+
+    def _key(self, output: str) -> str:
+        """Outputs are recorded relative to the manifest."""
+        return os.path.relpath(output, os.path.dirname(self.path))
+
+
+def collect_inputs(input_arg: str, manifest: bool = False) -> List[str]:
+    """Find the schemas described by a batch input argument.
+
+    :param input_arg: A directory, whose schema files are used, a glob
+        pattern matching schema files, or a manifest. Any other input is
+        treated as a single schema.
+    :param manifest: Whether ``input_arg`` is a manifest file, listing one
+        input per line. Blank lines and lines beginning with ``#`` are
+        ignored, and relative paths are relative to the manifest.
+    :return: The sorted input URIs.
+    """
+    if manifest:
+        base = os.path.dirname(input_arg)
+        with open(input_arg, encoding="utf8") as file:
+            lines = [line.strip() for line in file]
+        return sorted(
+            line if urlparse(line).scheme else os.path.join(base, line)
+            for line in lines
+            if line and not line.startswith("#")
+        )
+    if not is_batch(input_arg):
+        return [input_arg]
+    if os.path.isdir(input_arg):
+        paths = [
+            os.path.join(input_arg, filename)
+            for filename in os.listdir(input_arg)
+            if filename.endswith(SCHEMA_EXTENSIONS)
+        ]
+    else:
+        paths = glob(input_arg, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def is_batch(input_arg: str) -> bool:
+    """Check whether an input argument describes more than one schema."""
+    return os.path.isdir(input_arg) or any(char in input_arg for char in "*?[")
+
+
+def output_paths(inputs: List[str], output_dir: str) -> List[str]:
+    """Derive the output module for each input.
+
+    Modules are named after their input documents, and the directory
+    structure of the inputs is mirrored in ``output_dir``.
+    """
+    paths = [uri.split("#")[0] for uri in inputs]
+    base = os.path.commonpath(
+        [os.path.dirname(os.path.abspath(path)) for path in paths]
+    )
+    return [
+        os.path.join(
+            output_dir,
+            os.path.relpath(os.path.dirname(os.path.abspath(path)), base),
+            os.path.splitext(os.path.basename(path))[0] + ".py",
+        )
+        for path in paths
+    ]
+
+
+def generate_batch(
+    inputs: List[str],
+    output_dir: str,
+    jobs: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    incremental: bool = False,
+) -> List[BatchResult]:
+    """Generate and write models for many schemas.
+
+    Failures are recorded in the results rather than raised, so that one
+    bad schema does not prevent the others from being generated. The
+    dependencies of each generated output are recorded in the manifest in
+    ``output_dir``.
+
+    :param inputs: URIs of the target schemas.
+    :param output_dir: Directory in which to write the generated modules.
+    :param jobs: Number of worker processes. Defaults to the number of
+        CPUs. If ``1``, models are generated in the current process.
+    :param cache_dir: Optional directory for a
+        :class:`~statham.cache.SchemaCache`, shared between workers.
+    :param incremental: Whether to skip outputs which are up to date
+        according to the manifest.
+    :return: A result for each input, in the same order.
+    """
+    inputs = [uri if "#" in uri else uri + "#/" for uri in inputs]
+    outputs = output_paths(inputs, output_dir) if inputs else []
+    counts = Counter(outputs)
+    manifest = DependencyManifest(os.path.join(output_dir, MANIFEST_NAME))
+    # Documents are commonly shared, so hash each only once.
+    hasher = lru_cache(maxsize=None)(document_hash)
+    skipped = {
+        output
+        for uri, output in zip(inputs, outputs)
+        if incremental and manifest.is_current(uri, output, hasher)
+    }
+    work = [
+        (uri, output, cache_dir)
+        for uri, output in zip(inputs, outputs)
+        if counts[output] == 1 and output not in skipped
+    ]
+    generated = _run(work, jobs)
+    _record(manifest, generated)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest.save()
+    results = iter(generated)
+    return [
+        BatchResult(uri, output, 0.0, skipped=True)
+        if output in skipped
+        else next(results)
+        if counts[output] == 1
+        else BatchResult(uri, output, 0.0, "Output path is not unique.")
+        for uri, output in zip(inputs, outputs)
+    ]
+
+
+def _run(
+    work: List[Tuple[str, str, Optional[str]]], jobs: Optional[int]
+) -> List[BatchResult]:
+    """Generate each output, in worker processes if there are many jobs."""
+    jobs = min(jobs or os.cpu_count() or 1, len(work) or 1)
+    if jobs == 1:
+        return list(map(_generate, work))
+    chunksize = math.ceil(len(work) / (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_generate, work, chunksize=chunksize))
+
+
+def _record(manifest: DependencyManifest, generated: List[BatchResult]):
+    """Record the dependencies of each generated output in the manifest."""
+    for result in generated:
+        if result.documents is not None:
+            manifest.record(
+                result.output,
+                Dependencies(result.input, __version__, result.documents),
+            )
+        else:
+            manifest.discard(result.output)
+
+
+def format_report(results: Iterable[BatchResult], seconds: float) -> str:
+    """Summarise the results of a batch, one line per generated input."""
+    lines = []
+    total = failures = skipped = 0
+    for result in results:
+        total += 1
+        if result.skipped:
+            skipped += 1
+            continue
+        failures += bool(result.error)
+        lines.append(
+            f"{'FAILED' if result.error else 'ok':<6} "
+            f"{result.seconds:8.3f}s  {result.input}"
+            + (f": {result.error}" if result.error else f" -> {result.output}")
+        )
+    lines.append(
+        f"Generated {total - failures - skipped} of {total} modules "
+        f"in {seconds:.3f}s, {failures} failed"
+        + (f", {skipped} up to date." if skipped else ".")
+    )
+    return "\n".join(lines) + "\n"
+
+
+def _generate(job: Tuple[str, str, Optional[str]]) -> BatchResult:
+    """Generate and write models for a single input."""
+    uri, output, cache_dir = job
+    start = perf_counter()
+    try:
+        if cache_dir:
+            cache = SchemaCache(cache_dir)
+            module = cache.load(uri).module
+            documents: Iterable[str] = cache.documents(uri)
+        else:
+            with record_documents() as documents:
+                module = serialize_python(*parse(RefDict.from_uri(uri)))
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w", encoding="utf8") as file:
+            file.write(module)
+        hashes = {document: document_hash(document) for document in documents}
+    except Exception as exc:  # pylint: disable=broad-except
+        return BatchResult(
+            uri, output, perf_counter() - start, f"{type(exc).__name__}: {exc}"
+        )
+    return BatchResult(uri, output, perf_counter() - start, documents=hashes)
@@ -0,0 +1,369 @@
+"""Measure how a schema performs, from parsing to validation.
+
+:func:`bench` times each phase of generating models from a schema, then
+validates sample values against the top-level element, reporting
+throughput and latency percentiles. If no samples are given, they are
+generated from the schema with :func:`generate_samples`.
+
+Validation is then repeated once within a
+:class:`~statham.schema.profiling.Profile`, to find the most expensive
+sub-elements and keywords of the schema.
+"""
+from math import ceil, floor
+import json
+import random
+import re
+from time import perf_counter
+from typing import (
+    Any,
+    cast,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from uuid import UUID
+
+from json_ref_dict import RefDict
+
+from statham.schema.constants import Maybe, NotPassed
+from statham.schema.elements import (
+    AllOf,
+    Array,
+    Boolean,
+    CompositionElement,
+    Element,
+    Integer,
+    Not,
+    Nothing,
+    Null,
+    Number,
+    String,
+)
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.exceptions import ValidationError
+from statham.schema.parser import parse
+from statham.schema.profiling import Profile, ProfileEntry
+from statham.schema.property import _PropertyDict
+from statham.serializers import serialize_python
+from statham.serializers.orderer import orderer
+
+
+PHASES = ("resolve", "parse", "order", "serialize")
+"""Phases of generating models, in the order they are timed.
+
+Resolving loads the top-level document. References are resolved as they
+are parsed, so the time to load any other documents is included in
+parsing. Serializing includes ordering the models again.
+"""
+
+
+MAX_DEPTH = 6
+"""Depth beyond which generated samples only include required values."""
+
+
+class BenchReport(NamedTuple):
+    """Timings measured by :func:`bench`."""
+
+    phases: Dict[str, float]
+    """Seconds taken by each of :const:`PHASES`."""
+
+    samples: int
+    generated: bool
+    """Whether the samples were generated from the schema."""
+
+    failures: int
+    """Number of samples which failed validation."""
+
+    latencies: List[float]
+    """Seconds taken to validate each sample, for each repetition."""
+
+    elements: List[ProfileEntry]
+    """Sub-elements, most expensive first."""
+
+    keywords: List[ProfileEntry]
+    """Keywords, most expensive first."""
+
+    @property
+    def throughput(self) -> float:
+        """Values validated per second."""
+        total = sum(self.latencies)
+        return len(self.latencies) / total if total else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Latency of validating a sample at a given percentile, in seconds."""
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        rank = ceil(percent / 100 * len(latencies)) - 1
+        return latencies[min(max(rank, 0), len(latencies) - 1)]
+
+
+def bench(
+    uri: str,
+    samples: Optional[Sequence[Any]] = None,
+    *,
+    count: int = 100,
+    repeat: int = 10,
+    seed: int = 0,
+) -> BenchReport:
+    """Time generating models from a schema, and validating samples.
+
+    :param uri: URI of the target schema. This must follow the conventions
+        of a JSON Schema ``"$ref"`` attribute.
+    :param samples: Values to validate against the top-level element. If
+        not provided, ``count`` samples are generated from the schema.
+    :param count: Number of samples to generate.
+    :param repeat: Number of times to validate each sample.
+    :param seed: Seed with which to generate samples.
+    :return: The timings of each phase, and of validation.
+    """
+    phases, elements = _generate(uri)
+    element = elements[0]
+    generated = samples is None
+    if samples is None:
+        samples = generate_samples(element, count, seed=seed)
+    latencies, failures = _validate(element, samples, repeat)
+    with Profile() as profile:
+        for sample in samples:
+            try:
+                element(sample)
+            except (TypeError, ValidationError):
+                pass
+    return BenchReport(
+        phases=phases,
+        samples=len(samples),
+        generated=generated,
+        failures=failures,
+        latencies=latencies,
+        elements=profile.elements(),
+        keywords=profile.keywords(),
+    )
+
+
+def _generate(uri: str) -> Tuple[Dict[str, float], List[Element]]:
+    """Generate models from a schema, timing each phase."""
+    phases: Dict[str, float] = {}
+    start = perf_counter()
+    document = RefDict.from_uri(uri)
+    _ = len(document)
+    phases["resolve"] = perf_counter() - start
+    start = perf_counter()
+    elements = parse(document)
+    phases["parse"] = perf_counter() - start
+    start = perf_counter()
+    _ = list(orderer(*elements))
+    phases["order"] = perf_counter() - start
+    start = perf_counter()
+    _ = serialize_python(*elements)
+    phases["serialize"] = perf_counter() - start
+    return phases, elements
+
+
+def _validate(
+    element: Element, samples: Sequence[Any], repeat: int
+) -> Tuple[List[float], int]:
+    """Time validating each sample, counting the samples which fail."""
+    latencies: List[float] = []
+    failed = set()
+    for _ in range(repeat):
+        for idx, sample in enumerate(samples):
+            start = perf_counter()
+            try:
+                element(sample)
+            except (TypeError, ValidationError):
+                failed.add(idx)
+            latencies.append(perf_counter() - start)
+    return latencies, len(failed)
+
+
+def format_bench(report: BenchReport, top: int = 10) -> str:
+    """Summarise the timings measured by :func:`bench`.
+
+    :param report: The timings to summarise.
+    :param top: Number of the most expensive sub-elements and keywords to
+        list.
+    """
+    lines = ["Phases:"]
+    for phase in PHASES:
+        lines.append(f"  {phase:<12} {report.phases[phase]:10.4f}s")
+    kind = "generated" if report.generated else "provided"
+    lines.extend(
+        [
+            f"Validation of {report.samples} {kind} samples, "
+            f"{len(report.latencies)} times in total:",
+            f"  {'throughput':<12} {report.throughput:10.0f} values/s",
+            f"  {'failures':<12} {report.failures:10d}",
+        ]
+    )
+    for percent in (50, 90, 99, 100):
+        label = "max" if percent == 100 else f"p{percent}"
+        lines.append(
+            f"  {label:<12} {report.percentile(percent) * 1e6:10.1f}us"
+        )
+    for title, entries, field in (
+        ("elements", report.elements, "path"),
+        ("keywords", report.keywords, "keyword"),
+    ):
+        lines.append(f"Most expensive {title}:")
+        lines.append(
+            f"  {'calls':>8} {'total':>10} {'own':>10} {'failures':>8}  name"
+        )
+        for entry in entries[:top]:
+            lines.append(
+                f"  {entry.calls:>8} {entry.seconds * 1e3:>8.3f}ms "
+                f"{entry.own_seconds * 1e3:>8.3f}ms {entry.failures:>8}  "
+                f"{getattr(entry, field)}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def load_samples(path: str) -> List[Any]:
+    """Load sample values from a file.
+
+    :param path: Path to a JSON file containing an array of samples, or to
+        a JSON Lines file, ending ``.jsonl``, with one sample per line.
+    :raises ValueError: if the file does not contain an array of samples.
+    """
+    with open(path, encoding="utf8") as file:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in file if line.strip()]
+        samples = json.load(file)
+    if not isinstance(samples, list):
+        raise ValueError(f"Expected an array of samples in {path}.")
+    return samples
+
+
+def generate_samples(element: Element, count: int, seed: int = 0) -> List[Any]:
+    """Generate sample values for an element.
+
+    Samples respect the most common keywords, but are not guaranteed to be
+    valid. For example, strings are not generated to match a
+    ``"pattern"``.
+
+    :param element: The element to generate samples for.
+    :param count: Number of samples to generate.
+    :param seed: Seed for the random choices made.
+    """
+    rand = random.Random(seed)
+    return [_sample(element, rand, 0) for _ in range(count)]
+
+
+# pylint: disable=too-many-return-statements
+def _sample(element: Element, rand: random.Random, depth: int) -> Any:
+    const = getattr(element, "const", NotPassed())
+    if not isinstance(const, NotPassed):
+        return const
+    enum = getattr(element, "enum", NotPassed())
+    if not isinstance(enum, NotPassed) and enum:
+        return rand.choice(enum)
+    if isinstance(element, ObjectMeta):
+        return _sample_object(element, rand, depth)
+    if isinstance(element, AllOf):
+        return _sample(element.elements[0], rand, depth)
+    if isinstance(element, CompositionElement):
+        return _sample(rand.choice(element.elements), rand, depth)
+    if isinstance(element, (Not, Nothing)):
+        return None
+    if isinstance(element, String):
+        return _sample_string(element, rand)
+    if isinstance(element, (Integer, Number)):
+        return _sample_number(element, rand)
+    if isinstance(element, Boolean):
+        return rand.random() < 0.5
+    if isinstance(element, Null):
+        return None
+    if isinstance(element, Array):
+        return _sample_array(element, rand, depth)
+    return rand.choice([None, True, 1, 1.5, "value"])
+
+
+def _sample_object(
+    model: ObjectMeta, rand: random.Random, depth: int
+) -> Dict[str, Any]:
+    value: Dict[str, Any] = {}
+    for prop in cast(_PropertyDict, model.properties).values():
+        if prop.required or (depth < MAX_DEPTH and rand.random() < 0.5):
+            value[cast(str, prop.source)] = _sample(
+                prop.element, rand, depth + 1
+            )
+    required = model.required
+    for name in [] if isinstance(required, NotPassed) else required:
+        value.setdefault(name, "value")
+    return value
+
+
+def _sample_string(element: String, rand: random.Random) -> str:
+    if element.format == "uuid":
+        return str(UUID(int=rand.getrandbits(128), version=4))
+    if element.format == "date-time":
+        return f"20{rand.randrange(100):02d}-01-01T00:00:00Z"
+    minimum, maximum = _lengths(element.minLength, element.maxLength, 10)
+    length = rand.randint(minimum, maximum)
+    if isinstance(element.pattern, str):
+        match = re.compile(element.pattern).fullmatch("a" * length)
+        if match:
+            return match.group()
+    return "".join(
+        rand.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length)
+    )
+
+
+def _sample_number(element: Element, rand: random.Random) -> Any:
+    # pylint: disable=no-member
+    lower, upper = _bounds(element)
+    multiple = element.multipleOf  # type: ignore
+    if isinstance(element, Integer) or not isinstance(multiple, NotPassed):
+        step = 1 if isinstance(multiple, NotPassed) else multiple
+        low, high = ceil(lower / step), floor(upper / step)
+        number = rand.randint(low, max(low, high)) * step
+        return int(number) if isinstance(element, Integer) else number
+    return rand.uniform(lower, upper)
+
+
+def _bounds(element: Element) -> Tuple[float, float]:
+    lower = _bound(element, "minimum", "exclusiveMinimum", 1)
+    upper = _bound(element, "maximum", "exclusiveMaximum", -1)
+    if lower is None:
+        lower = 0 if upper is None or upper >= 0 else upper - 100
+    if upper is None:
+        upper = lower + 100
+    return lower, upper
+
+
+def _bound(
+    element: Element, inclusive: str, exclusive: str, offset: int
+) -> Optional[float]:
+    """Get an inclusive bound of a numeric element, if it has one.
+
+    Exclusive bounds are offset, so that the bound is within them.
+    """
+    value = getattr(element, inclusive)
+    if not isinstance(value, NotPassed):
+        return value
+    value = getattr(element, exclusive)
+    if not isinstance(value, NotPassed):
+        return value + offset
+    return None
+
+
+def _lengths(
+    minimum: Maybe[int], maximum: Maybe[int], spread: int
+) -> Tuple[int, int]:
+    """Get the bounds of the length of a string or array.
+
+    Without a maximum, lengths may be up to ``spread`` more than the
+    minimum.
+    """
+    lower = 0 if isinstance(minimum, NotPassed) else minimum
+    upper = lower + spread if isinstance(maximum, NotPassed) else maximum
+    return lower, max(lower, upper)
+
+
+def _sample_array(element: Array, rand: random.Random, depth: int) -> List[Any]:
+    minimum, maximum = _lengths(element.minItems, element.maxItems, 3)
+    length = minimum if depth >= MAX_DEPTH else rand.randint(minimum, maximum)
+    items = element.__items__
+    return [_sample(items[idx], rand, depth + 1) for idx in range(length)]
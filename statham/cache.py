@@ -0,0 +1,394 @@
+"""Persistent cache of parsed schemas and generated modules.
+
+Entries are keyed by a hash of the content of every document resolved when
+parsing a schema, along with the input URI and the version of ``statham``.
+Each entry stores the parsed elements, pickled, and the generated python
+module.
+
+The documents resolved for an input are recorded alongside its entries, so
+that a lookup only needs to hash those documents. References are not
+resolved and schemas are not parsed on a hit. Local documents are hashed
+from their raw content, and any others are loaded and hashed by their JSON
+value.
+"""
+from contextlib import contextmanager
+from hashlib import blake2b
+import json
+import os
+import pickle
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+from uuid import uuid4
+import zlib
+
+from json_ref_dict import RefDict
+from json_ref_dict.exceptions import DocumentParseError
+from json_ref_dict.loader import default_get_document, get_document
+from json_ref_dict.ref_pointer import resolve_uri
+
+from statham import __version__
+from statham.schema.elements import Element
+from statham.schema.parser import parse
+from statham.serializers import serialize_python
+
+
+class CacheEntry(NamedTuple):
+    """Cached result of generating models from a schema."""
+
+    elements: List[Element]
+    """Elements parsed from the schema, as returned by
+    :func:`~statham.schema.parser.parse`.
+    """
+
+    module: str
+    """Python module generated from the elements."""
+
+
+class CacheStats(NamedTuple):
+    """Usage statistics for a :class:`SchemaCache`.
+
+    Hits, misses and evictions are counted for the lifetime of the cache
+    instance, and entries and size describe the cache directory.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    """Total size of stored entries in bytes."""
+
+
+class SchemaCache:
+    """On-disk cache of parsed schemas and generated modules.
+
+    The least recently used entries are evicted once the cache holds more
+    than ``max_entries`` entries, or more than ``max_size`` bytes.
+
+    .. code:: python
+
+        from statham.cache import SchemaCache
+
+        cache = SchemaCache(".statham-cache")
+        elements, module = cache.load("schemas/poll.json#/")
+
+    :param directory: Directory in which to store the cache. This is
+        created if it does not exist.
+    :param max_entries: Maximum number of entries to retain.
+    :param max_size: Maximum total size of entries in bytes. Unlimited by
+        default.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: int = 256,
+        max_size: Optional[int] = None,
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        os.makedirs(self._path("entries"), exist_ok=True)
+        os.makedirs(self._path("inputs"), exist_ok=True)
+
+    def load(
+        self, uri: str, select: Optional[Sequence[str]] = None
+    ) -> CacheEntry:
+        """Get the cached entry for a schema, generating it on a miss.
+
+        :param uri: URI of the target schema. This must follow the
+            conventions of a JSON Schema ``"$ref"`` attribute.
+        :param select: Optional names of definitions to parse, as accepted
+            by :func:`~statham.schema.parser.parse`. Each selection is
+            cached separately.
+        :return: The parsed elements and generated module.
+        """
+        key = uri if select is None else _selection_key(uri, select)
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        with record_documents() as documents:
+            elements = parse(RefDict.from_uri(uri), select=select)
+        entry = CacheEntry(elements, serialize_python(*elements))
+        self.put(key, entry, documents)
+        return entry
+
+    def get(self, uri: str) -> Optional[CacheEntry]:
+        """Get the cached entry for a schema, if its documents are unchanged.
+
+        :param uri: URI of the target schema.
+        :return: The cached entry, or ``None`` on a miss.
+        """
+        entry = self._read(uri)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return entry
+
+    def put(self, uri: str, entry: CacheEntry, documents: Set[str]):
+        """Store an entry for a schema.
+
+        :param uri: URI of the target schema.
+        :param entry: The parsed elements and generated module.
+        :param documents: Base URIs of every document resolved when parsing
+            the schema, as collected by :func:`record_documents`.
+        """
+        key = _entry_key(uri, {doc: document_hash(doc) for doc in documents})
+        payload = zlib.compress(
+            pickle.dumps(tuple(entry), protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        _write_atomic(self._path("entries", key), payload)
+        _write_atomic(
+            self._path("inputs", _digest(uri)),
+            json.dumps({"uri": uri, "documents": sorted(documents)}).encode(),
+        )
+        self._evict()
+
+    def documents(self, uri: str) -> List[str]:
+        """Get the documents most recently resolved for a schema.
+
+        :param uri: URI of the target schema.
+        :return: Base URIs of the documents, or an empty list if the schema
+            has not been cached.
+        """
+        try:
+            with open(self._path("inputs", _digest(uri)), "rb") as file:
+                return json.load(file)["documents"]
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def stats(self) -> CacheStats:
+        """Get usage statistics for the cache."""
+        sizes = [
+            os.stat(self._path("entries", name)).st_size
+            for name in os.listdir(self._path("entries"))
+        ]
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(sizes),
+            size=sum(sizes),
+        )
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        for folder in ("entries", "inputs"):
+            for name in os.listdir(self._path(folder)):
+                _remove(self._path(folder, name))
+
+    def _path(self, *segments: str) -> str:
+        return os.path.join(self.directory, *segments)
+
+    def _read(self, uri: str) -> Optional[CacheEntry]:
+        """Read the entry for the current content of a schema's documents.
+
+        Entries which can't be read are treated as missing.
+        """
+        documents = self.documents(uri)
+        if not documents:
+            return None
+        try:
+            key = _entry_key(
+                uri, {doc: document_hash(doc) for doc in documents}
+            )
+            path = self._path("entries", key)
+            with open(path, "rb") as file:
+                elements, module = pickle.loads(zlib.decompress(file.read()))
+            os.utime(path)  # Mark as recently used.
+        except (
+            OSError,
+            ValueError,
+            KeyError,
+            EOFError,
+            pickle.UnpicklingError,
+            zlib.error,
+            DocumentParseError,
+        ):
+            return None
+        return CacheEntry(elements, module)
+
+    def _evict(self):
+        """Remove the least recently used entries over the cache limits."""
+        entries = []
+        for name in os.listdir(self._path("entries")):
+            stat = os.stat(self._path("entries", name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+        entries.sort()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        while entries and (
+            len(entries) > self.max_entries
+            or (self.max_size is not None and size > self.max_size)
+        ):
+            _, entry_size, name = entries.pop(0)
+            _remove(self._path("entries", name))
+            size -= entry_size
+            self._evictions += 1
+
+
+class _LocalDocuments:
+    """Document loader which keeps local documents until they change.
+
+    Each document is hashed the first time it is requested after
+    :meth:`revalidate`, and only reloaded if its content has changed
+    since it was loaded. Other documents are deferred to the remaining
+    loaders.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, Tuple[str, Any]] = {}
+        self.checked: Set[str] = set()
+        self.loading: Set[str] = set()
+
+    def __call__(self, base_uri: str) -> Any:
+        path = local_path(base_uri)
+        if path is None or not os.path.isfile(path):
+            return ...
+        if base_uri in self.loading:
+            # Other loaders may defer to this one while it loads a document.
+            return ...
+        if base_uri in self.checked:
+            return self.documents[base_uri][1]
+        digest = document_hash(base_uri)
+        cached = self.documents.get(base_uri)
+        if cached is None or cached[0] != digest:
+            self.documents[base_uri] = (digest, self._load(base_uri))
+        self.checked.add(base_uri)
+        return self.documents[base_uri][1]
+
+    def revalidate(self):
+        """Check each document for changes the next time it is requested."""
+        self.checked.clear()
+
+    def _load(self, base_uri: str) -> Any:
+        self.loading.add(base_uri)
+        try:
+            for loader in get_document:
+                loaded = loader(base_uri)
+                if loaded is not ...:
+                    return loaded
+        finally:
+            self.loading.discard(base_uri)
+        try:
+            return default_get_document.__wrapped__(base_uri)
+        except Exception as exc:
+            raise DocumentParseError(
+                f"Failed to load uri '{base_uri}'."
+            ) from exc
+
+
+_LOCAL_DOCUMENTS = _LocalDocuments()
+
+
+@contextmanager
+def record_documents() -> Iterator[Set[str]]:
+    """Record the base URIs of documents loaded while resolving references.
+
+    Resolved references are cleared on entry, so that every document
+    resolved is requested from the loaders and recorded. Local documents
+    stay loaded between uses, and are only reloaded once their content
+    changes, so schemas are parsed from the current content of each
+    document without reading unchanged documents again.
+
+    .. code:: python
+
+        with record_documents() as documents:
+            elements = parse(RefDict.from_uri(uri))
+
+    :return: A context manager, yielding the set of recorded URIs. This
+        is updated as documents are loaded.
+    """
+    documents: Set[str] = set()
+
+    def _record(base_uri: str):
+        documents.add(base_uri)
+        return ...  # Defer to the other loaders.
+
+    resolve_uri.cache_clear()
+    _LOCAL_DOCUMENTS.revalidate()
+    registered = _LOCAL_DOCUMENTS not in list(get_document)
+    if registered:
+        get_document.register(_LOCAL_DOCUMENTS)
+    get_document.register(_record)
+    try:
+        yield documents
+    finally:
+        get_document.unregister(_record)
+        if registered:
+            get_document.unregister(_LOCAL_DOCUMENTS)
+
+
+def document_hash(uri: str) -> str:
+    """Hash the current content of a document.
+
+    :param uri: Base URI of the document.
+    :return: A hex digest of the document's content.
+    """
+    path = local_path(uri)
+    if path is not None and os.path.isfile(path):
+        with open(path, "rb") as file:
+            content = file.read()
+    else:
+        content = json.dumps(
+            get_document(uri), sort_keys=True, default=repr
+        ).encode("utf8")
+    return blake2b(content, digest_size=16).hexdigest()
+
+
+def local_path(uri: str) -> Optional[str]:
+    """Get the filesystem path of a URI, if it refers to a local file.
+
+    :param uri: Base URI of a document, either a path or a ``file`` URL.
+    :return: The path of the file, or ``None`` for other URLs.
+    """
+    url = urlparse(uri)
+    if not url.scheme:
+        return uri
+    if url.scheme == "file":
+        return url2pathname(url.path)
+    return None
+
+
+def _selection_key(uri: str, select: Sequence[str]) -> str:
+    """Key entries for selected definitions apart from the whole schema."""
+    return json.dumps([uri, list(select)])
+
+
+def _entry_key(uri: str, document_hashes: Dict[str, str]) -> str:
+    return _digest(
+        json.dumps([__version__, uri, sorted(document_hashes.items())])
+    )
+
+
+def _digest(value: str) -> str:
+    return blake2b(value.encode("utf8"), digest_size=16).hexdigest()
+
+
+def _write_atomic(path: str, content: bytes):
+    """Write a file such that concurrent readers never see partial content."""
+    temp_path = f"{path}.{uuid4().hex}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(content)
+    os.replace(temp_path, path)
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
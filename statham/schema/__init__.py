@@ -0,0 +1,15 @@
+"""Runtime components of ``statham`` models.
+
+Submodules are imported on first use, so that importing
+:mod:`statham.schema.elements` loads only what validation needs.
+"""
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    if name == "optimize":
+        # pylint: disable=import-outside-toplevel
+        from statham.schema.optimizer import optimize
+
+        return optimize
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,72 @@
+"""Support for compiled models, as generated by
+:func:`~statham.serializers.serialize_python` with ``compiled=True``.
+
+A compiled function is a plain python function specialized to validate and
+construct instances of a single model. It accepts a dictionary value, and
+returns the values of the instance's attributes. It raises an exception
+for any value it doesn't accept, and the value is then validated as if the
+model were not compiled, so that errors are the same either way.
+
+Compiled functions are registered with :func:`compiled`, and are
+discarded if a keyword or the properties of their model are reassigned.
+They are not used when validating with a limited depth.
+"""
+from typing import Any, Callable, Dict
+
+from statham.schema.constants import NotPassed
+from statham.schema.elements.base import Element
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.elements.object import _restore
+from statham.schema.property import _Property
+
+
+CompiledFunction = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+NOT_PASSED = NotPassed()
+"""The instance of :class:`~statham.schema.constants.NotPassed`, with which
+compiled functions compare values by identity.
+"""
+
+
+_ELEMENT: Element = Element()
+
+
+def compiled(model: ObjectMeta) -> Callable[[CompiledFunction], Any]:
+    """Register a compiled function for a model.
+
+    .. code:: python
+
+        @compiled(Poll)
+        def _compiled_Poll(value):
+            ...
+
+    :param model: The model validated by the decorated function.
+    :return: A decorator, which registers and returns the function.
+    """
+
+    def _register(function: CompiledFunction) -> CompiledFunction:
+        type.__setattr__(model, "__compiled__", function)
+        return function
+
+    return _register
+
+
+def construct(model: ObjectMeta, value: Any, property_: _Property) -> Any:
+    """Validate a value against a model, as a sub-element of a compiled
+    model.
+
+    Dictionary values are constructed by the compiled function of the
+    model, if it has one, and any other value by calling the model.
+    """
+    function = vars(model).get("__compiled__")
+    if function is None or not isinstance(value, dict):
+        return model(value, property_)
+    return _restore(model, function(value))
+
+
+def additional(value: Any) -> Any:
+    """Construct an additional property accepted by any schema."""
+    if isinstance(value, (dict, list)):
+        return _ELEMENT(value)
+    return value
@@ -1,10 +1,9 @@
 # False positive. The cycle exists but is avoided by importing last.
 # pylint: disable=cyclic-import
-from typing import Any, cast, Dict, List, Generic, TypeVar, Union
+from typing import Any, cast, ClassVar, Dict, List, Generic, TypeVar, Union
 
 from statham.schema.constants import NotPassed, Maybe
-from statham.schema.exceptions import ValidationError
-from statham.schema.helpers import custom_repr
+from statham.schema.helpers import custom_repr, keyword_table, KeywordTable
 from statham.schema.property import _Property, _PropertyDict
 from statham.schema.validation import (
     get_validators,
@@ -122,8 +121,18 @@ class Element(Generic[T]):
     """
     # pylint: enable=line-too-long
 
+    __keywords__: ClassVar[KeywordTable]
+    """Keyword arguments of the type, see
+    :func:`~statham.schema.helpers.keyword_table`.
+    """
+
+    description: Maybe[str]
     _properties: Maybe[_PropertyDict]
 
+    def __init_subclass__(cls, *args, **kwargs):
+        super().__init_subclass__(*args, **kwargs)
+        _ = keyword_table(cls)
+
     # This is how many options there are!
     # pylint: disable=too-many-locals
     def __init__(
@@ -202,6 +211,24 @@ class Element(Generic[T]):
         self._properties = _PropertyDict(cast(Dict[str, _Property], value))
         self._properties.parent = self
 
+    def __setattr__(self, name: str, value: Any):
+        """Discard the validation plan and fingerprint of an element when it
+        is modified.
+
+        See :class:`~statham.schema.engine.Engine` and
+        :mod:`statham.schema.fingerprint`.
+        """
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            vars(self).pop("__plan__", None)
+            vars(self).pop("_fingerprint", None)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle and copy elements without their validation plan."""
+        state = dict(vars(self))
+        state.pop("__plan__", None)
+        return state
+
     def __repr__(self):
         """Dynamically construct the repr to match value instantiation."""
         return custom_repr(self)
@@ -212,7 +239,13 @@ class Element(Generic[T]):
         This just checks the type and public attribute values. Useful for
         testing parser logic, and could be used to automatically DRY up
         messy schemas in future.
+
+        Identical elements are equal without comparing attributes, so
+        comparisons between elements interned with
+        :mod:`statham.schema.interning` are fast when they are equal.
         """
+        if self is other:
+            return True
         if not isinstance(other, self.__class__):
             return False
         pub_vars = lambda x: {
@@ -276,23 +309,10 @@ class Element(Generic[T]):
             validation to produce more useful error messages.
         :return: The parsed value.
         """
-        property_ = property_ or UNBOUND_PROPERTY
-
-        def create(value):
-            for validator in self.validators:
-                validator(value, property_)
-            return self.construct(value, property_)
-
-        if not isinstance(self.default, NotPassed) and isinstance(
-            value, NotPassed
-        ):
-            try:
-                return create(self.default)
-            except (TypeError, ValidationError):
-                return self.default
-        if isinstance(value, NotPassed):
-            return value
-        return create(value)
+        return _call_element(self, value, property_ or UNBOUND_PROPERTY)
+
+
+_ = keyword_table(Element)
 
 
 UNBOUND_PROPERTY: _Property = _Property(Element(), required=False)
@@ -335,3 +355,8 @@ class _AnonymousObject(dict):
 
     def __setattr__(self, key: str, value: Any):
         return self.__setitem__(key, value)
+
+
+# Needs to be imported last to prevent cyclic import.
+# pylint: disable=wrong-import-position
+from statham.schema.engine import _call_element
@@ -179,6 +179,22 @@ def _attempt_schemas(
     outcomes = [
         _attempt_schema(element, value, property_) for element in elements
     ]
+    return _combine_outcomes(outcomes, value, property_, mode)
+
+
+def _combine_outcomes(
+    outcomes: List[Outcome], value: Any, property_: _Property, mode: str
+) -> Any:
+    """Combine the outcomes of validating a value against many elements.
+
+    :param outcomes: The outcome of each element, in order.
+    :param value: The data validated.
+    :param property_: The enclosing property.
+    :param mode: The matching stategy to use. "allOf", "anyOf" or "oneOf".
+    :return: The result of the composition.
+    :raises ValidationError: if the outcomes don't satisfy ``mode``.
+    :raises ValueError: if passed an invalid mode.
+    """
     results = [outcome.result for outcome in outcomes if not outcome.error]
     errors = [outcome.error for outcome in outcomes if outcome.error]
     if not results:
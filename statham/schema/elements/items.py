@@ -11,17 +11,19 @@ class Items:
     def __init__(self, items, additional=True):
         self.items = Element() if isinstance(items, NotPassed) else items
         if isinstance(additional, bool):
-            self.additional = {True: Element(), False: Nothing()}[additional]
+            self.additional = Element() if additional else Nothing()
         else:
             self.additional = additional
 
     @staticmethod
     def property(property_, index):
-        return property_.evolve(name=property_.name or "" + f"[{index}]")
+        if property_.name:
+            return property_
+        return property_.evolve(name=f"[{index}]")
 
     def __repr__(self):
         items = [repr(self.items)]
-        if self.additional == Nothing():
+        if isinstance(self.additional, Nothing):
             items.append("additionalItems=False")
         elif self.additional != Element():
             items.append(f"additionalItems={self.additional}")
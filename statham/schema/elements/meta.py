@@ -1,11 +1,24 @@
-import inspect
+import copyreg
 import keyword
-from typing import Any, cast, Dict, List, Tuple, Type, Union
+import sys
+from typing import (
+    Any,
+    cast,
+    Collection,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+from weakref import WeakValueDictionary
 
 from statham.schema.constants import Maybe, NotPassed
 from statham.schema.elements.base import Element
 from statham.schema.property import _Property
 from statham.schema.exceptions import SchemaDefinitionError
+from statham.schema.helpers import keyword_table, KeywordTable
 from statham.schema.validation import (
     AdditionalProperties,
     Const,
@@ -128,8 +141,33 @@ class ObjectMeta(type, Element):
         cls.dependencies = get_value(dependencies, "dependencies")
         return cls
 
+    def __setattr__(cls, name, value):
+        """Discard the compiled function, validation plan, fingerprint and
+        hash of a model when it is modified.
+
+        See :mod:`statham.schema.compiled`,
+        :class:`~statham.schema.engine.Engine` and
+        :mod:`statham.schema.fingerprint`.
+        """
+        super().__setattr__(name, value)
+        if name.startswith("_"):
+            return
+        for cached in ("__compiled__", "__plan__", "_fingerprint", "_hash"):
+            if cached in vars(cls):
+                type.__delattr__(cls, cached)
+
     def __hash__(cls):
-        return hash(tuple([cls.__name__] + list(cls.properties or [])))
+        """Hash a model by its name and property names.
+
+        The hash is computed once, and computed again only if the model's
+        attributes or properties are reassigned. It doesn't change if the
+        model is renamed.
+        """
+        cached = vars(cls).get("_hash")
+        if cached is None:
+            cached = hash(tuple([cls.__name__] + list(cls.properties or [])))
+            type.__setattr__(cls, "_hash", cached)
+        return cached
 
     @property
     def annotation(cls) -> str:
@@ -157,18 +195,21 @@ class ObjectMeta(type, Element):
         ]
         return [validator for validator in possible_validators if validator]
 
-    def python(cls) -> str:
+    def python(cls, forward: Collection[str] = ()) -> str:
+        """Declare the model as a python class.
+
+        :param forward: Names of properties and class arguments to leave
+            out of the declaration, as they refer to classes declared
+            after it. These must be assigned once those classes are
+            declared. Properties left out are still annotated.
+        """
         super_cls = next(iter(cls.mro()[1:]))
         cls_args = [super_cls.__name__]
-        parameters = list(
-            inspect.signature(type(cls).__new__).parameters.values()
-        )
-        for param in parameters:
-            if param.kind != param.KEYWORD_ONLY:
-                continue
+        for param in keyword_table(type(cls)).keyword_only:
             value = getattr(cls, param.name, NotPassed())
             if (
-                value == param.default
+                param.name in forward
+                or value == param.default
                 or (param.name == "additionalProperties" and value is True)
                 or param.name == "description"
             ):
@@ -189,13 +230,122 @@ class ObjectMeta(type, Element):
             )
         # False positive
         # pylint: disable=no-member
-        for property_ in cast(
+        for name, property_ in cast(
             Dict[str, _Property], cls.properties or {}
-        ).values():
+        ).items():
+            declaration = (
+                f'{name}: "{property_.annotation}"'
+                if name in forward
+                else property_.python()
+            )
             class_def = (
                 class_def
                 + f"""
-    {property_.python()}
+    {declaration}
 """
             )
         return class_def
+
+
+# Models are configured through the metaclass constructor, not `__init__`.
+ObjectMeta.__keywords__ = KeywordTable.from_function(ObjectMeta.__new__, 4)
+
+
+_PICKLED_MODELS: "WeakValueDictionary[str, ObjectMeta]" = WeakValueDictionary()
+_REBUILT_MODELS: "WeakValueDictionary[str, ObjectMeta]" = WeakValueDictionary()
+
+
+def _importable_name(cls: ObjectMeta) -> Optional[str]:
+    """Get the qualified name of a model, if it can be imported by it."""
+    target: Any = sys.modules.get(cls.__module__)
+    for segment in cls.__qualname__.split("."):
+        target = getattr(target, segment, None)
+    return cls.__qualname__ if target is cls else None
+
+
+def _pickle_key(cls: ObjectMeta) -> str:
+    """Get the registry key for a model, registering it if necessary.
+
+    The key is stored on the class itself rather than inherited, so that
+    subclasses receive their own key.
+    """
+    key = vars(cls).get("_pickle_key")
+    if not key:
+        # pylint: disable=import-outside-toplevel
+        from uuid import uuid4
+
+        key = uuid4().hex
+        type.__setattr__(cls, "_pickle_key", key)
+        _PICKLED_MODELS[key] = cls
+    return key
+
+
+def _reduce_model(cls: ObjectMeta):
+    """Reduce an object model for pickling.
+
+    Models which are importable by name are pickled by reference, as with
+    any other class. Models created at runtime, for example by the parser,
+    are pickled by their structure along with a registry key. Unpickling
+    in the originating process returns the original model, and other
+    processes rebuild the model once, caching it by key.
+
+    The structure is pickled as state, after the model itself, so that
+    recursive models may refer to themselves.
+    """
+    name = _importable_name(cls)
+    if name:
+        return name
+    properties = {
+        attr: (prop.element, prop.required, prop.source)
+        for attr, prop in cast(Dict[str, _Property], cls.properties).items()
+    }
+    kwargs = {
+        param.name: getattr(cls, param.name)
+        for param in keyword_table(ObjectMeta).keyword_only
+    }
+    return (
+        _rebuild_model,
+        (_pickle_key(cls), cls.__name__, cls.__bases__),
+        (properties, kwargs),
+        None,
+        None,
+        _define_model,
+    )
+
+
+def _rebuild_model(key: str, name: str, bases: Tuple[Type]) -> ObjectMeta:
+    """Retrieve a pickled model, or declare it if not already present."""
+    existing = _PICKLED_MODELS.get(key, _REBUILT_MODELS.get(key))
+    if existing is not None:
+        return existing
+    model = ObjectMeta(name, bases, ObjectClassDict())
+    type.__setattr__(model, "_pickle_key", key)
+    type.__setattr__(model, "_incomplete", True)
+    _REBUILT_MODELS[key] = model
+    return model
+
+
+def _define_model(
+    model: ObjectMeta,
+    state: Tuple[
+        Dict[str, Tuple[Element, bool, Optional[str]]], Dict[str, Any]
+    ],
+):
+    """Define a model declared by `_rebuild_model` from its pickled state.
+
+    Models which already existed are left unchanged.
+    """
+    if not vars(model).get("_incomplete"):
+        return
+    properties, kwargs = state
+    for key, value in kwargs.items():
+        setattr(model, key, value)
+    # https://github.com/python/mypy/issues/3004
+    model.properties = {  # type: ignore
+        attr: _Property(element, required=required, source=source)
+        for attr, (element, required, source) in properties.items()
+    }
+    delattr(model, "_incomplete")
+
+
+copyreg.pickle(ObjectMeta, _reduce_model)
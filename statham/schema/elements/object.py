@@ -1,8 +1,7 @@
-from typing import Any, ClassVar, Dict, Union
+from typing import Any, cast, ClassVar, Dict, Union
 
 from statham.schema.elements.base import Element, UNBOUND_PROPERTY
 from statham.schema.elements.meta import ObjectClassDict, ObjectMeta
-from statham.schema.exceptions import ValidationError
 from statham.schema.property import _Property
 from statham.schema.constants import NotPassed
 
@@ -36,6 +35,7 @@ class Object(metaclass=ObjectMeta):
     default: ClassVar[Any]
     additionalProperties: ClassVar[Union[Element, bool]]
     description: ClassVar[str]
+    _dict: Dict[str, Any]
 
     def __init_subclass__(cls, *args, **kwargs):
         if cls.__doc__ and cls.description is NotPassed():
@@ -44,46 +44,19 @@ class Object(metaclass=ObjectMeta):
     def __new__(
         cls, value: Any = NotPassed(), property_: _Property = UNBOUND_PROPERTY
     ):
-        """Preprocess new instances.
+        """Validate and initialise new instances.
 
         If value isn't passed, attempt to instantiate the default, but
         allow non-matching defaults.
 
         This is the equivalent of `Element.__call__`.
         """
-        if isinstance(value, cls):
-            return value
-        if not isinstance(cls.default, NotPassed) and isinstance(
-            value, NotPassed
-        ):
-            try:
-                return cls(cls.default, property_)
-            except (TypeError, ValidationError):
-                return cls.default
-        if isinstance(value, NotPassed):
-            return value
-        for validator in cls.validators:
-            validator(value, property_)
-        return object.__new__(cls)
+        return _new_object(cls, value, property_)
 
     def __init__(
         self, value: Any = NotPassed(), _property: _Property = UNBOUND_PROPERTY
     ):
-        """Initialise the object.
-
-        The equivalent of `Element.__call__`, but on a class/instance.
-        """
-        if value is self:
-            return
-        if isinstance(value, NotPassed) and not isinstance(
-            self.default, NotPassed
-        ):
-            value = self.default
-        self._dict: Dict[str, Any] = {}
-        for attr_name, attr_value in type(self).__properties__(value).items():
-            if attr_name in type(self).properties:
-                setattr(self, attr_name, attr_value)
-            self._dict[attr_name] = attr_value
+        """Instances are initialised by `__new__`, as values are validated."""
 
     def __repr__(self):
         attr_values = {
@@ -108,6 +81,10 @@ class Object(metaclass=ObjectMeta):
     def __getitem__(self, key: str) -> Any:
         return self._dict[key]
 
+    def __reduce__(self):
+        """Pickle instances by their model and already validated values."""
+        return _restore, (type(self), self._dict)
+
     @staticmethod
     def inline(
         name: str, *, properties: Dict[str, Any] = None, **kwargs
@@ -129,3 +106,22 @@ class Object(metaclass=ObjectMeta):
         for prop_name, prop in properties.items():
             object_properties[prop_name] = prop
         return ObjectMeta(name, (Object,), object_properties, **kwargs)
+
+
+def _restore(cls: ObjectMeta, values: Dict[str, Any]) -> Object:
+    """Create an instance from validated values.
+
+    Used to restore pickled instances without repeating validation.
+    """
+    instance: Object = object.__new__(cls)  # type: ignore
+    instance._dict = values  # pylint: disable=protected-access
+    properties = cast(Dict[str, _Property], cls.properties)
+    for attr_name, attr_value in values.items():
+        if attr_name in properties:
+            setattr(instance, attr_name, attr_value)
+    return instance
+
+
+# Needs to be imported last to prevent cyclic import.
+# pylint: disable=wrong-import-position
+from statham.schema.engine import _new_object
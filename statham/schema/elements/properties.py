@@ -19,8 +19,9 @@ class Properties:
         self.pattern = PatternDict(pattern or {})
         for name, prop in self.props.items():
             prop.bind(name=name, parent=self.element)
+        self._sources = {prop.source: prop for prop in self.props.values()}
         if isinstance(additional, bool):
-            self.additional = {True: Element(), False: Nothing()}[additional]
+            self.additional = Element() if additional else Nothing()
         else:
             self.additional = additional
 
@@ -33,16 +34,16 @@ class Properties:
         props = [repr(self.props)]
         if self.pattern:
             props.append(f"patternProperties={self.pattern}")
-        if self.additional == Nothing():
+        if isinstance(self.additional, Nothing):
             props.append("additionalProperties=False")
         elif self.additional != Element():
             props.append(f"additionalProperties={self.additional}")
         return f"{type(self).__name__}({', '.join(props)})"
 
     def __getitem__(self, key):
-        prop = {prop.source: prop for prop in self.props.values()}.get(
-            key, None
-        )
+        prop = self._sources.get(key)
+        if prop and not self.pattern:
+            return prop
         pattern_elems = list(self.pattern.getall(key))
         if not (prop or pattern_elems):
             return self.property(self.additional, key)
@@ -61,7 +62,7 @@ class Properties:
         return composite
 
     def __contains__(self, key):
-        return bool(self[key].element != Nothing())
+        return not isinstance(self[key].element, Nothing)
 
     def __iter__(self):
         return iter(self.props)
@@ -0,0 +1,694 @@
+# False positive. The cycle exists but is avoided by importing last.
+# pylint: disable=cyclic-import,too-many-lines
+"""Validation of values against elements, without recursion.
+
+Validating a value against an element validates each of its items and
+properties against sub-elements, and so on for the whole value. Rather
+than recursing, the :class:`Engine` evaluates each element as a
+generator, which yields a request whenever it needs a sub-element
+evaluated. The generators are kept on an explicit stack, so values may be
+nested as deeply as memory allows, at the cost of one generator per
+level.
+
+All validation goes through an engine, so calling an element or
+instantiating a model needs nothing more. To limit how deeply values may
+be nested, use :func:`validate` or an :class:`Engine` directly:
+
+.. code:: python
+
+    from statham.schema.engine import validate
+
+    validate(element, value, max_depth=100)
+
+"""
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from statham.schema.constants import NotPassed
+from statham.schema.exceptions import ValidationError
+from statham.schema.property import _Property
+from statham.schema.validation import (
+    Contains,
+    Dependencies,
+    PropertyNames,
+    Required,
+    Validator,
+)
+from statham.schema.validation.base import _is_instance
+
+if TYPE_CHECKING:  # pragma: no cover
+    from statham.schema.elements.items import Items
+    from statham.schema.elements.properties import Properties
+
+
+class _Request(NamedTuple):
+    """A request to evaluate an element against a value."""
+
+    element: "Element"
+    value: Any
+    property_: _Property
+    depth: int
+
+
+_Evaluation = Generator[_Request, Any, Any]
+
+
+class _Plan(NamedTuple):
+    """What is needed to evaluate an element, computed once per element."""
+
+    element: "Element"
+    validators: List[Tuple[Validator, Optional[Callable]]]
+    evaluates: bool
+    """Whether any validator evaluates sub-elements, see :data:`_HANDLERS`."""
+
+    properties: "Properties"
+    items: Optional["Items"]
+    """Items of the element, or ``None`` for models, which have no items."""
+
+    containers: Tuple[Tuple[str, Any], ...]
+    """Copies of the list and dictionary keywords of the element, see
+    :data:`_CONTAINERS`.
+    """
+
+
+_CONTAINERS = (
+    "enum",
+    "items",
+    "required",
+    "properties",
+    "patternProperties",
+    "dependencies",
+)
+"""Keywords whose values may be modified in place.
+
+Plans copy the values of these keywords, and are computed again once the
+values differ from their copies.
+"""
+
+
+def _containers(element: "Element") -> Tuple[Tuple[str, Any], ...]:
+    """Copy the list and dictionary keywords of an element."""
+    containers: List[Tuple[str, Any]] = []
+    for name in _CONTAINERS:
+        value = getattr(element, name, None)
+        if isinstance(value, list):
+            containers.append((name, list(value)))
+        elif isinstance(value, dict):
+            containers.append((name, dict(value)))
+    return tuple(containers)
+
+
+def _modified(plan: _Plan) -> bool:
+    """Check whether keywords of an element were modified in place since
+    its plan was computed.
+
+    Copies share their members with the values, so unmodified values are
+    compared by identity.
+    """
+    return any(
+        getattr(plan.element, name, None) != copy
+        for name, copy in plan.containers
+    )
+
+
+class Engine:
+    """Validate values against elements, using an explicit stack.
+
+    The validators of each element are computed when it is first
+    evaluated, and kept until an attribute of the element is assigned, so
+    they are shared by every engine. Lists and dictionaries of keywords
+    such as ``required`` and ``patternProperties`` are copied with the
+    validators, which are computed again if they are modified in place.
+
+    :param max_depth: The maximum depth to which values may nest. Values
+        nested more deeply fail validation. By default, depth is only
+        limited by memory.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None):
+        self.max_depth = max_depth
+
+    def validate(
+        self,
+        element: "Element",
+        value: Any = NotPassed(),
+        property_: Optional[_Property] = None,
+    ) -> Any:
+        """Validate and convert a value against an element.
+
+        This is equivalent to :meth:`Element.__call__`.
+
+        :param element: The :class:`~statham.schema.elements.Element` to
+            validate against.
+        :param value: The input data.
+        :param property_: Optionally specify the outer property scope
+            enclosing ``element``, for error messages.
+        :return: The parsed value.
+        :raises ValidationError: if the value fails validation, or is
+            nested more deeply than :paramref:`Engine.max_depth`.
+        """
+        return self._run(
+            self._evaluate(element, value, property_ or UNBOUND_PROPERTY, 0)
+        )
+
+    def _run(self, evaluation: _Evaluation) -> Any:
+        """Run an evaluation, and the evaluations it requests."""
+        stack = [evaluation]
+        result: Any = None
+        error: Optional[Exception] = None
+        while stack:
+            try:
+                if error is None:
+                    request = stack[-1].send(result)
+                else:
+                    thrown, error = error, None
+                    request = stack[-1].throw(thrown)
+            except StopIteration as stop:
+                stack.pop()
+                result = stop.value
+                continue
+            except Exception as exc:  # pylint: disable=broad-except
+                # Propagate to the enclosing evaluation, as if recursing.
+                stack.pop()
+                if not stack:
+                    raise
+                error = exc
+                continue
+            if self.max_depth is not None and request.depth > self.max_depth:
+                raise ValidationError.max_depth(
+                    request.property_, request.value, self.max_depth
+                )
+            stack.append(self._evaluate(*request))
+            result = None
+        return result
+
+    def _plan(self, element: "Element") -> _Plan:
+        # Not static, as profiling engines override it.
+        # pylint: disable=no-self-use
+        plan = vars(element).get("__plan__")
+        # Copies of an element share its attributes, but not its plan.
+        if (
+            plan is None
+            or plan.element is not element
+            or (plan.containers and _modified(plan))
+        ):
+            validators = [
+                (validator, _HANDLERS.get(type(validator)))
+                for validator in element.validators
+            ]
+            plan = _Plan(
+                element,
+                validators,
+                any(handler for _, handler in validators),
+                element.__properties__,
+                None if isinstance(element, ObjectMeta) else element.__items__,
+                _containers(element),
+            )
+            # Assigning the plan directly doesn't discard it.
+            if isinstance(element, ObjectMeta):
+                type.__setattr__(element, "__plan__", plan)
+            else:
+                vars(element)["__plan__"] = plan
+        return plan
+
+    def _evaluate(
+        self, element: "Element", value: Any, property_: _Property, depth: int
+    ) -> _Evaluation:
+        """Evaluate an element, as calling it."""
+        # pylint: disable=comparison-with-callable
+        if isinstance(element, ObjectMeta):
+            if (
+                element.__new__ is Object.__new__
+                and element.__init__ is Object.__init__  # type: ignore
+            ):
+                # Skip initialising the instance, which does nothing.
+                return self._new(element, value, property_, depth)
+            return self._model(element, value, property_, depth)
+        if type(element).__call__ is not Element.__call__:
+            return _called(element, value, property_)
+        return self._call(element, value, property_, depth)
+
+    def _call(
+        self, element: "Element", value: Any, property_: _Property, depth: int
+    ) -> _Evaluation:
+        """Evaluate an element, as :meth:`Element.__call__`."""
+        if not isinstance(element.default, NotPassed) and isinstance(
+            value, NotPassed
+        ):
+            try:
+                return (
+                    yield from self._create(
+                        element, element.default, property_, depth
+                    )
+                )
+            except (TypeError, ValidationError):
+                return element.default
+        if isinstance(value, NotPassed):
+            return value
+        return (yield from self._create(element, value, property_, depth))
+
+    def _model(
+        self, model: "ObjectMeta", value: Any, property_: _Property, depth: int
+    ) -> _Evaluation:
+        """Evaluate an object model, as calling it."""
+        # pylint: disable=comparison-with-callable
+        if model.__new__ is not Object.__new__:
+            return model(value, property_)
+        instance = yield from self._new(model, value, property_, depth)
+        if isinstance(instance, model):
+            instance.__init__(value, property_)
+        return instance
+
+    def _new(
+        self,
+        model: "ObjectMeta",
+        value: Any,
+        property_: _Property,
+        depth: int,
+        compiled: bool = True,
+    ) -> _Evaluation:
+        """Evaluate an object model, as :meth:`Object.__new__`.
+
+        The compiled function of the model is used unless ``compiled`` is
+        false, depth is limited, or an installed factory disables compiled
+        functions.
+        """
+        # pylint: disable=too-many-arguments
+        if isinstance(value, model):
+            return value
+        if not isinstance(model.default, NotPassed) and isinstance(
+            value, NotPassed
+        ):
+            try:
+                return (
+                    yield from self._model(
+                        model, model.default, property_, depth
+                    )
+                )
+            except (TypeError, ValidationError):
+                return model.default
+        if isinstance(value, NotPassed):
+            return value
+        if compiled and _use_compiled and self.max_depth is None:
+            instance = _compiled(model, value)
+            if instance is not None:
+                return instance
+        plan = self._plan(model)
+        if plan.evaluates:
+            yield from self._validate(plan, value, property_, depth)
+        else:
+            self._check(plan, value, property_)
+        values = yield from self._properties(plan.properties, value, depth)
+        return _restore(model, values)
+
+    def _create(
+        self, element: "Element", value: Any, property_: _Property, depth: int
+    ) -> _Evaluation:
+        """Validate and construct a value which was passed."""
+        plan = self._plan(element)
+        if plan.evaluates:
+            yield from self._validate(plan, value, property_, depth)
+        else:
+            self._check(plan, value, property_)
+        construct = type(element).construct
+        # pylint: disable=comparison-with-callable
+        if construct is Element.construct:
+            if isinstance(value, list):
+                # Only models have no items, and they aren't created here.
+                items = cast("Items", plan.items)
+                return (yield from self._items(items, value, property_, depth))
+            if isinstance(value, dict):
+                return _AnonymousObject(
+                    **(
+                        yield from self._properties(
+                            plan.properties, value, depth
+                        )
+                    )
+                )
+            return value
+        if construct is CompositionElement.construct:
+            return (
+                yield from self._compose(
+                    cast(CompositionElement, element), value, property_, depth
+                )
+            )
+        if construct is Not.construct:
+            return (
+                yield from self._negate(
+                    cast(Not, element), value, property_, depth
+                )
+            )
+        return element.construct(value, property_)
+
+    @staticmethod
+    def _compose(
+        element: "CompositionElement",
+        value: Any,
+        property_: _Property,
+        depth: int,
+    ) -> _Evaluation:
+        """Evaluate a composition, as :meth:`CompositionElement.construct`."""
+        mode = getattr(element, "mode", None)
+        if not mode:
+            raise NotImplementedError
+        outcomes = []
+        for sub_element in element.elements:
+            try:
+                result = yield _Request(sub_element, value, property_, depth)
+            except (TypeError, ValidationError) as exc:
+                # Only the message is kept, so release the frames in its
+                # traceback.
+                outcomes.append(
+                    Outcome(sub_element, error=exc.with_traceback(None))
+                )
+            else:
+                if mode == "anyOf":
+                    # The first match is the result, so stop there.
+                    return result
+                outcomes.append(Outcome(sub_element, result=result))
+        return _combine_outcomes(outcomes, value, property_, mode)
+
+    @staticmethod
+    def _negate(
+        element: "Not", value: Any, property_: _Property, depth: int
+    ) -> _Evaluation:
+        """Evaluate a negation, as :meth:`Not.construct`."""
+        try:
+            yield _Request(element.element, value, property_, depth)
+        except (TypeError, ValidationError):
+            return value
+        raise ValidationError.from_validator(
+            property_, value, f"Must not match {element.element}."
+        )
+
+    @staticmethod
+    def _check(plan: _Plan, value: Any, property_: _Property):
+        """Apply validators which don't evaluate sub-elements."""
+        for validator, _ in plan.validators:
+            validator(value, property_)
+
+    @staticmethod
+    def _validate(
+        plan: _Plan, value: Any, property_: _Property, depth: int
+    ) -> _Evaluation:
+        for validator, handler in plan.validators:
+            if handler is None:
+                validator(value, property_)
+            elif not validator.types or _is_instance(value, validator.types):
+                try:
+                    yield from handler(validator, value, depth)
+                except ValidationError:
+                    raise ValidationError.from_validator(
+                        property_, value, validator.error_message()
+                    )
+
+    @staticmethod
+    def _items(
+        items: "Items", value: List[Any], property_: _Property, depth: int
+    ) -> _Evaluation:
+        """Evaluate array items, as :meth:`Items.__call__`."""
+        results = []
+        for index, sub_value in enumerate(value):
+            results.append(
+                (
+                    yield _Request(
+                        items[index],
+                        sub_value,
+                        items.property(property_, index),
+                        depth + 1,
+                    )
+                )
+            )
+        return results
+
+    @staticmethod
+    def _properties(
+        properties: "Properties", value: Dict[str, Any], depth: int
+    ) -> _Evaluation:
+        """Evaluate object properties, as :meth:`Properties.__call__`.
+
+        Each declared property is evaluated first, followed by the other
+        keys of the value, in order.
+        """
+        results = {}
+        for name in properties.props:
+            prop = properties[name]
+            if name in value:
+                sub_value = value[name]
+            elif _accepts_missing(prop.element):
+                results[prop.name or name] = _NOT_PASSED
+                continue
+            else:
+                sub_value = _NOT_PASSED
+            results[prop.name or name] = yield _Request(
+                prop.element, sub_value, prop, depth + 1
+            )
+        for key, sub_value in value.items():
+            if key in properties.props:
+                continue
+            prop = properties[key]
+            results[prop.name or key] = yield _Request(
+                prop.element, sub_value, prop, depth + 1
+            )
+        return results
+
+
+_NOT_PASSED = NotPassed()
+
+
+def _called(
+    element: "Element", value: Any, property_: _Property
+) -> _Evaluation:
+    """Evaluate an element which overrides :meth:`Element.__call__`."""
+    yield from ()
+    return element(value, property_)
+
+
+def _accepts_missing(element: "Element") -> bool:
+    """Whether evaluating ``element`` against a value which isn't passed
+    trivially returns it, so may be skipped.
+    """
+    # pylint: disable=comparison-with-callable
+    if not isinstance(element.default, NotPassed):
+        return False
+    if isinstance(element, ObjectMeta):
+        return element.__new__ is Object.__new__
+    return type(element).__call__ is Element.__call__
+
+
+def _contains(validator: Contains, value: List[Any], depth: int):
+    for sub_value in value:
+        try:
+            yield _Request(
+                validator.params["contains"],
+                sub_value,
+                UNBOUND_PROPERTY,
+                depth + 1,
+            )
+            return
+        except (TypeError, ValidationError):
+            continue
+    raise ValidationError
+
+
+def _property_names(validator: PropertyNames, value: Dict, depth: int):
+    for prop_name in value:
+        try:
+            yield _Request(
+                validator.params["propertyNames"],
+                prop_name,
+                UNBOUND_PROPERTY,
+                depth + 1,
+            )
+        except (TypeError, ValidationError):
+            raise ValidationError
+
+
+def _dependencies(validator: Dependencies, value: Dict, depth: int):
+    for key, dependency in validator.params["dependencies"].items():
+        if key not in value:
+            continue
+        if isinstance(dependency, list):
+            # pylint: disable=protected-access
+            Required(dependency)._validate(value)
+            continue
+        try:
+            yield _Request(dependency, value, UNBOUND_PROPERTY, depth)
+        except (TypeError, ValidationError):
+            raise ValidationError
+
+
+_HANDLERS: Dict[type, Callable] = {
+    Contains: _contains,
+    Dependencies: _dependencies,
+    PropertyNames: _property_names,
+}
+"""Evaluations of validators which validate sub-elements."""
+
+
+EngineFactory = Callable[[Optional[int]], Engine]
+"""Creates an engine, given a maximum depth."""
+
+
+_installed: List[Tuple[EngineFactory, bool]] = []
+_lock = Lock()
+
+_engine: EngineFactory = Engine
+"""Creates the engine with which elements are called and models are
+instantiated, which is the factory most recently installed with
+:func:`install`.
+"""
+
+_use_compiled = True  # pylint: disable=invalid-name
+"""Whether models are constructed by their compiled functions, unless
+disabled by an installed factory.
+"""
+
+
+def install(factory: EngineFactory, compiled: bool = True):
+    """Call elements and instantiate models with engines from a factory.
+
+    The most recently installed factory is used, in every thread, until
+    it is uninstalled. This is how validation is profiled, see
+    :mod:`statham.schema.profiling`.
+
+    :param factory: Creates an engine, given a maximum depth.
+    :param compiled: Whether models may be constructed by their compiled
+        functions while the factory is installed.
+    """
+    with _lock:
+        _installed.append((factory, compiled))
+        _update()
+
+
+def uninstall(factory: EngineFactory):
+    """Uninstall a factory installed with :func:`install`.
+
+    Factories may be uninstalled in any order. Those installed later
+    remain installed.
+
+    :param factory: The factory to uninstall. If it is installed more than
+        once, only its most recent installation is removed.
+    :raises ValueError: if the factory is not installed.
+    """
+    with _lock:
+        for index in reversed(range(len(_installed))):
+            if _installed[index][0] == factory:
+                del _installed[index]
+                _update()
+                return
+    raise ValueError(f"{factory} is not installed.")
+
+
+def installed(below: Optional[EngineFactory] = None) -> EngineFactory:
+    """Get the most recently installed factory.
+
+    :param below: Optionally, get the factory most recently installed
+        before this one, other than itself.
+    :return: The factory, or :class:`Engine` if none is installed.
+    """
+    with _lock:
+        factories: List[EngineFactory] = [factory for factory, _ in _installed]
+    if below in factories:
+        # Discard those installed since, and any other installations of it.
+        while factories[-1] != below:
+            factories.pop()
+        factories = [factory for factory in factories if factory != below]
+    if not factories:
+        return Engine
+    return factories[-1]
+
+
+def _update():
+    """Use the most recently installed factory."""
+    # pylint: disable=global-statement,invalid-name
+    global _engine, _use_compiled
+    _engine = _installed[-1][0] if _installed else Engine
+    _use_compiled = all(compiled for _, compiled in _installed)
+
+
+def validate(
+    element: "Element",
+    value: Any = NotPassed(),
+    property_: Optional[_Property] = None,
+    *,
+    max_depth: Optional[int] = None,
+) -> Any:
+    """Validate and convert a value against an element.
+
+    This is equivalent to calling ``element``, but allows the depth of
+    the value to be limited.
+
+    :param element: The :class:`~statham.schema.elements.Element` to
+        validate against.
+    :param value: The input data.
+    :param property_: Optionally specify the outer property scope
+        enclosing ``element``, for error messages.
+    :param max_depth: The maximum depth to which values may nest.
+    :return: The parsed value.
+    :raises ValidationError: if the value fails validation, or is nested
+        more deeply than ``max_depth``.
+    """
+    return _engine(max_depth).validate(element, value, property_)
+
+
+def _call_element(element: "Element", value: Any, property_: _Property) -> Any:
+    """Implementation of :meth:`Element.__call__`."""
+    # pylint: disable=protected-access
+    engine = _engine(None)
+    return engine._run(engine._call(element, value, property_, 0))
+
+
+def _new_object(model: "ObjectMeta", value: Any, property_: _Property) -> Any:
+    """Implementation of :meth:`Object.__new__`."""
+    if _use_compiled:
+        instance = _compiled(model, value)
+        if instance is not None:
+            return instance
+    # pylint: disable=protected-access
+    engine = _engine(None)
+    return engine._run(engine._new(model, value, property_, 0, compiled=False))
+
+
+def _compiled(model: "ObjectMeta", value: Any) -> Optional[Any]:
+    """Construct an instance with the compiled function of a model.
+
+    See :mod:`statham.schema.compiled`. Returns ``None`` if the model isn't
+    compiled, or if its compiled function doesn't accept the value.
+    """
+    function = vars(model).get("__compiled__")
+    if function is None or not isinstance(value, dict):
+        return None
+    try:
+        return _restore(model, function(value))
+    except Exception:  # pylint: disable=broad-except
+        # Validate as usual, to raise the appropriate error.
+        return None
+
+
+# Needs to be imported last to prevent cyclic import.
+# pylint: disable=wrong-import-position
+from statham.schema.elements.base import (
+    _AnonymousObject,
+    Element,
+    UNBOUND_PROPERTY,
+)
+from statham.schema.elements.composition import (
+    _combine_outcomes,
+    CompositionElement,
+    Not,
+    Outcome,
+)
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.elements.object import _restore, Object
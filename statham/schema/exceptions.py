@@ -1,4 +1,5 @@
-from typing import Dict
+import reprlib
+from typing import Any, Dict
 
 from statham.schema.constants import JSONElement
 
@@ -26,9 +27,9 @@ class ValidationError(StathamError):
     @classmethod
     def from_validator(cls, property_, value, message) -> "ValidationError":
         value_string = (
-            f"{repr(property_.parent)}.{property_.name} = {repr(value)}`"
+            f"{repr(property_.parent)}.{property_.name} = {_repr(value)}`"
             if property_.name != "<unbound>"
-            else repr(value)
+            else _repr(value)
         )
         return cls(f"Failed validating `{value_string}`. {message}")
 
@@ -43,6 +44,14 @@ class ValidationError(StathamError):
             property_, value, message + f" Individual errors: {error_breakdown}"
         )
 
+    @classmethod
+    def max_depth(cls, property_, value, max_depth) -> "ValidationError":
+        return cls.from_validator(
+            property_,
+            value,
+            f"Exceeds the maximum nesting depth of {max_depth}.",
+        )
+
     @classmethod
     def multiple_composition_match(cls, matching_models, data):
         return cls(
@@ -52,6 +61,14 @@ class ValidationError(StathamError):
         )
 
 
+def _repr(value: Any) -> str:
+    """Represent a value, abbreviating values too deeply nested to repr."""
+    try:
+        return repr(value)
+    except RecursionError:
+        return reprlib.repr(value)
+
+
 class SchemaParseError(StathamError):
     """Raised when parsing JSON Schema documents to statham models."""
 
@@ -76,6 +93,10 @@ class SchemaParseError(StathamError):
     def invalid_type(cls, value):
         return cls(f"Got invalid type keyword: {value}.")
 
+    @classmethod
+    def missing_definition(cls, name: str) -> "SchemaParseError":
+        return cls(f"No definition named {name!r} in schema.")
+
 
 # pylint: disable=line-too-long
 class FeatureNotImplementedError(SchemaParseError):
@@ -86,3 +107,11 @@ class FeatureNotImplementedError(SchemaParseError):
         return cls(
             f"The following provided keywords are not supported: {keywords}"
         )
+
+    @classmethod
+    def cyclical_reference(cls, location: str) -> "FeatureNotImplementedError":
+        return cls(
+            "Could not parse cyclical dependencies of this schema. Only "
+            "object schemas may refer back to themselves. Cycle found at: "
+            f"{location}"
+        )
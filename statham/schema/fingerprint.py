@@ -0,0 +1,127 @@
+"""Stable structural hashing of Element trees.
+
+Fingerprints are consistent with :meth:`Element.__eq__
+<statham.schema.elements.Element.__eq__>`: elements which compare equal
+have the same fingerprint. The converse holds for elements built from JSON
+Schema values, but equality should still be checked where it matters.
+
+Fingerprints are cached on each element, and discarded when its
+attributes or properties are set. Modifying a sub-element in place does
+not discard the fingerprints of elements containing it. Elements which
+are still being defined, such as recursive models during parsing, should
+set an ``_incomplete`` attribute. These are hashed by identity, and fingerprints
+which include them are not cached.
+"""
+from hashlib import blake2b
+from typing import Any, Iterable, List, Tuple
+
+from statham.schema.constants import NotPassed
+from statham.schema.elements import Element
+from statham.schema.property import _Property
+
+
+def fingerprint(element: Element) -> str:
+    """Get the structural fingerprint of an element.
+
+    The fingerprint is stable across processes, as it is derived only
+    from the type and keyword values of the element and its sub-elements.
+    Model names are not included, matching element equality.
+
+    :param element: The :class:`~statham.schema.elements.Element` to
+        fingerprint.
+    :return: A hex digest identifying the structure of the element.
+    """
+    digest, _ = _Fingerprinter().element(element)
+    return digest
+
+
+def _digest(value: str) -> str:
+    return blake2b(value.encode("utf8"), digest_size=16).hexdigest()
+
+
+def _public_vars(element: Element):
+    """Attributes considered by element equality."""
+    return {
+        key: value
+        for key, value in vars(element).items()
+        if not key.startswith("_") or key == "_properties"
+    }
+
+
+class _Fingerprinter:
+    """Recursive state for computing fingerprints.
+
+    Tracks the elements currently being hashed, so that cyclical
+    references are hashed by their relative depth. Digests which depend
+    on an enclosing element in this way are not cached, as they differ
+    depending on where hashing started.
+    """
+
+    def __init__(self):
+        self.stack: List[int] = []
+
+    def element(self, element: Element) -> Tuple[str, int]:
+        """Hash an element.
+
+        :return: The digest, and the shallowest stack depth referred to by
+            the digest.
+        """
+        cached = vars(element).get("_fingerprint")
+        if cached:
+            return cached, len(self.stack)
+        if vars(element).get("_incomplete"):
+            return f"id:{id(element)}", -1
+        if id(element) in self.stack:
+            depth = self.stack.index(id(element))
+            return f"cycle:{len(self.stack) - depth}", depth
+        depth = len(self.stack)
+        self.stack.append(id(element))
+        try:
+            values, referred = self.value(_public_vars(element))
+        finally:
+            self.stack.pop()
+        element_type = type(element)
+        digest = _digest(
+            f"{element_type.__module__}.{element_type.__qualname__}{values}"
+        )
+        if referred >= depth:
+            setattr(element, "_fingerprint", digest)
+        return digest, min(referred, depth)
+
+    def value(self, value: Any) -> Tuple[str, int]:
+        """Hash an arbitrary keyword value."""
+        # pylint: disable=too-many-return-statements
+        shallowest = len(self.stack)
+        if isinstance(value, Element):
+            return self.element(value)
+        if isinstance(value, _Property):
+            element, shallowest = self.element(value.element)
+            prop = f"P({element},{value.required},{value.source!r})"
+            return prop, shallowest
+        if isinstance(value, dict):
+            items = sorted(value.items(), key=lambda item: repr(item[0]))
+            return self.items("dict", items)
+        if isinstance(value, (list, tuple)):
+            label = "list" if isinstance(value, list) else "tuple"
+            return self.items(label, enumerate(value))
+        if isinstance(value, (int, float)):
+            # Equal numbers must match, e.g. 1 == 1.0 == True.
+            if isinstance(value, int) or value.is_integer():
+                return f"n:{int(value)}", shallowest
+            return f"n:{value!r}", shallowest
+        if isinstance(value, (str, type(None), NotPassed)):
+            return repr(value), shallowest
+        # Unknown values are only equal to themselves.
+        return f"id:{id(value)}", shallowest
+
+    def items(
+        self, label: str, items: Iterable[Tuple[Any, Any]]
+    ) -> Tuple[str, int]:
+        """Hash the items of a container."""
+        shallowest = len(self.stack)
+        parts = []
+        for key, value in items:
+            digest, referred = self.value(value)
+            shallowest = min(shallowest, referred)
+            parts.append(f"{key!r}:{digest}")
+        return f"{label}({','.join(parts)})", shallowest
@@ -5,8 +5,10 @@ from typing import (
     Callable,
     Container,
     Dict,
+    FrozenSet,
     Iterable,
     List,
+    NamedTuple,
     Tuple,
     Type,
     TypeVar,
@@ -30,13 +32,60 @@ class Args:
         return "(" + ", ".join(filter(None, [arg_string, kwarg_string])) + ")"
 
 
+class KeywordTable(NamedTuple):
+    """Precomputed signature metadata for a constructor.
+
+    Avoids calling :func:`inspect.signature` each time the accepted
+    keywords of a type are needed.
+    """
+
+    parameters: Tuple[inspect.Parameter, ...]
+    """Parameters of the constructor, excluding bound arguments."""
+
+    names: FrozenSet[str]
+    """Names of all accepted parameters."""
+
+    keyword_only: Tuple[inspect.Parameter, ...]
+    """Parameters which may only be passed by keyword."""
+
+    @classmethod
+    def from_function(cls, function: Callable, bound: int = 1):
+        """Build the table from a constructor.
+
+        :param function: The constructor to inspect.
+        :param bound: The number of leading arguments to exclude, e.g.
+            ``self``.
+        """
+        signature = inspect.signature(function)
+        parameters = tuple(signature.parameters.values())[bound:]
+        return cls(
+            parameters,
+            frozenset(param.name for param in parameters),
+            tuple(
+                param
+                for param in parameters
+                if param.kind == param.KEYWORD_ONLY
+            ),
+        )
+
+
+def keyword_table(type_: Type) -> KeywordTable:
+    """Get the keyword table for a type.
+
+    Tables are stored on each type under ``__keywords__``. Element types
+    build theirs at class definition, other types on first use.
+    """
+    table = vars(type_).get("__keywords__")
+    if table is None:
+        table = KeywordTable.from_function(type_.__init__)
+        type_.__keywords__ = table
+    return table
+
+
 def custom_repr_args(self, **overrides: Any) -> Args:
     args: List[Any] = []
     kwargs: Dict[str, Any] = {}
-    parameters = list(
-        inspect.signature(type(self).__init__).parameters.values()
-    )[1:]
-    for param in parameters:
+    for param in keyword_table(type(self)).parameters:
         value = overrides.get(param.name, getattr(self, param.name, None))
         if value == param.default:
             continue
@@ -104,6 +153,13 @@ def expand(function):
     return lambda args: function(*args)
 
 
+def json_pointer(path: Iterable[Any]) -> str:
+    """Format path tokens as a JSON Pointer, escaped as in RFC 6901."""
+    return "".join(
+        "/" + str(token).replace("~", "~0").replace("/", "~1") for token in path
+    )
+
+
 SequenceItem = TypeVar("SequenceItem")
 
 
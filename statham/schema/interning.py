@@ -0,0 +1,197 @@
+"""Sharing of structurally equal elements.
+
+Large schemas commonly contain many structurally equal elements, such as
+``String()`` or ``Element()``. Interning replaces each of these with a
+single canonical instance, which reduces memory use, and allows equality
+checks between interned elements to succeed by identity.
+
+.. code:: python
+
+    from statham.schema.interning import Interner
+
+    interner = Interner()
+    first = interner.intern(Array(String()))
+    second = interner.intern(Array(String()))
+    assert first is second
+
+Interning is opt-in. Elements are interned bottom-up, so that the
+sub-elements of an element are replaced by their canonical instances
+before it is interned. Each element is then keyed by its type, its public
+attribute values and the identity of its canonical sub-elements, so keys
+are shallow and computed once per element.
+
+Object models are never replaced, as models with different names are
+distinct, although their sub-elements are interned. Elements which are
+still being defined, marked with an ``_incomplete`` attribute, are also
+left as they are.
+
+Interning modifies elements in place, and assumes that interned elements
+are not modified afterwards.
+"""
+from typing import Any, Dict, Hashable, Iterator, List, Set, Tuple
+from weakref import WeakValueDictionary
+
+from statham.schema.constants import NotPassed
+from statham.schema.elements import Element
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.property import _Property
+
+
+class Interner:
+    """Table of canonical elements.
+
+    Canonical elements are held weakly, so elements which are no longer
+    used anywhere else are released.
+    """
+
+    def __init__(self):
+        self._table: "WeakValueDictionary[Hashable, Element]" = (
+            WeakValueDictionary()
+        )
+        # Marks elements whose sub-elements are already interned.
+        self._token = object()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def intern(self, element: Element) -> Element:
+        """Get the canonical instance of an element.
+
+        Sub-elements of the element, and of any object models it refers
+        to, are replaced by their canonical instances.
+
+        :param element: The :class:`~statham.schema.elements.Element` to
+            intern.
+        :return: The canonical element structurally equal to
+            ``element``, which may be ``element`` itself.
+        """
+        canonical: Dict[int, Element] = {}
+        entered: Set[int] = set()
+        stack: List[Tuple[Element, bool]] = [(element, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if id(current) in canonical:
+                continue
+            if self._is_interned(current):
+                canonical[id(current)] = current
+                continue
+            if not expanded:
+                if id(current) in entered:
+                    continue  # Visited on a cycle through a model.
+                entered.add(id(current))
+                stack.append((current, True))
+                stack.extend((child, False) for child in _children(current))
+                continue
+            canonical[id(current)] = self._canonical(current, canonical)
+        return canonical.get(id(element), element)
+
+    def _is_interned(self, element: Element) -> bool:
+        return vars(element).get("_interned") is self._token
+
+    def _canonical(
+        self, element: Element, canonical: Dict[int, Element]
+    ) -> Element:
+        """Get the canonical instance of an element whose sub-elements have
+        been interned.
+        """
+        get = lambda child: canonical.get(id(child), child)
+        if isinstance(element, ObjectMeta) or vars(element).get("_incomplete"):
+            _replace_children(element, get)
+            if not vars(element).get("_incomplete"):
+                type.__setattr__(element, "_interned", self._token)
+            return element
+        key = (type(element), _key(_public_vars(element), get))
+        existing = self._table.get(key)
+        if existing is not None:
+            return existing
+        _replace_children(element, get)
+        vars(element)["_interned"] = self._token
+        self._table[key] = element
+        return element
+
+
+_DEFAULT_INTERNER = Interner()
+
+
+def intern_element(element: Element) -> Element:
+    """Get the canonical instance of an element from a shared table.
+
+    See :meth:`Interner.intern`.
+    """
+    return _DEFAULT_INTERNER.intern(element)
+
+
+def _public_vars(element: Element) -> Dict[str, Any]:
+    """Attributes considered by element equality."""
+    return {
+        key: value
+        for key, value in vars(element).items()
+        if not key.startswith("_") or key == "_properties"
+    }
+
+
+def _children(element: Element) -> Iterator[Element]:
+    """Iterate the sub-elements referred to by an element's attributes."""
+    stack: List[Any] = list(_public_vars(element).values())
+    while stack:
+        value = stack.pop()
+        if isinstance(value, Element):
+            yield value
+        elif isinstance(value, _Property):
+            yield value.element
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+
+
+def _replace_children(element: Element, get):
+    """Replace the sub-elements of an element in place."""
+    for name, value in _public_vars(element).items():
+        if isinstance(value, Element):
+            setattr(element, name, get(value))
+        else:
+            _replace_values(value, get)
+
+
+def _replace_values(value: Any, get):
+    if isinstance(value, _Property):
+        value.element = get(value.element)
+    elif isinstance(value, (dict, list)):
+        keys = value.keys() if isinstance(value, dict) else range(len(value))
+        for key in keys:
+            if isinstance(value[key], Element):
+                value[key] = get(value[key])
+            else:
+                _replace_values(value[key], get)
+
+
+def _key(value: Any, get) -> Hashable:
+    """Key a value by its type and content, and sub-elements by identity.
+
+    Values of different types are never interned together, even where they
+    are equal, e.g. ``1`` and ``True``. Container order is preserved.
+    Values of other types are keyed by identity.
+    """
+    if isinstance(value, Element):
+        return ("element", id(get(value)))
+    if isinstance(value, _Property):
+        return (
+            "property",
+            id(get(value.element)),
+            value.required,
+            value.source,
+        )
+    if isinstance(value, dict):
+        return (
+            type(value),
+            tuple(
+                (name, _key(sub_value, get))
+                for name, sub_value in value.items()
+            ),
+        )
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_key(item, get) for item in value))
+    if isinstance(value, (bool, int, float, str, type(None), NotPassed)):
+        return (type(value), value)
+    return ("id", id(value))
@@ -0,0 +1,456 @@
+"""Simplification of parsed Element trees.
+
+Parsed schemas often contain redundant structure, such as nested
+compositions, or compositions with a single sub-element. Each redundant
+element costs time whenever a value is validated, so these may be
+simplified once at load time with :func:`optimize`:
+
+.. code:: python
+
+    from statham.schema import optimize
+    from statham.schema.parser import parse
+
+    element = optimize(parse(schema)[0])
+
+Optimized elements accept and reject the same values, and produce the
+same results, as the elements they are optimized from. Error messages may
+differ.
+"""
+from copy import copy
+from typing import Any, cast, Dict, List, Optional, Set, Tuple, Type
+
+from statham.schema.constants import NotPassed
+from statham.schema.elements import (
+    AllOf,
+    AnyOf,
+    Boolean,
+    CompositionElement,
+    Element,
+    Integer,
+    Nothing,
+    Null,
+    Number,
+    OneOf,
+    String,
+)
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.helpers import keyword_table
+from statham.schema.property import _Property
+
+
+_SCALAR_TYPES: Tuple[Type[Element], ...] = (
+    Boolean,
+    Integer,
+    Null,
+    Number,
+    String,
+)
+"""Element types with no sub-elements, whose results are their input."""
+
+_LOWER_BOUNDS = {"minimum", "exclusiveMinimum", "minLength"}
+_UPPER_BOUNDS = {"maximum", "exclusiveMaximum", "maxLength"}
+# Keywords with no effect on sub-elements of a composition.
+_IGNORED_KEYWORDS = {"default", "description"}
+# Attributes which may contain sub-elements, other than properties.
+_SUB_ELEMENT_ATTRIBUTES = (
+    "items",
+    "additionalItems",
+    "contains",
+    "patternProperties",
+    "additionalProperties",
+    "propertyNames",
+    "dependencies",
+    "elements",
+    "element",
+)
+
+
+def optimize(element: Element) -> Element:
+    """Simplify an element, preserving its behaviour.
+
+    The following simplifications are made throughout the element tree:
+
+    * Compositions nested in compositions of the same kind are flattened,
+      e.g. ``AllOf(A, AllOf(B, C))`` becomes ``AllOf(A, B, C)``.
+    * Compositions with a single sub-element are replaced by it.
+    * Repeated sub-elements are removed from ``AllOf`` and ``AnyOf``
+      elements, as are sub-elements which accept every value from
+      ``AllOf`` elements, and sub-elements which accept no values from
+      ``AnyOf`` and ``OneOf`` elements.
+    * Scalar sub-elements of an ``AllOf`` element with compatible
+      keywords are merged, keeping the strictest of any bounds.
+    * Where each alternative of an ``AnyOf`` or ``OneOf`` element has the
+      same scalar type, the type is checked once, before the
+      alternatives.
+    * Repeated values are removed from enums, and enums of one value are
+      replaced by a constant.
+
+    Object models are optimized in place, as other code may refer to
+    them, but they are never replaced. Other elements are not modified.
+
+    :param element: The :class:`~statham.schema.elements.Element` to
+        optimize.
+    :return: An equivalent element, which may be ``element`` itself.
+    """
+    return Optimizer().optimize(element)
+
+
+class Optimizer:
+    """State for optimizing an element tree.
+
+    Elements are optimized once each, by identity. Object models are
+    queued rather than optimized recursively, so that recursive models
+    terminate and long chains of models don't exceed the recursion limit.
+
+    Subclasses may override :meth:`rewrite` to rewrite elements in other
+    ways, as :func:`~statham.schema.satisfiability.prune_unsatisfiable`
+    does.
+    """
+
+    def __init__(self):
+        self.optimized: Dict[int, Element] = {}
+        self.models: List[ObjectMeta] = []
+        self.queued: Set[int] = set()
+
+    def optimize(self, element: Element) -> Element:
+        """Optimize an element, and each model it refers to."""
+        result = self.element(element)
+        while self.models:
+            model = self.models.pop()
+            properties = cast(Dict[str, _Property], model.properties)
+            for prop in properties.values():
+                prop.element = self.element(prop.element)
+            for name in _SUB_ELEMENT_ATTRIBUTES:
+                if name in vars(model):
+                    setattr(model, name, self.value(vars(model)[name]))
+        return result
+
+    def element(self, element: Element) -> Element:
+        """Optimize an element once, or queue it if it is a model."""
+        if isinstance(element, ObjectMeta):
+            if id(element) not in self.queued:
+                self.queued.add(id(element))
+                self.models.append(element)
+            return element
+        if id(element) not in self.optimized:
+            self.optimized[id(element)] = self.rewrite(element)
+        return self.optimized[id(element)]
+
+    def rewrite(self, element: Element) -> Element:
+        """Optimize an element which is not an object model."""
+        return _simplify(self.children(element))
+
+    def value(self, value: Any) -> Any:
+        """Optimize the elements in an attribute value."""
+        if isinstance(value, Element):
+            return self.element(value)
+        if isinstance(value, list):
+            return [self.value(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.value(item) for key, item in value.items()}
+        return value
+
+    def children(self, element: Element) -> Element:
+        """Optimize the sub-elements of an element.
+
+        :return: The element, or a copy if any sub-elements changed.
+        """
+        replaced: Dict[str, Any] = {}
+        properties: Dict[str, _Property] = (
+            getattr(element, "properties", None) or {}
+        )
+        optimized = {
+            attr: self.element(prop.element)
+            for attr, prop in properties.items()
+        }
+        if any(
+            optimized[attr] is not prop.element
+            for attr, prop in properties.items()
+        ):
+            replaced["properties"] = {
+                attr: _Property(
+                    optimized[attr], required=prop.required, source=prop.source
+                )
+                for attr, prop in properties.items()
+            }
+        for name in _SUB_ELEMENT_ATTRIBUTES:
+            if name in vars(element):
+                value = vars(element)[name]
+                optimized_value = self.value(value)
+                if not _same_elements(value, optimized_value):
+                    replaced[name] = optimized_value
+        return _evolve(element, **replaced) if replaced else element
+
+
+def _simplify(element: Element) -> Element:
+    """Simplify an element whose sub-elements are already optimized."""
+    # pylint: disable=unidiomatic-typecheck
+    if type(element) in (AllOf, AnyOf, OneOf):
+        return _simplify_composition(element)  # type: ignore
+    return _simplify_enum(element)
+
+
+def _simplify_enum(element: Element) -> Element:
+    enum = getattr(element, "enum", NotPassed())
+    if not isinstance(enum, list):
+        return element
+    unique: List[Any] = []
+    for value in enum:
+        if not any(_same_value(value, other) for other in unique):
+            unique.append(value)
+    if len(unique) == 1 and isinstance(
+        getattr(element, "const", NotPassed()), NotPassed
+    ):
+        return _evolve(element, enum=NotPassed(), const=unique[0])
+    if len(unique) < len(enum):
+        return _evolve(element, enum=unique)
+    return element
+
+
+def _simplify_composition(element: CompositionElement) -> Element:
+    """Simplify an ``AllOf``, ``AnyOf`` or ``OneOf`` element.
+
+    Only the result of the first sub-element of an ``AllOf`` element is
+    used, and only the result of the first matching sub-element of an
+    ``AnyOf`` element, so these keep their position.
+    """
+    composition = type(element)
+    elements = _flatten(composition, element.elements)
+    if composition is AllOf:
+        elements = _simplify_all_of(elements)
+    else:
+        elements = [
+            sub_element
+            for sub_element in elements
+            if not isinstance(sub_element, Nothing)
+        ] or [Nothing()]
+    if composition is AnyOf:
+        elements = _unique(elements)
+        first = next(
+            (
+                idx
+                for idx, sub_element in enumerate(elements)
+                if accepts_everything(sub_element)
+            ),
+            None,
+        )
+        if first is not None:
+            elements = elements[: first + 1]
+    if len(elements) == 1:
+        if (
+            isinstance(elements[0], ObjectMeta)
+            and composition is AllOf
+            and not isinstance(element.default, NotPassed)
+            and _same_elements(elements, element.elements)
+        ):
+            return element  # Already the simplest way to add a default.
+        return with_default(elements[0], element.default)
+    hoisted = _hoist_type(composition, elements, element.default)
+    if hoisted:
+        return hoisted
+    if _same_elements(elements, element.elements):
+        return element
+    return composition(*elements, default=element.default)
+
+
+def _flatten(
+    composition: Type[CompositionElement], elements: List[Element]
+) -> List[Element]:
+    """Flatten sub-elements which are compositions of the same kind.
+
+    ``OneOf`` elements are not flattened, as that would change which
+    values match exactly one alternative.
+    """
+    # pylint: disable=unidiomatic-typecheck
+    flattened: List[Element] = []
+    for sub_element in elements:
+        if type(sub_element) is composition and composition is not OneOf:
+            flattened.extend(sub_element.elements)  # type: ignore
+        else:
+            flattened.append(sub_element)
+    return flattened
+
+
+def _simplify_all_of(elements: List[Element]) -> List[Element]:
+    """Simplify the sub-elements of an ``AllOf`` element.
+
+    Sub-elements which accept everything are removed, except the first,
+    whose result is used. If any sub-element accepts nothing, so does the
+    composition.
+    """
+    if any(isinstance(sub_element, Nothing) for sub_element in elements):
+        return [Nothing()]
+    elements = elements[:1] + [
+        sub_element
+        for sub_element in elements[1:]
+        if not accepts_everything(sub_element)
+    ]
+    return _merge_scalars(_unique(elements))
+
+
+def _hoist_type(
+    composition: Type[CompositionElement],
+    elements: List[Element],
+    default: Any,
+) -> Optional[Element]:
+    """Check the shared scalar type of alternatives before them.
+
+    ``AnyOf(Integer(minimum=3), Integer(maximum=0))`` becomes
+    ``AllOf(Integer(), AnyOf(Element(minimum=3), Element(maximum=0)))``.
+    """
+    scalar = type(elements[0])
+    if composition is AllOf or scalar not in _SCALAR_TYPES:
+        return None
+    # pylint: disable=unidiomatic-typecheck
+    if any(type(sub_element) is not scalar for sub_element in elements):
+        return None
+    if composition is AnyOf and not all(map(_keywords, elements)):
+        return with_default(scalar(), default)
+    alternatives = _simplify_composition(
+        composition(
+            *(Element(**_keywords(sub_element)) for sub_element in elements)
+        )
+    )
+    return _simplify_composition(AllOf(scalar(), alternatives, default=default))
+
+
+def _merge_scalars(elements: List[Element]) -> List[Element]:
+    """Merge compatible scalar sub-elements of an ``AllOf`` element.
+
+    Each is merged into the first earlier sub-element of the same scalar
+    type, so that the type of each position is unchanged.
+    """
+    merged: List[Element] = []
+    for sub_element in elements:
+        for idx, existing in enumerate(merged):
+            combined = _merge(existing, sub_element)
+            if combined is not None:
+                merged[idx] = combined
+                break
+        else:
+            merged.append(sub_element)
+    return merged
+
+
+def _merge(first: Element, second: Element) -> Optional[Element]:
+    """Merge two elements which must both match, if possible.
+
+    The first element must be a scalar, and the second either the same
+    scalar type, or an untyped element with keywords of the scalar.
+    """
+    # pylint: disable=unidiomatic-typecheck
+    scalar = type(first)
+    if scalar not in _SCALAR_TYPES or type(second) not in (scalar, Element):
+        return None
+    names = {param.name for param in keyword_table(scalar).keyword_only}
+    first_keywords = _keywords(first)
+    second_keywords = _keywords(second)
+    if not set(second_keywords) <= names:
+        return None
+    keywords = dict(first_keywords)
+    for name, value in second_keywords.items():
+        if name not in keywords:
+            keywords[name] = value
+        elif name in _LOWER_BOUNDS:
+            keywords[name] = max(keywords[name], value)
+        elif name in _UPPER_BOUNDS:
+            keywords[name] = min(keywords[name], value)
+        elif not _same_value(keywords[name], value):
+            return None
+    return scalar(**keywords)
+
+
+def _unique(elements: List[Element]) -> List[Element]:
+    """Remove repeated sub-elements.
+
+    Scalars are compared by equality, and other elements by identity, as
+    equal elements may produce instances of different models.
+    """
+    unique: List[Element] = []
+    for element in elements:
+        if not any(_same_element(element, other) for other in unique):
+            unique.append(element)
+    return unique
+
+
+def _same_element(left: Element, right: Element) -> bool:
+    # pylint: disable=unidiomatic-typecheck
+    if left is right:
+        return True
+    return (
+        type(left) is type(right)
+        and type(left) in _SCALAR_TYPES
+        and _keywords(left) == _keywords(right)
+    )
+
+
+def accepts_everything(element: Element) -> bool:
+    """Check whether an element accepts any value, unchanged.
+
+    Only untyped elements without keywords are detected.
+
+    :param element: The element to check.
+    """
+    # pylint: disable=unidiomatic-typecheck
+    return type(element) is Element and not _keywords(element)
+
+
+def with_default(element: Element, default: Any) -> Element:
+    """Get an element equivalent to ``element`` with the given default.
+
+    Object models are wrapped in an ``AllOf`` element, rather than copied.
+
+    :param element: The element to which to give the default.
+    :param default: The default to give it.
+    """
+    if _same_value(element.default, default):
+        return element
+    if isinstance(element, ObjectMeta):
+        return AllOf(element, default=default)
+    return _evolve(element, default=default)
+
+
+def _keywords(element: Element) -> Dict[str, Any]:
+    """Get the keywords of an element which affect sub-elements of a
+    composition.
+    """
+    return {
+        param.name: getattr(element, param.name, param.default)
+        for param in keyword_table(type(element)).keyword_only
+        if param.name not in _IGNORED_KEYWORDS
+        and getattr(element, param.name, param.default) != param.default
+    }
+
+
+def _evolve(original: Element, **changes: Any) -> Element:
+    """Copy an element with changed attributes."""
+    evolved = copy(original)
+    for name in ("_fingerprint", "_interned"):
+        vars(evolved).pop(name, None)
+    properties = getattr(original, "properties", NotPassed())
+    if not isinstance(properties, NotPassed):
+        changes.setdefault(
+            "properties",
+            {attr: prop.clone() for attr, prop in properties.items()},
+        )
+    for name, value in changes.items():
+        setattr(evolved, name, value)
+    return evolved
+
+
+def _same_elements(left: Any, right: Any) -> bool:
+    """Check that two attribute values contain identical elements."""
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(
+            _same_elements(*pair) for pair in zip(left, right)
+        )
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(
+            _same_elements(left[key], right[key]) for key in left
+        )
+    return left is right
+
+
+def _same_value(left: Any, right: Any) -> bool:
+    """Check that two values are equal, including their types."""
+    return type(left) is type(right) and left == right
@@ -8,15 +8,34 @@ keywords or use multiple types will be recomposed using ``"allOf"`` and
 details.
 """
 from collections import defaultdict
+from collections.abc import Mapping
+from copy import copy
 from functools import partial
-import inspect
 from itertools import chain
 import operator as op
 import re
 import string
-from typing import Any, Callable, DefaultDict, Dict, Iterable, List, Type, Union
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 import unicodedata
 
+from json_ref_dict import RefDict
+from json_ref_dict.ref_dict import RefList
+
 from statham.schema.constants import (
     COMPOSITION_KEYWORDS,
     NotPassed,
@@ -47,8 +66,16 @@ from statham.schema.exceptions import (
     FeatureNotImplementedError,
     SchemaParseError,
 )
-from statham.schema.helpers import expand, reraise, split_dict
+from statham.schema.fingerprint import fingerprint
+from statham.schema.interning import Interner
+from statham.schema.helpers import (
+    expand,
+    json_pointer,
+    keyword_table,
+    split_dict,
+)
 from statham.schema.property import _Property
+from statham.titles import title_labeller
 
 
 _TYPE_MAPPING = {
@@ -61,61 +88,222 @@ _TYPE_MAPPING = {
 }
 
 
-class _ParseState:
+class _ParseState:  # pylint: disable=too-many-instance-attributes
     """Recusive state.
 
     Used to de-duplicate models which are traversed multiple times, and to
-    rename distinct models with the same name.
+    rename distinct models with the same name. Models are indexed by name
+    and structural fingerprint, so only models which are likely to be
+    equal are compared.
+
+    Also memoizes parsed sub-schemas by identity, so that sub-schemas
+    shared by reference are only parsed once. Sub-schemas parsed from a
+    :class:`~json_ref_dict.RefDict` are memoized by their resolved URI
+    instead, and object models at those URIs are declared before their
+    sub-schemas are parsed to allow recursive references.
+
+    Schemas which are being parsed are tracked by identity, with their JSON
+    Pointer, so that cycles between them are reported where they are found.
+
+    If an :class:`~statham.schema.interning.Interner` is provided, each
+    parsed element is interned.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        labeller: Callable[[str], Tuple[str, str]] = None,
+        interner: Optional[Interner] = None,
+    ):
         self.seen: DefaultDict[str, List[ObjectMeta]] = defaultdict(list)
-
-    def dedupe(self, object_type: ObjectMeta):
+        self.index: DefaultDict[
+            Tuple[str, str], List[ObjectMeta]
+        ] = defaultdict(list)
+        # Schemas are kept alongside their element, so that ids are not
+        # reused while the state is alive.
+        self.parsed: Dict[int, Tuple[Dict[str, Any], Element]] = {}
+        self.active: Dict[int, "_Pointer"] = {}
+        self.labeller = labeller or title_labeller()
+        self.references: Dict[str, Element] = {}
+        self.pending: Set[str] = set()
+        self.declared: Dict[int, ObjectMeta] = {}
+        self.forward: Set[int] = set()
+        self.interner = interner
+
+    def dedupe(self, object_type: ObjectMeta, distinct: bool = False):
         """Deduplicate a parsed model.
 
         If it has been seen before, then return the existing one. Otherwise
         ensure the model's name is distinct from other models and keep store
         it.
+
+        :param object_type: The parsed model.
+        :param distinct: Skip comparison with existing models. Used for
+            models which have already been referenced.
         """
         name = object_type.__name__
-        for existing in self.seen[name]:
+        key = (name, fingerprint(object_type))
+        for existing in self.index[key] if not distinct else []:
             if object_type == existing:
                 return existing
         count = len(self.seen[name])
         if count:
             object_type.__name__ = name + f"_{count}"
         self.seen[name].append(object_type)
+        self.index[key].append(object_type)
         return object_type
 
+    def intern(self, element: Element) -> Element:
+        """Intern a parsed element, if interning is enabled."""
+        if self.interner is None:
+            return element
+        return self.interner.intern(element)
+
+
+class _Pointer:
+    """The JSON Pointer of a sub-schema, formatted only when needed.
+
+    Pointers refer to their parent rather than copying its path, so that
+    deeply nested sub-schemas don't each hold their full pointer.
+    """
+
+    __slots__ = ("parent", "path")
 
-def parse(schema: Dict[str, Any]) -> List[Element]:
+    def __init__(
+        self, parent: Union[str, "_Pointer"], path: Tuple[Any, ...] = ()
+    ):
+        self.parent = parent
+        self.path = path
+
+    def child(self, *path: Any) -> "_Pointer":
+        return _Pointer(self, path)
+
+    def __str__(self) -> str:
+        paths = []
+        pointer: Union[str, _Pointer] = self
+        while isinstance(pointer, _Pointer):
+            paths.append(pointer.path)
+            pointer = pointer.parent
+        return pointer + json_pointer(chain.from_iterable(reversed(paths)))
+
+
+class _Request(NamedTuple):
+    """A request to parse a sub-schema, found at a JSON Pointer."""
+
+    schema: Any
+    pointer: _Pointer
+
+
+_Parsing = Generator[_Request, Element, Any]
+
+
+def parse(
+    schema: Mapping,
+    interner: Optional[Interner] = None,
+    select: Optional[Iterable[str]] = None,
+) -> List[Element]:
     """Parse a JSON Schema document to Element format.
 
-    Assumes references are already resolved, and that any ``"object"`` schemas
-    or sub-schemas contain either a ``"title"`` annotation or an
-    ``"_x_autotitle"`` annotation. See
+    Accepts either a :class:`~json_ref_dict.RefDict`, or a dictionary in
+    which references are already resolved.
+
+    When passed a :class:`~json_ref_dict.RefDict`, references are parsed
+    in place: each referenced schema is parsed once, and shared by each
+    element which refers to it. Object schemas which refer back to
+    themselves are parsed to recursive models. Schemas without a ``"title"``
+    are named from their URI with
+    :func:`~statham.titles.title_labeller`.
+
+    Otherwise, assumes that any ``"object"`` schemas or sub-schemas contain
+    either a ``"title"`` annotation or an ``"_x_autotitle"`` annotation. See
     `json-ref-dict <https://pypi.org/project/json-ref-dict/0.6.0/>`_ for
     reference resolution and annotation tools.
 
+    :param schema: The JSON Schema document to parse.
+    :param interner: Optional
+        :class:`~statham.schema.interning.Interner`, with which to share
+        structurally equal elements as they are parsed.
+    :param select: Optionally, names of the top-level ``"definitions"`` to
+        parse. Only the selected definitions, and the sub-schemas they
+        refer to, are parsed. See :class:`Definitions`.
+    :raises: :exc:`~statham.schema.exceptions.SchemaParseError` if a
+        selected definition does not exist.
     :return: A list of schema  elements, starting with the top level element,
         followed by each element in the top-level schema ``"definitions"``.
+        If definitions are selected, the list only contains those
+        definitions, in the order they were selected.
     """
-    state = _ParseState()
-    return [parse_element(schema, state)] + [
-        parse_element(definition, state)
-        for definition in schema.get("definitions", {}).values()
-        if isinstance(definition, (dict, bool, Element))
-    ]
+    definitions = Definitions(schema, interner=interner)
+    if select is not None:
+        try:
+            return [definitions[name] for name in select]
+        except KeyError as exc:
+            raise SchemaParseError.missing_definition(exc.args[0]) from None
+    return [definitions.root] + list(definitions.values())
+
+
+class Definitions(Mapping):
+    """The top-level ``"definitions"`` of a schema, parsed on demand.
+
+    Each definition is parsed when it is first requested by name, so
+    documents with many definitions may be used without parsing those
+    which aren't needed. Definitions share parsing state, so a definition
+    which was parsed when another referred to it is not parsed again.
+
+    .. code:: python
+
+        from json_ref_dict import RefDict
+        from statham.schema.parser import Definitions
+
+        definitions = Definitions(RefDict("schemas/vendor.json#/"))
+        poll = definitions["poll"]
+
+    :param schema: The schema containing the definitions, as accepted by
+        :func:`parse`.
+    :param interner: Optional
+        :class:`~statham.schema.interning.Interner`, with which to share
+        structurally equal elements as they are parsed.
+    """
+
+    def __init__(self, schema: Mapping, interner: Optional[Interner] = None):
+        self.schema = schema
+        self._state = _ParseState(interner=interner)
+        self._parsed: Dict[str, Element] = {}
+        self._root: Optional[Element] = None
+
+    @property
+    def root(self) -> Element:
+        """The top level element of the schema, parsed when first used."""
+        if self._root is None:
+            self._root = parse_element(self.schema, self._state)
+        return self._root
+
+    def __getitem__(self, name: str) -> Element:
+        if name not in self._parsed:
+            definition = self._definitions.get(name)
+            if not isinstance(definition, (Mapping, bool, Element)):
+                raise KeyError(name)
+            self._parsed[name] = _parse(
+                definition, self._state, _Pointer("#", ("definitions", name))
+            )
+        return self._parsed[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return (
+            name
+            for name, definition in self._definitions.items()
+            if isinstance(definition, (Mapping, bool, Element))
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    @property
+    def _definitions(self) -> Mapping:
+        return self.schema.get("definitions", {})
 
 
-@reraise(
-    RecursionError,
-    FeatureNotImplementedError,
-    "Could not parse cyclical dependencies of this schema.",
-)
 def parse_element(
-    schema: Union[bool, Dict[str, Any]], state: _ParseState = None
+    schema: Union[bool, Mapping], state: _ParseState = None
 ) -> Element:
     """Parse a single JSON Schema element to an Element object.
 
@@ -124,25 +312,194 @@ def parse_element(
     >>> parse_element({"type": "string", "minLength": 3})
     String(minLength=3)
 
+    Accepts a :class:`~json_ref_dict.RefDict` to parse references in place,
+    as described in :func:`parse`.
+
+    Sub-schemas are parsed from an explicit stack rather than by recursion,
+    so schemas may be nested as deeply as memory allows.
+
     :raises: :exc:`~statham.schema.exceptions.FeatureNotImplementedError` if
-        recursive cycles are detected.
+        recursive cycles are detected which are not between object models.
+        The error message includes the JSON Pointer of the sub-schema which
+        refers back to its parent.
     :raises: :exc:`statham.schema.exceptions.SchemaParseError` if problems are
         found in the provided schema.
     :return: A single :class:`~statham.schema.elements.Element` object
         equivalent to the schema described by :paramref:`parse_element.schema`.
     """
+    return _parse(schema, state or _ParseState(), _Pointer("#"))
+
+
+def _parse(schema: Any, state: _ParseState, pointer: _Pointer) -> Element:
+    """Parse a schema, and each sub-schema it requests.
+
+    Each schema is parsed by a generator, which yields a request whenever
+    it needs a sub-schema parsed. These are kept on a stack, and resumed
+    with the parsed sub-schema.
+    """
+    stack = [_parse_element(schema, state, pointer)]
+    result: Any = None
+    try:
+        while stack:
+            try:
+                request = stack[-1].send(result)
+            except StopIteration as stop:
+                stack.pop()
+                result = stop.value
+                continue
+            stack.append(_parse_element(request.schema, state, request.pointer))
+            result = None
+    finally:
+        # Close parsings left by an error, so their state is restored.
+        while stack:
+            stack.pop().close()
+    return result
+
+
+def _parse_element(
+    schema: Any, state: _ParseState, pointer: _Pointer
+) -> _Parsing:
+    """Parse a schema at a JSON Pointer, as :func:`parse_element`."""
     if isinstance(schema, bool):
-        return Element() if schema else Nothing()
-    state = state or _ParseState()
+        return state.intern(Element() if schema else Nothing())
     if isinstance(schema, Element):
         return schema
+    if isinstance(schema, RefDict):
+        return (yield from _parse_reference(schema, state))
+    if id(schema) in state.parsed:
+        return state.parsed[id(schema)][1]
+    if id(schema) in state.active:
+        raise FeatureNotImplementedError.cyclical_reference(str(pointer))
+    state.active[id(schema)] = pointer
+    try:
+        element = state.intern(
+            (yield from _parse_schema(schema, state, pointer))
+        )
+    finally:
+        del state.active[id(schema)]
+    state.parsed[id(schema)] = (schema, element)
+    return element
+
+
+def _parse_reference(schema: RefDict, state: _ParseState) -> _Parsing:
+    """Parse a referenced sub-schema once per resolved URI.
+
+    Object models are declared before their sub-schemas are parsed, so
+    that references back to them resolve to the same model. Other cycles
+    are unsupported, and fail as soon as they are found.
+    """
+    uri = str(schema.uri)
+    if uri in state.references:
+        element = state.references[uri]
+        if uri in state.pending:
+            state.forward.add(id(element))
+        return element
+    if uri in state.pending:
+        raise FeatureNotImplementedError.cyclical_reference(uri)
+    plain = _dereference(schema, state.labeller)
+    if _is_model(plain):
+        model = _declare_model(plain)
+        state.declared[id(plain)] = model
+        state.references[uri] = model
+    state.pending.add(uri)
+    try:
+        element = yield _Request(plain, _Pointer(uri))
+    finally:
+        state.pending.discard(uri)
+    state.references[uri] = element
+    return element
+
+
+# Keywords whose values are sub-schemas, or lists of sub-schemas.
+_SCHEMA_KEYWORDS = {
+    "items",
+    "additionalItems",
+    "contains",
+    "additionalProperties",
+    "propertyNames",
+    *COMPOSITION_KEYWORDS,
+}
+# Keywords whose values are dictionaries of sub-schemas.
+_SCHEMA_MAP_KEYWORDS = {
+    "properties",
+    "patternProperties",
+    "dependencies",
+    "definitions",
+}
+
+
+def _dereference(
+    schema: RefDict, labeller: Callable[[str], Tuple[str, str]]
+) -> Dict[str, Any]:
+    """Convert a single level of a `RefDict` to a standard dictionary.
+
+    Sub-schemas are left as references to be parsed by their URI, while
+    other values are fully resolved. The schema is labelled from its URI,
+    equivalent to `materialize` with a context labeller.
+    """
+    plain: Dict[str, Any] = dict([labeller(str(schema.uri))])
+    for key in schema:
+        value = schema[key]
+        if key in _SCHEMA_KEYWORDS:
+            plain[key] = _unwrap_list(value)
+        elif key in _SCHEMA_MAP_KEYWORDS and isinstance(value, Mapping):
+            plain[key] = {
+                name: _unwrap_list(sub_value)
+                for name, sub_value in value.items()
+            }
+        else:
+            plain[key] = _unwrap_literal(value)
+    return plain
+
+
+def _unwrap_list(value: Any) -> Any:
+    """Convert a `RefList` to a list, leaving its members as references."""
+    return list(value) if isinstance(value, RefList) else value
+
+
+def _unwrap_literal(value: Any) -> Any:
+    """Fully resolve a non-schema value."""
+    if isinstance(value, RefDict):
+        return {key: _unwrap_literal(val) for key, val in value.items()}
+    if isinstance(value, RefList):
+        return [_unwrap_literal(val) for val in value]
+    return value
+
+
+def _is_model(schema: Dict[str, Any]) -> bool:
+    """Check whether a schema is parsed directly to an object model."""
+    return (
+        schema.get("type") == "object"
+        and not set(COMPOSITION_KEYWORDS) & set(schema)
+        and not set(schema) & UNSUPPORTED_SCHEMA_KEYWORDS
+    )
+
+
+def _declare_model(schema: Dict[str, Any]) -> ObjectMeta:
+    """Declare an empty model, to be defined by `_parse_object`."""
+    model = ObjectMeta(_model_title(schema), (Object,), ObjectClassDict())
+    setattr(model, "_incomplete", True)
+    return model
+
+
+def _parse_schema(
+    schema: Dict[str, Any], state: _ParseState, pointer: _Pointer
+) -> _Parsing:
+    """Parse a JSON Schema dictionary which has not been parsed before.
+
+    Parsed keyword values are collected in a shallow copy of the schema,
+    so the input is never modified.
+    """
     if set(schema) & UNSUPPORTED_SCHEMA_KEYWORDS:
         raise FeatureNotImplementedError.unsupported_keywords(
             set(schema) & UNSUPPORTED_SCHEMA_KEYWORDS
         )
+    parsed = dict(schema)
+    if id(schema) in state.declared:
+        state.declared[id(parsed)] = state.declared.pop(id(schema))
     for literal_key in ("default", "const", "enum"):
         if literal_key in schema:
-            schema[literal_key] = _parse_literal(schema[literal_key])
+            parsed[literal_key] = _parse_literal(schema[literal_key])
     for keyword, parser in (
         ("properties", _parse_properties),
         ("items", _parse_items),
@@ -152,44 +509,52 @@ def parse_element(
         ("dependencies", _parse_dependencies),
     ):
         if keyword in schema:
-            schema[keyword] = parser(schema, state)  # type: ignore
-    schema["additionalProperties"] = _parse_additional_properties(schema, state)
-    schema["additionalItems"] = _parse_additional_items(schema, state)
-    if set(COMPOSITION_KEYWORDS) & set(schema):
-        return _parse_composition(schema, state)
-    if "type" not in schema:
-        return Element(**_keyword_filter(Element)(schema))
-    return _parse_typed(schema["type"], schema, state)
+            parsed[keyword] = yield from parser(schema, pointer)
+    parsed["additionalProperties"] = yield from _parse_additional_properties(
+        schema, pointer
+    )
+    parsed["additionalItems"] = yield from _parse_additional_items(
+        schema, pointer
+    )
+    if set(COMPOSITION_KEYWORDS) & set(parsed):
+        return (yield from _parse_composition(parsed, pointer))
+    if "type" not in parsed:
+        return Element(**_keyword_filter(Element)(parsed))
+    return (yield from _parse_typed(parsed["type"], parsed, state, pointer))
 
 
 def _parse_literal(literal: Any) -> Any:
     """Parse literal values from schema.
 
     Keywords like `const`, `enum` and `default` refer to non-schema values.
-    Annotations should be removed to prevent side effects.
+    Annotations should be removed to prevent side effects. Values without
+    annotations are returned as they are, rather than copied.
     """
-    if not isinstance(literal, (dict, list)):
-        return literal
     if isinstance(literal, list):
-        return [_parse_literal(val) for val in literal]
-    return {
-        key: _parse_literal(val)
-        for key, val in literal.items()
-        if key != "_x_autotitle"
-    }
+        values = [_parse_literal(val) for val in literal]
+        if all(map(op.is_, values, literal)):
+            return literal
+        return values
+    if isinstance(literal, dict):
+        mapping = {
+            key: _parse_literal(val)
+            for key, val in literal.items()
+            if key != "_x_autotitle"
+        }
+        if len(mapping) == len(literal) and all(
+            mapping[key] is val for key, val in literal.items()
+        ):
+            return literal
+        return mapping
+    return literal
 
 
-def _parse_contains(
-    schema: Dict[str, Any], state: _ParseState = None
-) -> Element:
+def _parse_contains(schema: Dict[str, Any], pointer: _Pointer) -> _Parsing:
     """Parse schema contains keyword."""
-    state = state or _ParseState()
-    return parse_element(schema["contains"], state)
+    return (yield _Request(schema["contains"], pointer.child("contains")))
 
 
-def _parse_composition(
-    schema: Dict[str, Any], state: _ParseState = None
-) -> Element:
+def _parse_composition(schema: Dict[str, Any], pointer: _Pointer) -> _Parsing:
     """Parse a schema with composition keywords.
 
     Handles multiple composition keywords by wrapping them in an AllOf
@@ -210,52 +575,61 @@ def _parse_composition(
     )
     ```
     """
-    state = state or _ParseState()
     composition, other = split_dict(set(COMPOSITION_KEYWORDS) | {"default"})(
         schema
     )
-    base_element = parse_element(other, state)
+    base_element = yield _Request(other, pointer)
     for key in set(COMPOSITION_KEYWORDS) - {"not"}:
-        composition[key] = [
-            parse_element(sub_schema, state)
-            for sub_schema in composition.get(key, [])
-        ]
+        sub_elements = []
+        for idx, sub_schema in enumerate(composition.get(key, [])):
+            sub_elements.append(
+                (yield _Request(sub_schema, pointer.child(key, idx)))
+            )
+        composition[key] = sub_elements
     all_of = [base_element] + composition["allOf"]
     all_of.append(_compose_elements(OneOf, composition["oneOf"]))
     all_of.append(_compose_elements(AnyOf, composition["anyOf"]))
     if "not" in composition:
-        all_of.append(Not(parse_element(schema["not"], state)))
+        all_of.append(
+            Not((yield _Request(schema["not"], pointer.child("not"))))
+        )
     element = _compose_elements(
         AllOf, filter(partial(op.ne, Element()), all_of)
     )
     default = schema.get("default", NotPassed())
     if isinstance(element, ObjectMeta):
         return AllOf(element, default=default)
-    element.default = default or element.default
+    if (default or element.default) is not element.default:
+        # The element may be shared with other parsed schemas.
+        element = copy(element)
+        vars(element).pop("_interned", None)
+        element.default = default
     return element
 
 
 def _parse_typed(
-    type_value: Any, schema: Dict[str, Any], state: _ParseState = None
-) -> Element:
+    type_value: Any,
+    schema: Dict[str, Any],
+    state: _ParseState,
+    pointer: _Pointer,
+) -> _Parsing:
     """Parse a typed schema with no composition keywords."""
-    state = state or _ParseState()
     if not isinstance(type_value, (str, list)):
         raise SchemaParseError.invalid_type(type_value)
     if isinstance(type_value, list):
-        return _parse_multi_typed(type_value, schema, state)
+        return (yield from _parse_multi_typed(type_value, schema, pointer))
     if schema["type"] == "object":
         return _parse_object(schema, state)
     if schema["type"] == "array":
-        return _parse_array(schema, state)
+        return _parse_array(schema)
     element_type = _TYPE_MAPPING[type_value]
     sub_schema = _keyword_filter(element_type)(schema)
     return element_type(**sub_schema)
 
 
 def _parse_multi_typed(
-    type_list: List[str], schema: Dict[str, Any], state: _ParseState = None
-) -> CompositionElement:
+    type_list: List[str], schema: Dict[str, Any], pointer: _Pointer
+) -> _Parsing:
     """Parse a schema with multiple type values.
 
     Converts schema to an equivalent representation using "anyOf". For example:
@@ -267,23 +641,19 @@ def _parse_multi_typed(
     {"anyOf": [{"type": "string"}, {"type": "integer"}]}
     ```
     """
-    state = state or _ParseState()
     default = schema.get("default", NotPassed())
     schema = {key: val for key, val in schema.items() if key != "default"}
     if len(type_list) == 1:
-        return parse_element({**schema, "type": type_list[0]}, state)
-    return AnyOf(
-        *(
-            parse_element({**schema, "type": type_value}, state)
-            for type_value in type_list
-        ),
-        default=default,
-    )
+        return (yield _Request({**schema, "type": type_list[0]}, pointer))
+    elements = []
+    for type_value in type_list:
+        elements.append(
+            (yield _Request({**schema, "type": type_value}, pointer))
+        )
+    return AnyOf(*elements, default=default)
 
 
-def _parse_object(
-    schema: Dict[str, Any], state: _ParseState = None
-) -> ObjectMeta:
+def _parse_object(schema: Dict[str, Any], state: _ParseState) -> ObjectMeta:
     """Parse an object schema element to an `Object` subclass.
 
     The name of the generated class is derived from the following keys
@@ -298,12 +668,8 @@ def _parse_object(
         title.
     :return: The ``Object`` model equivalent to the schema.
     """
-    state = state or _ParseState()
-    title = schema.get("title", schema.get("_x_autotitle"))
-    if not title:
-        raise SchemaParseError.missing_title(schema)
-    title = _title_format(title)
-    properties = schema.get("properties", {})
+    title = _model_title(schema)
+    properties = dict(schema.get("properties", {}))
     properties.update(
         {
             _parse_attribute_name(key): _Property(
@@ -330,34 +696,49 @@ def _parse_object(
     ]:
         if key in schema:
             cls_args[key] = schema[key]
-    object_type = ObjectMeta(title, (Object,), class_dict, **cls_args)
-    return state.dedupe(object_type)
+    declared = state.declared.pop(id(schema), None)
+    if declared is None:
+        object_type = ObjectMeta(title, (Object,), class_dict, **cls_args)
+        return state.dedupe(object_type)
+    for key, value in cls_args.items():
+        setattr(declared, key, value)
+    declared.properties = class_dict.properties  # type: ignore
+    delattr(declared, "_incomplete")
+    return state.dedupe(declared, distinct=id(declared) in state.forward)
+
+
+def _model_title(schema: Dict[str, Any]) -> str:
+    """Get the class name for an object schema.
+
+    :raises SchemaParseError: if there are no keys from which to derive the
+        class title.
+    """
+    title = schema.get("title", schema.get("_x_autotitle"))
+    if not title:
+        raise SchemaParseError.missing_title(schema)
+    return _title_format(title)
 
 
-def _parse_properties(
-    schema: Dict[str, Any], state: _ParseState = None
-) -> Dict[str, _Property]:
+def _parse_properties(schema: Dict[str, Any], pointer: _Pointer) -> _Parsing:
     """Parse properties from a schema element."""
-    state = state or _ParseState()
     required = set(schema.get("required", []))
     properties = schema.get("properties", {})
-    return {
-        **{
-            _parse_attribute_name(key): _Property(
-                parse_element(value, state),
-                required=key in required,
-                source=key,
+    parsed = {}
+    for key, value in properties.items():
+        # Ignore malformed values.
+        if isinstance(value, (Mapping, bool)):
+            element = yield _Request(value, pointer.child("properties", key))
+            parsed[_parse_attribute_name(key)] = _Property(
+                element, required=key in required, source=key
             )
-            for key, value in properties.items()
-            # Ignore malformed values.
-            if isinstance(value, (dict, bool))
-        },
-        **{
+    parsed.update(
+        {
             _parse_attribute_name(key): prop
             for key, prop in properties.items()
             if isinstance(prop, _Property)
-        },
-    }
+        }
+    )
+    return parsed
 
 
 def _parse_attribute_name(name: str) -> str:
@@ -391,105 +772,103 @@ def _parse_attribute_name(name: str) -> str:
 
 
 def _parse_pattern_properties(
-    schema: Dict[str, Any], state: _ParseState = None
-) -> Dict[str, Element]:
+    schema: Dict[str, Any], pointer: _Pointer
+) -> _Parsing:
     """Parse schema patternProperties keyword."""
-    state = state or _ParseState()
-    return {
-        **{
-            key: parse_element(value, state)
-            for key, value in schema["patternProperties"].items()
-            if isinstance(value, (dict, bool))
-        },
-        **{
+    parsed = {}
+    for key, value in schema["patternProperties"].items():
+        if isinstance(value, (Mapping, bool)):
+            parsed[key] = yield _Request(
+                value, pointer.child("patternProperties", key)
+            )
+    parsed.update(
+        {
             key: value
             for key, value in schema["patternProperties"].items()
             if isinstance(value, Element)
-        },
-    }
+        }
+    )
+    return parsed
 
 
 def _parse_property_names(
-    schema: Dict[str, Any], state: _ParseState = None
-) -> Element:
+    schema: Dict[str, Any], pointer: _Pointer
+) -> _Parsing:
     """Parse schema propertyNames keyword."""
-    state = state or _ParseState()
-    return parse_element(schema["propertyNames"], state)
+    return (
+        yield _Request(schema["propertyNames"], pointer.child("propertyNames"))
+    )
 
 
 def _parse_additional(
-    key: str, schema: Dict[str, Any], state: _ParseState = None
-) -> Union[Element, bool]:
+    key: str, schema: Dict[str, Any], pointer: _Pointer
+) -> _Parsing:
     """Parse additional items or properties.
 
     Booleans are retained for these values, as they are more semantically
     meaningful than in general schemas.
     """
-    state = state or _ParseState()
     additional = schema.get(key, True)
     if isinstance(additional, bool):
         return additional
-    return parse_element(additional, state)
+    return (yield _Request(additional, pointer.child(key)))
 
 
 def _parse_additional_properties(
-    schema: Dict[str, Any], state: _ParseState = None
-) -> Union[Element, bool]:
+    schema: Dict[str, Any], pointer: _Pointer
+) -> _Parsing:
     """Parse additionalProperties from a schema element.
 
     If key is not present, defaults to `True`.
     """
-    return _parse_additional("additionalProperties", schema, state)
+    return (
+        yield from _parse_additional("additionalProperties", schema, pointer)
+    )
 
 
 def _parse_additional_items(
-    schema: Dict[str, Any], state: _ParseState = None
-) -> Union[Element, bool]:
+    schema: Dict[str, Any], pointer: _Pointer
+) -> _Parsing:
     """Parse additionalProperties from a schema element.
 
     If key is not present, defaults to `True`.
     """
-    return _parse_additional("additionalItems", schema, state)
+    return (yield from _parse_additional("additionalItems", schema, pointer))
 
 
-def _parse_array(schema: Dict[str, Any], state: _ParseState = None) -> Array:
+def _parse_array(schema: Dict[str, Any]) -> Array:
     """Parse an array schema element."""
-    state = state or _ParseState()
     items = schema.get("items", Element())
     return Array(**{**_keyword_filter(Array)(schema), "items": items})
 
 
-def _parse_items(
-    schema: Dict[str, Any], state: _ParseState = None
-) -> Union[Element, List[Element]]:
+def _parse_items(schema: Dict[str, Any], pointer: _Pointer) -> _Parsing:
     """Parse array items keyword to a schema Element.
 
     If not present, defaults to `Element()`.
     """
-    state = state or _ParseState()
     items = schema.get("items", {})
-    if isinstance(items, list):
-        return [parse_element(item, state) for item in items]
-    return parse_element(items, state)
+    if not isinstance(items, list):
+        return (yield _Request(items, pointer.child("items")))
+    parsed = []
+    for idx, item in enumerate(items):
+        parsed.append((yield _Request(item, pointer.child("items", idx))))
+    return parsed
 
 
-def _parse_dependencies(
-    schema: Dict[str, Any], state: _ParseState = None
-) -> Dict[str, Union[List[str], Element]]:
+def _parse_dependencies(schema: Dict[str, Any], pointer: _Pointer) -> _Parsing:
     """Parse dependencies keyword from schema."""
-    state = state or _ParseState()
-    return {
-        **{
-            key: value
-            for key, value in schema["dependencies"].items()
-            if isinstance(value, (list, Element))
-        },
-        **{
-            key: parse_element(value, state)
-            for key, value in schema["dependencies"].items()
-            if isinstance(value, (dict, bool))
-        },
+    parsed = {
+        key: value
+        for key, value in schema["dependencies"].items()
+        if isinstance(value, (list, Element))
     }
+    for key, value in schema["dependencies"].items():
+        if isinstance(value, (Mapping, bool)):
+            parsed[key] = yield _Request(
+                value, pointer.child("dependencies", key)
+            )
+    return parsed
 
 
 def _compose_elements(
@@ -510,8 +889,7 @@ def _compose_elements(
 
 def _keyword_filter(type_: Type) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
     """Create a filter to pull out only relevant keywords for a given type."""
-    params = inspect.signature(type_.__init__).parameters.values()
-    args = {param.name for param in params}
+    args = keyword_table(type_).names
 
     def _filter(schema: Dict[str, Any]) -> Dict[str, Any]:
         return {key: value for key, value in schema.items() if key in args}
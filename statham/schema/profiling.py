@@ -0,0 +1,396 @@
+"""Record where time is spent validating values.
+
+Validation within a :class:`Profile` records the number of calls, the
+time taken and the number of failures of each sub-element and keyword:
+
+.. code:: python
+
+    from statham.schema.profiling import Profile
+
+    with Profile() as profile:
+        Model(value)
+    print(profile.to_text())
+
+Sub-elements are identified by their path from the element which was
+called, where ``.name`` is an object property, ``[]`` is an array item
+and ``<annotation>`` is a sub-element applied to the same value, for
+example an option of a composition. Keywords are recorded against the
+path of the element they belong to.
+
+Profiling replaces the engine with which elements are called and models
+are instantiated, so validation outside of a profile has no overhead.
+While profiling, validation is slower, and compiled functions of models
+(see :mod:`statham.schema.compiled`) are not used, so that their
+keywords are recorded. Profiles apply to validation in every thread, and
+may be nested, in which case only the most recently entered profile
+records. Nested profiles may be exited in any order.
+"""
+from functools import partial
+import json
+from threading import local, Lock
+from time import perf_counter
+from typing import Any, cast, Dict, List, NamedTuple, Optional, Tuple
+
+from statham.schema.constants import NotPassed
+from statham.schema.elements.base import Element
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.engine import (
+    _Evaluation,
+    _Plan,
+    Engine,
+    install,
+    uninstall,
+)
+from statham.schema.property import _Property
+from statham.schema.validation import (
+    AdditionalItems,
+    AdditionalProperties,
+    InstanceOf,
+    NoMatch,
+    Validator,
+)
+
+
+class ProfileEntry(NamedTuple):
+    """Calls, time and failures recorded by a :class:`Profile`."""
+
+    path: Optional[str]
+    """Path of the element, or ``None`` if totalled for a keyword."""
+
+    keyword: Optional[str]
+    """The keyword, or ``None`` if recorded for the element itself."""
+
+    calls: int
+    seconds: float
+    """Total time spent, including evaluating sub-elements."""
+
+    own_seconds: float
+    """Time spent, excluding evaluating sub-elements."""
+
+    failures: int
+
+
+class _Timing:
+    __slots__ = ("calls", "seconds", "own_seconds", "failures")
+
+    def __init__(self):
+        self.calls = self.failures = 0
+        self.seconds = self.own_seconds = 0.0
+
+
+_Key = Tuple[str, Optional[str]]
+
+
+class _Frame(NamedTuple):
+    element: Element
+    value: Any
+    path: str
+    start: float
+    children: List[float]
+
+
+class Profile:
+    """Calls, time and failures of each sub-element and keyword validated.
+
+    Use as a context manager to record validation within it. A profile
+    may be entered more than once, accumulating what it records.
+    """
+
+    def __init__(self):
+        self._timings: Dict[_Key, _Timing] = {}
+        self._lock = Lock()
+        self._local = local()
+        self._factory = partial(_ProfilingEngine, self)
+
+    def __enter__(self) -> "Profile":
+        install(self._factory, compiled=False)
+        return self
+
+    def __exit__(self, *_):
+        uninstall(self._factory)
+
+    def entries(self) -> List[ProfileEntry]:
+        """Everything recorded, with the most own time spent first."""
+        with self._lock:
+            entries = [
+                ProfileEntry(path, keyword, *_values(timing))
+                for (path, keyword), timing in self._timings.items()
+            ]
+        return sorted(entries, key=lambda entry: -entry.own_seconds)
+
+    def elements(self) -> List[ProfileEntry]:
+        """Entries for each element, with the most own time spent first."""
+        return [entry for entry in self.entries() if entry.keyword is None]
+
+    def keywords(self) -> List[ProfileEntry]:
+        """Entries for each keyword, totalled over every path, with the
+        most time spent first.
+        """
+        totals: Dict[str, _Timing] = {}
+        for entry in self.entries():
+            if entry.keyword is None:
+                continue
+            total = totals.setdefault(entry.keyword, _Timing())
+            total.calls += entry.calls
+            total.seconds += entry.seconds
+            total.own_seconds += entry.own_seconds
+            total.failures += entry.failures
+        return sorted(
+            (
+                ProfileEntry(None, keyword, *_values(total))
+                for keyword, total in totals.items()
+            ),
+            key=lambda entry: -entry.own_seconds,
+        )
+
+    def to_text(self, top: Optional[int] = None) -> str:
+        """Format the entries as a table.
+
+        :param top: Optionally, the number of entries to include.
+        """
+        lines = [
+            f"{'calls':>8} {'total':>10} {'own':>10} {'failures':>8}  "
+            "path [keyword]"
+        ]
+        for entry in self.entries()[:top]:
+            name = entry.path or ""
+            if entry.keyword:
+                name += f" [{entry.keyword}]"
+            lines.append(
+                f"{entry.calls:>8} {entry.seconds * 1e3:>8.3f}ms "
+                f"{entry.own_seconds * 1e3:>8.3f}ms {entry.failures:>8}  "
+                f"{name}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def to_json(self, **kwargs) -> str:
+        """Serialize the entries as a JSON array of objects.
+
+        :param kwargs: Passed to :func:`json.dumps`.
+        """
+        return json.dumps(
+            [entry._asdict() for entry in self.entries()], **kwargs
+        )
+
+    def to_prometheus(self, prefix: str = "statham_validation") -> str:
+        """Format the entries in the Prometheus text exposition format.
+
+        Each entry is labelled by ``path`` and ``keyword``, which is empty
+        for the element itself.
+
+        :param prefix: Prefix of the name of each metric.
+        """
+        entries = self.entries()
+        lines = []
+        for name, field, description in _METRICS:
+            metric = f"{prefix}_{name}"
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} counter")
+            for entry in entries:
+                labels = (
+                    f'path="{_escape(entry.path or "")}",'
+                    f'keyword="{_escape(entry.keyword or "")}"'
+                )
+                lines.append(f"{metric}{{{labels}}} {getattr(entry, field)}")
+        return "\n".join(lines) + "\n"
+
+    def _record(
+        self, key: _Key, seconds: float, own_seconds: float, failed: bool
+    ):
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = _Timing()
+            timing.calls += 1
+            timing.seconds += seconds
+            timing.own_seconds += own_seconds
+            timing.failures += failed
+
+    @property
+    def _frames(self) -> List[_Frame]:
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+
+_METRICS = [
+    ("calls_total", "calls", "Number of evaluations."),
+    ("seconds_total", "seconds", "Time spent, including sub-elements."),
+    ("own_seconds_total", "own_seconds", "Time spent, excluding sub-elements."),
+    ("failures_total", "failures", "Number of evaluations which failed."),
+]
+
+
+def _values(timing: _Timing) -> Tuple[int, float, float, int]:
+    return timing.calls, timing.seconds, timing.own_seconds, timing.failures
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_KEYWORD_NAMES = {
+    InstanceOf: "type",
+    NoMatch: "false",
+    AdditionalItems: "additionalItems",
+    AdditionalProperties: "additionalProperties",
+}
+
+
+def _keyword(validator: Validator) -> str:
+    return _KEYWORD_NAMES.get(type(validator)) or validator.keywords[0]
+
+
+class _TimedValidator:
+    """Validator which records the time it takes against the current path."""
+
+    def __init__(self, validator: Validator, profile: Profile):
+        self.validator = validator
+        self.keyword = _keyword(validator)
+        self.profile = profile
+
+    def __getattr__(self, name):
+        return getattr(self.validator, name)
+
+    def __call__(self, value: Any, property_: Any):
+        # pylint: disable=protected-access
+        path = self.profile._frames[-1].path
+        start = perf_counter()
+        failed = True
+        try:
+            self.validator(value, property_)
+            failed = False
+        finally:
+            seconds = perf_counter() - start
+            self.profile._record((path, self.keyword), seconds, seconds, failed)
+
+
+# pylint: disable=protected-access
+class _ProfilingEngine(Engine):
+    """Engine which records each evaluation and keyword in a profile.
+
+    Each evaluation runs to completion before the evaluation which
+    requested it resumes, so the time taken by an evaluation includes
+    the time taken by the evaluations it requests. These are subtracted
+    to find the time taken by the element itself.
+
+    Validators which request sub-evaluations, such as ``"contains"``, are
+    not timed, as their time is recorded against those sub-elements.
+    """
+
+    def __init__(self, profile: Profile, max_depth: Optional[int] = None):
+        super().__init__(max_depth)
+        self.profile = profile
+        self._plans: Dict[int, _Plan] = {}
+
+    def _run(self, evaluation):
+        frames = self.profile._frames
+        size = len(frames)
+        try:
+            return super()._run(evaluation)
+        finally:
+            # Close evaluations abandoned by a failed run. Their generators
+            # are closed later, once their frames are discarded.
+            while len(frames) > size:
+                self._close(frames, failed=True)
+
+    def _plan(self, element: Element) -> _Plan:
+        plan = self._plans.get(id(element))
+        if plan is None:
+            # The plan keeps the element alive, so its id isn't reused.
+            plan = super()._plan(element)
+            plan = self._plans[id(element)] = plan._replace(
+                validators=[
+                    (
+                        validator if handler
+                        # Timed validators stand in for the validator.
+                        else cast(
+                            Validator, _TimedValidator(validator, self.profile)
+                        ),
+                        handler,
+                    )
+                    for validator, handler in plan.validators
+                ]
+            )
+        return plan
+
+    def _call(
+        self, element: Element, value: Any, property_: _Property, depth: int
+    ):
+        return self._profile(
+            element,
+            value,
+            property_,
+            super()._call(element, value, property_, depth),
+        )
+
+    def _new(
+        self,
+        model: ObjectMeta,
+        value: Any,
+        property_: _Property,
+        depth: int,
+        compiled: bool = True,
+    ):
+        # pylint: disable=too-many-arguments
+        return self._profile(
+            model,
+            value,
+            property_,
+            super()._new(model, value, property_, depth, compiled),
+        )
+
+    def _profile(
+        self,
+        element: Element,
+        value: Any,
+        property_: _Property,
+        evaluation: _Evaluation,
+    ) -> _Evaluation:
+        """Record an evaluation of an element, as it runs."""
+        frames = self.profile._frames
+        frame = _Frame(
+            element,
+            value,
+            _path(frames, element, value, property_),
+            perf_counter(),
+            [],
+        )
+        frames.append(frame)
+        failed = True
+        try:
+            result = yield from evaluation
+            failed = False
+            return result
+        finally:
+            if frames and frames[-1] is frame:
+                self._close(frames, failed)
+
+    def _close(self, frames: List[_Frame], failed: bool):
+        """Record the evaluation of the innermost frame."""
+        frame = frames.pop()
+        seconds = perf_counter() - frame.start
+        if frames:
+            frames[-1].children.append(seconds)
+        self.profile._record(
+            (frame.path, None), seconds, seconds - sum(frame.children), failed
+        )
+
+
+def _path(
+    frames: List[_Frame], element: Element, value: Any, property_: _Property
+) -> str:
+    if not frames:
+        return element.annotation
+    parent = frames[-1]
+    if element is parent.element and isinstance(parent.value, NotPassed):
+        # Evaluating the default value of the element.
+        return parent.path
+    if value is parent.value:
+        return f"{parent.path}<{element.annotation}>"
+    if isinstance(parent.value, list):
+        return f"{parent.path}[]"
+    if property_.element is element and property_.name:
+        return f"{parent.path}.{property_.name}"
+    return f"{parent.path}<{element.annotation}>"
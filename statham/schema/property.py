@@ -150,6 +150,13 @@ class _PropertyDict(Dict[str, _Property[Any]]):
             )
         super().__setitem__(key, value)  # pylint: disable=no-member
         value.bind(name=key, parent=self.parent)
+        if self.parent is None:
+            return
+        # Validate against the new property, see `Engine`, and discard
+        # digests of the old properties.
+        for cached in ("__plan__", "_fingerprint", "_hash"):
+            if cached in vars(self.parent):
+                delattr(self.parent, cached)
 
     @property
     def parent(self) -> "Element":
@@ -0,0 +1,415 @@
+"""Detection of sub-elements which can never match.
+
+Schemas combined from many sources often contain branches which no value
+can match, such as an ``AllOf`` element with conflicting types, or a
+``minimum`` greater than the ``maximum``. These still cost time whenever
+the enclosing composition is validated. :func:`find_unsatisfiable` finds
+them, and :func:`prune_unsatisfiable` replaces them with
+:class:`~statham.schema.elements.Nothing`:
+
+.. code:: python
+
+    from statham.schema import optimize
+    from statham.schema.satisfiability import (
+        find_unsatisfiable,
+        prune_unsatisfiable,
+    )
+
+    for unsatisfiable in find_unsatisfiable(element):
+        print(f"{unsatisfiable.pointer}: {unsatisfiable.reason}")
+    element = optimize(prune_unsatisfiable(element))
+
+Detection is conservative: every element reported can never match, but
+not every such element is reported.
+"""
+from math import ceil, floor
+import re
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from statham.schema.constants import NotPassed
+from statham.schema.elements import (
+    AllOf,
+    AnyOf,
+    CompositionElement,
+    Element,
+    Not,
+    Nothing,
+    OneOf,
+)
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.exceptions import ValidationError
+from statham.schema.helpers import json_pointer
+from statham.schema.optimizer import (
+    accepts_everything,
+    Optimizer,
+    with_default,
+)
+
+
+_TYPES: Dict[type, str] = {
+    type(None): "null",
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    str: "string",
+    list: "array",
+    dict: "object",
+}
+"""JSON types of python values. ``"number"`` is used for floats only."""
+
+_ALL_TYPES: FrozenSet[str] = frozenset(_TYPES.values())
+_NUMERIC_TYPES: FrozenSet[str] = frozenset({"integer", "number"})
+
+
+class Unsatisfiable(NamedTuple):
+    """An element which can never match.
+
+    :param pointer: JSON Pointer to the element, from the root element
+        analysed. Pointers follow the element tree, which may differ from
+        the original schema where the parser has recomposed it.
+    :param element: The unsatisfiable element.
+    :param reason: Why the element can never match.
+    """
+
+    pointer: str
+    element: Element
+    reason: str
+
+
+def find_unsatisfiable(element: Element) -> List[Unsatisfiable]:
+    """Find the sub-elements of an element which can never match.
+
+    Each object model is reported at most once, at the first pointer at
+    which it is found. Elements which are already
+    :class:`~statham.schema.elements.Nothing` are not reported.
+
+    >>> element = AnyOf(String(), AllOf(Integer(), String()))
+    >>> [found.pointer for found in find_unsatisfiable(element)]
+    ['/anyOf/1']
+
+    :param element: The :class:`~statham.schema.elements.Element` to
+        analyse.
+    :return: A list of unsatisfiable elements, in depth-first order.
+    """
+    analysis = _Analysis(element)
+    found: List[Unsatisfiable] = []
+    seen: Set[int] = set()
+    stack: List[Tuple[str, Element]] = [("", element)]
+    while stack:
+        pointer, current = stack.pop()
+        if isinstance(current, ObjectMeta):
+            if id(current) in seen:
+                continue
+            seen.add(id(current))
+        reason = analysis.reasons.get(id(current))
+        if reason and not isinstance(current, Nothing):
+            found.append(Unsatisfiable(pointer, current, reason))
+        stack.extend(
+            (pointer + json_pointer(path), child)
+            for path, child in reversed(list(_children(current)))
+        )
+    return found
+
+
+def prune_unsatisfiable(element: Element) -> Element:
+    """Replace sub-elements which can never match with
+    :class:`~statham.schema.elements.Nothing`.
+
+    Defaults of pruned elements are kept. Object models are pruned in
+    place, but never replaced themselves. Other elements are not
+    modified, so the result may be a copy. Use
+    :func:`~statham.schema.optimizer.optimize` afterwards to remove
+    pruned elements from compositions.
+
+    :param element: The :class:`~statham.schema.elements.Element` to
+        prune.
+    :return: An equivalent element, which may be ``element`` itself.
+    """
+    return _Pruner(_Analysis(element)).optimize(element)
+
+
+class _Pruner(Optimizer):
+    """Rewrite unsatisfiable elements to ``Nothing()``."""
+
+    def __init__(self, analysis: "_Analysis"):
+        super().__init__()
+        self.analysis = analysis
+
+    def rewrite(self, element: Element) -> Element:
+        if id(element) in self.analysis.reasons and not isinstance(
+            element, Nothing
+        ):
+            return with_default(Nothing(), element.default)
+        return self.children(element)
+
+
+class _Analysis:
+    """The JSON types each element in a tree may accept.
+
+    Each element is analysed once, after its sub-elements. Recursive
+    models are assumed to accept any type while they are being analysed,
+    so they are only reported if unsatisfiable for another reason.
+    """
+
+    def __init__(self, element: Element):
+        self.types: Dict[int, FrozenSet[str]] = {}
+        self.reasons: Dict[int, str] = {}
+        self._analyse(element)
+
+    def satisfiable(self, element: Any) -> bool:
+        if element is False:
+            return False
+        if not isinstance(element, Element):
+            return True
+        return bool(self.types.get(id(element), _ALL_TYPES))
+
+    def _analyse(self, root: Element):
+        in_progress: Set[int] = {id(root)}
+        stack: List[Tuple[Element, Iterator[Element]]] = [
+            (root, (child for _, child in _children(root)))
+        ]
+        while stack:
+            element, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                in_progress.discard(id(element))
+                self._evaluate(element)
+            elif id(child) not in self.types and id(child) not in in_progress:
+                in_progress.add(id(child))
+                stack.append((child, (sub for _, sub in _children(child))))
+
+    def _evaluate(self, element: Element):
+        types = set(_element_types(element))
+        reasons: List[str] = []
+
+        def exclude(excluded: FrozenSet[str], reason: str):
+            if types & excluded:
+                types.difference_update(excluded)
+                reasons.append(reason)
+
+        if isinstance(element, CompositionElement):
+            self._check_composition(element, exclude)
+        elif isinstance(element, Not) and accepts_everything(element.element):
+            exclude(_ALL_TYPES, "Negates an element which matches anything.")
+        _check_numeric(element, exclude)
+        if _exceeds(element, "minLength", "maxLength"):
+            exclude(frozenset({"string"}), "minLength exceeds maxLength.")
+        self._check_array(element, exclude)
+        self._check_object(element, exclude)
+        if types:
+            _check_values(element, exclude)
+        self.types[id(element)] = frozenset(types)
+        if isinstance(element, Nothing):
+            self.reasons[id(element)] = "Matches nothing."
+        elif not types:
+            self.reasons[id(element)] = " ".join(reasons)
+
+    def _check_composition(self, element: CompositionElement, exclude):
+        sub_types = [
+            self.types.get(id(sub_element), _ALL_TYPES)
+            for sub_element in element.elements
+        ]
+        if isinstance(element, AllOf):
+            for idx, sub_element in enumerate(element.elements):
+                if not self.satisfiable(sub_element):
+                    exclude(_ALL_TYPES, f"allOf/{idx} is unsatisfiable.")
+            exclude(
+                _ALL_TYPES - frozenset.intersection(*sub_types),
+                "Sub-elements have no type in common.",
+            )
+        elif isinstance(element, (AnyOf, OneOf)):
+            exclude(
+                _ALL_TYPES - frozenset.union(*sub_types),
+                "No sub-element is satisfiable.",
+            )
+
+    def _check_array(self, element: Element, exclude):
+        array = frozenset({"array"})
+        if _exceeds(element, "minItems", "maxItems"):
+            exclude(array, "minItems exceeds maxItems.")
+        min_items = getattr(element, "minItems", NotPassed())
+        min_items = 0 if isinstance(min_items, NotPassed) else min_items
+        contains = getattr(element, "contains", NotPassed())
+        if not isinstance(contains, NotPassed):
+            if not self.satisfiable(contains):
+                exclude(array, "contains is unsatisfiable.")
+            if getattr(element, "maxItems", NotPassed()) == 0:
+                exclude(array, "contains requires an item, but maxItems is 0.")
+        items = getattr(element, "items", NotPassed())
+        if isinstance(items, Element) and min_items:
+            if not self.satisfiable(items):
+                exclude(array, "items is unsatisfiable, but minItems is set.")
+        elif isinstance(items, list):
+            for idx, item in enumerate(items[:min_items]):
+                if not self.satisfiable(item):
+                    exclude(
+                        array, f"Required item items/{idx} is unsatisfiable."
+                    )
+            if min_items > len(items) and not self.satisfiable(
+                getattr(element, "additionalItems", True)
+            ):
+                exclude(array, "additionalItems is unsatisfiable.")
+
+    def _check_object(self, element: Element, exclude):
+        object_ = frozenset({"object"})
+        if _exceeds(element, "minProperties", "maxProperties"):
+            exclude(object_, "minProperties exceeds maxProperties.")
+        properties = getattr(element, "properties", None)
+        required = list(getattr(element, "required", None) or [])
+        if properties:
+            required += properties.required
+        properties = properties or {}
+        max_properties = getattr(element, "maxProperties", NotPassed())
+        if not isinstance(max_properties, NotPassed) and (
+            len(set(required)) > max_properties
+        ):
+            exclude(object_, "More properties are required than maxProperties.")
+        property_names = getattr(element, "propertyNames", NotPassed())
+        if (
+            required or getattr(element, "minProperties", None)
+        ) and not self.satisfiable(property_names):
+            exclude(object_, "propertyNames is unsatisfiable.")
+        by_source = {
+            prop.source or attr: prop for attr, prop in properties.items()
+        }
+        patterns = getattr(element, "patternProperties", None) or {}
+        for name in required:
+            elements = [by_source[name].element] if name in by_source else []
+            elements.extend(
+                pattern_element
+                for pattern, pattern_element in patterns.items()
+                if re.search(pattern, name)
+            )
+            if not elements:
+                elements = [getattr(element, "additionalProperties", True)]
+            if not all(map(self.satisfiable, elements)):
+                exclude(
+                    object_, f"Required property {name!r} is unsatisfiable."
+                )
+
+
+def _element_types(element: Element) -> FrozenSet[str]:
+    """Get the JSON types accepted by an element's type check."""
+    if isinstance(element, Nothing):
+        return frozenset()
+    if isinstance(element, ObjectMeta):
+        return frozenset({"object"})
+    python_types = element.type_validator.params.get("types") or ()
+    types: Set[str] = set()
+    for python_type in python_types:
+        if python_type not in _TYPES:
+            return _ALL_TYPES
+        types.add(_TYPES[python_type])
+    return frozenset(types) if types else _ALL_TYPES
+
+
+def _check_numeric(element: Element, exclude):
+    """Check that numeric bounds may be met, by floats and by integers."""
+    lower = _bound(element, "minimum", "exclusiveMinimum", max)
+    upper = _bound(element, "maximum", "exclusiveMaximum", min)
+    if not (lower and upper):
+        return
+    (low, low_exclusive), (high, high_exclusive) = lower, upper
+    if low > high or (low == high and (low_exclusive or high_exclusive)):
+        exclude(_NUMERIC_TYPES, "No number is within the bounds.")
+        return
+    low_integer = floor(low) + 1 if low_exclusive else ceil(low)
+    high_integer = ceil(high) - 1 if high_exclusive else floor(high)
+    if low_integer > high_integer:
+        exclude(frozenset({"integer"}), "No integer is within the bounds.")
+
+
+def _bound(
+    element: Element, inclusive: str, exclusive: str, strictest
+) -> Optional[Tuple[Any, bool]]:
+    """Get the strictest bound of an element, and whether it is exclusive.
+
+    ``strictest`` is :func:`max` for lower bounds, and :func:`min` for
+    upper bounds.
+    """
+    bounds = [
+        (value, is_exclusive)
+        for keyword, is_exclusive in ((inclusive, False), (exclusive, True))
+        for value in [getattr(element, keyword, NotPassed())]
+        if not isinstance(value, NotPassed)
+    ]
+    if not bounds:
+        return None
+    value = strictest(bound for bound, _ in bounds)
+    return value, any(
+        is_exclusive for bound, is_exclusive in bounds if bound == value
+    )
+
+
+def _exceeds(element: Element, minimum: str, maximum: str) -> bool:
+    low = getattr(element, minimum, NotPassed())
+    high = getattr(element, maximum, NotPassed())
+    if isinstance(low, NotPassed) or isinstance(high, NotPassed):
+        return False
+    return low > high
+
+
+def _check_values(element: Element, exclude):
+    """Check that at least one value of ``const`` or ``enum`` is valid."""
+    const = getattr(element, "const", NotPassed())
+    enum = getattr(element, "enum", NotPassed())
+    if not isinstance(const, NotPassed):
+        keyword, values = "const", [const]
+    elif isinstance(enum, list):
+        keyword, values = "enum", enum
+    else:
+        return
+    valid: Set[str] = set()
+    for value in values:
+        try:
+            _ = element(value)
+        except (TypeError, ValidationError):
+            continue
+        if type(value) in _TYPES:
+            valid.add(_TYPES[type(value)])
+        else:
+            valid.update(_ALL_TYPES)
+    exclude(_ALL_TYPES - valid, f"No value of {keyword} is valid.")
+
+
+def _children(element: Element) -> Iterator[Tuple[Tuple[Any, ...], Element]]:
+    """Iterate over the sub-elements of an element, with their paths."""
+    if isinstance(element, CompositionElement):
+        mode = getattr(element, "mode", type(element).__name__)
+        for idx, sub_element in enumerate(element.elements):
+            yield (mode, idx), sub_element
+    if isinstance(element, Not):
+        yield ("not",), element.element
+    items = getattr(element, "items", NotPassed())
+    if isinstance(items, Element):
+        yield ("items",), items
+    elif isinstance(items, list):
+        for idx, item in enumerate(items):
+            yield ("items", idx), item
+    for keyword in (
+        "additionalItems",
+        "contains",
+        "additionalProperties",
+        "propertyNames",
+    ):
+        value = getattr(element, keyword, NotPassed())
+        if isinstance(value, Element):
+            yield (keyword,), value
+    properties = getattr(element, "properties", None) or {}
+    for attr, prop in properties.items():
+        yield ("properties", prop.source or attr), prop.element
+    for keyword in ("patternProperties", "dependencies"):
+        for key, value in (getattr(element, keyword, None) or {}).items():
+            if isinstance(value, Element):
+                yield (keyword, key), value
@@ -0,0 +1,264 @@
+"""Log validations which take longer than a threshold.
+
+Calling an element or instantiating a model within a
+:class:`SlowValidationLog` is timed, and if it takes longer than the
+threshold, a :class:`SlowValidation` record is logged:
+
+.. code:: python
+
+    import logging
+    from statham.schema.slowlog import SlowValidationLog
+
+    logging.basicConfig()
+    with SlowValidationLog(threshold=0.01):
+        Model(value)
+
+Each record identifies the element which was called, summarises the
+shape of the value, without including any of its data, and names the
+sub-element in which the most time was spent, by its path as in
+:mod:`statham.schema.profiling`. The record is attached to the log record
+as ``slow_validation``, for use by structured logging handlers.
+
+Recording time spent in each sub-element has an overhead, so only a
+sample of validations may be timed by setting ``sample_rate``. Models
+constructed by their compiled function are not timed.
+"""
+from logging import getLogger, Logger, WARNING
+import random
+from threading import local
+from time import perf_counter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from statham.schema.elements.base import Element
+from statham.schema.engine import (
+    _Evaluation,
+    Engine,
+    install,
+    installed,
+    uninstall,
+)
+from statham.schema.profiling import _ProfilingEngine, Profile, ProfileEntry
+from statham.schema.property import _Property
+
+
+LOGGER = getLogger(__name__)
+
+
+class Shape(NamedTuple):
+    """Summary of the shape of a value, without any of its data."""
+
+    type: str
+    """Name of the type of the value."""
+
+    size: Optional[int]
+    """Length of the value, if it is a string, array or object."""
+
+    depth: int
+    """Depth to which arrays and objects are nested, 0 for scalars."""
+
+    nodes: int
+    """Number of values counted, including nested values."""
+
+    max_array: int
+    """Length of the longest array counted."""
+
+    max_object: int
+    """Number of properties of the largest object counted."""
+
+    max_string: int
+    """Length of the longest string counted."""
+
+    truncated: bool
+    """Whether counting stopped before every nested value was counted."""
+
+
+def shape(value: Any, limit: int = 1000) -> Shape:
+    """Summarise the shape of a value.
+
+    :param value: The value to summarise.
+    :param limit: The maximum number of values to count, bounding the
+        time taken to summarise large values.
+    """
+    stack = [(value, 0)]
+    nodes = depth = max_array = max_object = max_string = 0
+    while stack and nodes < limit:
+        current, level = stack.pop()
+        nodes += 1
+        if isinstance(current, str):
+            max_string = max(max_string, len(current))
+            continue
+        if isinstance(current, dict):
+            max_object = max(max_object, len(current))
+            children: List[Any] = list(current.values())
+        elif isinstance(current, list):
+            max_array = max(max_array, len(current))
+            children = current
+        else:
+            continue
+        if children:
+            depth = max(depth, level + 1)
+            stack.extend((child, level + 1) for child in children)
+    return Shape(
+        type=type(value).__name__,
+        size=len(value) if isinstance(value, (str, list, dict)) else None,
+        depth=depth,
+        nodes=nodes,
+        max_array=max_array,
+        max_object=max_object,
+        max_string=max_string,
+        truncated=bool(stack),
+    )
+
+
+class SlowValidation(NamedTuple):
+    """A validation which took longer than the threshold."""
+
+    element: str
+    """Annotation of the element which was called."""
+
+    seconds: float
+    threshold: float
+    failed: bool
+    """Whether the value failed validation."""
+
+    shape: Shape
+    slowest: Optional[ProfileEntry]
+    """The sub-element in which the most time was spent, excluding its own
+    sub-elements.
+    """
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record to a JSON-serializable dictionary."""
+        return {
+            "element": self.element,
+            "seconds": self.seconds,
+            "threshold": self.threshold,
+            "failed": self.failed,
+            "shape": self.shape._asdict(),
+            "slowest": self.slowest and self.slowest._asdict(),
+        }
+
+
+class SlowValidationLog:
+    """Log each validation which takes longer than a threshold.
+
+    Use as a context manager, or call :meth:`start` and :meth:`stop`, to
+    time validation in every thread. Logs may be nested, in which case
+    only the most recently started log times validations. Nested logs and
+    profiles may be stopped in any order.
+
+    :param threshold: Seconds a validation may take before it is logged.
+    :param logger: The logger to log records with.
+    :param level: The level to log records at.
+    :param sample_rate: The fraction of validations to time, between 0
+        and 1.
+    :param limit: The maximum number of values to count when summarising
+        the shape of a value.
+    :raises ValueError: if ``sample_rate`` is not between 0 and 1.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        *,
+        logger: Logger = LOGGER,
+        level: int = WARNING,
+        sample_rate: float = 1.0,
+        limit: int = 1000,
+    ):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(
+                f"Sample rate must be between 0 and 1, got {sample_rate}."
+            )
+        self.threshold = threshold
+        self.logger = logger
+        self.level = level
+        self.sample_rate = sample_rate
+        self.limit = limit
+        self._local = local()
+
+    def start(self):
+        """Start timing validations."""
+        install(self._engine)
+
+    def stop(self):
+        """Stop timing validations."""
+        uninstall(self._engine)
+
+    def __enter__(self) -> "SlowValidationLog":
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def _engine(self, max_depth: Optional[int] = None) -> Engine:
+        """Create an engine, which times its validation if sampled."""
+        if getattr(self._local, "active", False) or (
+            self.sample_rate < 1 and random.random() >= self.sample_rate
+        ):
+            # Nested validations are timed as part of the outer validation.
+            return installed(below=self._engine)(max_depth)
+        return _TimingEngine(self, max_depth)
+
+
+# pylint: disable=protected-access
+class _TimingEngine(_ProfilingEngine):
+    """Engine which logs its validation if it takes longer than the
+    threshold.
+
+    Sub-elements are timed as while profiling, but keywords are not.
+    """
+
+    _plan = Engine._plan
+
+    def __init__(self, log: SlowValidationLog, max_depth: Optional[int]):
+        super().__init__(Profile(), max_depth)
+        self.log = log
+        self.root: Optional[Tuple[Element, Any]] = None
+
+    def _profile(
+        self,
+        element: Element,
+        value: Any,
+        property_: _Property,
+        evaluation: _Evaluation,
+    ) -> _Evaluation:
+        if self.root is None:
+            self.root = (element, value)
+        return super()._profile(element, value, property_, evaluation)
+
+    def _run(self, evaluation):
+        self.log._local.active = True
+        start = perf_counter()
+        failed = True
+        try:
+            result = super()._run(evaluation)
+            failed = False
+            return result
+        finally:
+            seconds = perf_counter() - start
+            self.log._local.active = False
+            if seconds > self.log.threshold and self.root is not None:
+                self._emit(*self.root, seconds, failed)
+
+    def _emit(self, element: Element, value: Any, seconds: float, failed: bool):
+        elements = self.profile.elements()
+        record = SlowValidation(
+            element=element.annotation,
+            seconds=seconds,
+            threshold=self.log.threshold,
+            failed=failed,
+            shape=shape(value, self.log.limit),
+            slowest=elements[0] if elements else None,
+        )
+        self.log.logger.log(
+            self.log.level,
+            "Validation of %s took %.3fms, more than %.3fms. Most time was "
+            "spent in %s.",
+            record.element,
+            seconds * 1e3,
+            record.threshold * 1e3,
+            record.slowest and record.slowest.path,
+            extra={"slow_validation": record},
+        )
@@ -17,7 +17,7 @@ its relevant validators, but validators may be used directly:
     validator(2, None)  # ValidationError
 
 """
-from typing import Iterator, Type
+from typing import Iterator
 
 from statham.schema.validation.array import (
     AdditionalItems,
@@ -32,6 +32,7 @@ from statham.schema.validation.base import (
     InstanceOf,
     NoMatch,
     Validator,
+    VALIDATOR_TYPES,
 )
 from statham.schema.validation.format import format_checker
 from statham.schema.validation.numeric import (
@@ -57,13 +58,6 @@ from statham.schema.validation.string import (
 )
 
 
-def _all_subclasses(klass: Type):
-    """Get all explicit and implicit subclasses of a type."""
-    return set(klass.__subclasses__()).union(
-        [s for c in klass.__subclasses__() for s in _all_subclasses(c)]
-    )
-
-
 def get_validators(element) -> Iterator[Validator]:
     """Iterate all applicable validators for an Element.
 
@@ -71,7 +65,7 @@ def get_validators(element) -> Iterator[Validator]:
     `from_element` class method. In general, this checks whether its
     parameters are present on the element with correct values.
     """
-    for validator_type in _all_subclasses(Validator):
+    for validator_type in VALIDATOR_TYPES:
         if validator_type in (InstanceOf, NoMatch):
             continue
         validator = validator_type.from_element(element)
@@ -1,4 +1,4 @@
-from typing import Any, ClassVar, Optional, Tuple, Type
+from typing import Any, ClassVar, List, Optional, Tuple, Type
 
 from statham.schema.constants import NotPassed
 from statham.schema.exceptions import ValidationError
@@ -24,6 +24,10 @@ def _is_instance(value, type_args):
     return isinstance(value, type_args)
 
 
+VALIDATOR_TYPES: List[Type["Validator"]] = []
+"""Every subclass of :class:`Validator`, in the order they are defined."""
+
+
 class Validator:
     """Base validator type.
 
@@ -32,6 +36,10 @@ class Validator:
     method.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        VALIDATOR_TYPES.append(cls)
+
     types: ClassVar[Optional[Tuple[Type, ...]]] = None
     """Types on which this validator applies.
 
@@ -1,9 +1,6 @@
 from typing import Callable, Dict
-from uuid import UUID
 import warnings
 
-from dateutil.parser import parse as parse_datetime, ParserError  # type: ignore
-
 
 class _FormatString:
     """Extendable format string register.
@@ -58,6 +55,9 @@ Validators for new formats may be registered as follows:
 
 @format_checker.register("uuid")
 def _is_uuid(value: str) -> bool:
+    # pylint: disable=import-outside-toplevel
+    from uuid import UUID
+
     try:
         UUID(value)
     except (ValueError, TypeError):
@@ -67,6 +67,13 @@ def _is_uuid(value: str) -> bool:
 
 @format_checker.register("date-time")
 def _is_date_time(value: str) -> bool:
+    # Imported on first use, as ``dateutil`` is slow to import.
+    # pylint: disable=import-outside-toplevel
+    from dateutil.parser import (  # type: ignore
+        parse as parse_datetime,
+        ParserError,
+    )
+
     try:
         parse_datetime(value)
     except (ParserError, TypeError):
@@ -13,7 +13,7 @@ class Required(Validator):
 
     @classmethod
     def from_element(cls, element):
-        required = getattr(element, "required", None) or []
+        required = list(getattr(element, "required", None) or [])
         properties = getattr(element, "properties", None)
         if properties:
             required += properties.required
@@ -22,8 +22,9 @@ class Required(Validator):
         return Required(required)
 
     def _validate(self, value: Any):
-        if set(self.params["required"]) - set(value):
-            raise ValidationError
+        for name in self.params["required"]:
+            if name not in value:
+                raise ValidationError
 
 
 class AdditionalProperties(Validator):
@@ -41,11 +42,9 @@ class AdditionalProperties(Validator):
     def _validate(self, value: Any):
         if self.params["__properties__"].additional:
             return
-        bad_properties = {
-            key for key in value if key not in self.params["__properties__"]
-        }
-        if bad_properties:
-            raise ValidationError
+        for key in value:
+            if key not in self.params["__properties__"]:
+                raise ValidationError
 
 
 class MinProperties(Validator):
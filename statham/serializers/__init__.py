@@ -2,5 +2,8 @@
 
 Elements may be serialized to a JSON dictionary or a Python module.
 """
-from statham.serializers.python import serialize_python
+from statham.serializers.python import (
+    serialize_python,
+    serialize_python_package,
+)
 from statham.serializers.json import serialize_json
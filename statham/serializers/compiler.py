@@ -0,0 +1,533 @@
+# pylint: disable=too-many-lines
+"""Generate compiled functions for object models.
+
+See :mod:`statham.schema.compiled`. Each function inlines the validation
+and construction of its model's properties, where their elements are
+strings, numbers, booleans, nulls or arrays of these, with constants and
+regular expressions computed once, when the generated module is imported.
+Other elements, and nested models, are evaluated as usual. Models with
+keywords which can't be compiled are left uncompiled.
+"""
+from collections import defaultdict
+import math
+from typing import Any, cast, Dict, List, NamedTuple, Optional, Set
+
+from statham.schema.constants import NotPassed
+from statham.schema.elements import (
+    Array,
+    Boolean,
+    Element,
+    Integer,
+    Nothing,
+    Null,
+    Number,
+    String,
+)
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.property import _Property, _PropertyDict
+from statham.schema.validation import (
+    AdditionalItems,
+    Const,
+    Enum,
+    ExclusiveMaximum,
+    ExclusiveMinimum,
+    Format,
+    InstanceOf,
+    MaxItems,
+    MaxLength,
+    Maximum,
+    MinItems,
+    MinLength,
+    Minimum,
+    MultipleOf,
+    Pattern,
+    Validator,
+)
+
+
+class CompiledModel(NamedTuple):
+    """The compiled function of a model, as python source."""
+
+    source: str
+    """Declaration of the function and the constants it uses."""
+
+    imports: Dict[str, Set[str]]
+    """Names imported from each module by the declaration. Modules with no
+    names are imported whole.
+    """
+
+
+_COMPILED = "statham.schema.compiled"
+
+_INLINE_ELEMENTS = (Array, Boolean, Integer, Null, Number, String)
+
+_TYPE_NAMES = {
+    bool: "bool",
+    float: "float",
+    int: "int",
+    list: "list",
+    str: "str",
+    type(None): "type(None)",
+}
+
+_COMPARISONS = {
+    MinLength: ("len({value}) < {param!r}", "minLength"),
+    MaxLength: ("len({value}) > {param!r}", "maxLength"),
+    MinItems: ("len({value}) < {param!r}", "minItems"),
+    MaxItems: ("len({value}) > {param!r}", "maxItems"),
+    Minimum: ("{value} < {param!r}", "minimum"),
+    Maximum: ("{value} > {param!r}", "maximum"),
+    ExclusiveMinimum: ("{value} <= {param!r}", "exclusiveMinimum"),
+    ExclusiveMaximum: ("{value} >= {param!r}", "exclusiveMaximum"),
+}
+"""Failure conditions of validators which compare a value to a number."""
+
+
+def compile_model(model: ObjectMeta) -> Optional[CompiledModel]:
+    """Generate the compiled function of a model.
+
+    :param model: The model to compile.
+    :return: The source of the compiled function, or ``None`` if the model
+        has keywords which can't be compiled.
+    """
+    if not _is_compilable(model):
+        return None
+    return _Compiler(model).compile()
+
+
+def _is_compilable(model: ObjectMeta) -> bool:
+    # Subclasses of ObjectMeta may change how models are constructed.
+    # pylint: disable=unidiomatic-typecheck
+    return (
+        type(model) is ObjectMeta
+        and isinstance(model.additionalProperties, bool)
+        and not model.patternProperties
+        and all(
+            isinstance(getattr(model, keyword), NotPassed)
+            for keyword in ("propertyNames", "const", "enum", "dependencies")
+        )
+    )
+
+
+def _is_literal(value: Any) -> bool:
+    """Check that a value is reproduced by evaluating its ``repr``."""
+    if value is None or isinstance(value, (bool, int, str)):
+        return True
+    if isinstance(value, float):
+        return math.isfinite(value)
+    if isinstance(value, list):
+        return all(map(_is_literal, value))
+    if isinstance(value, dict):
+        return all(map(_is_literal, value)) and all(
+            map(_is_literal, value.values())
+        )
+    return False
+
+
+class _Compiler:
+    """Generate the compiled function of a single model."""
+
+    def __init__(self, model: ObjectMeta):
+        self.model = model
+        self.constants: Dict[str, str] = {}
+        self.imports: Dict[str, Set[str]] = defaultdict(set)
+        self.scopes = 0
+
+    def compile(self) -> CompiledModel:
+        """Generate the function, and the constants it uses."""
+        name = self.model.__name__
+        self.imports[_COMPILED].add("compiled")
+        lines = [
+            f"@compiled({name})",
+            f"def _compiled_{name}(value):",
+            *self._model("    "),
+            "    return results",
+        ]
+        constants = [
+            f"{constant} = {expression}"
+            for expression, constant in self.constants.items()
+        ]
+        source = "\n".join(constants + ["", ""] + lines if constants else lines)
+        return CompiledModel(source + "\n", dict(self.imports))
+
+    def constant(self, expression: str) -> str:
+        """Get the name of a module constant, evaluated on import."""
+        if expression not in self.constants:
+            self.constants[
+                expression
+            ] = f"_{self.model.__name__}_{len(self.constants)}"
+        return self.constants[expression]
+
+    def variables(self, *names: str) -> List[str]:
+        """Get distinct names for local variables."""
+        self.scopes += 1
+        return [f"{name}_{self.scopes}" for name in names]
+
+    def _raise_if(self, conditions: List[str], indent: str) -> List[str]:
+        if not conditions:
+            return []
+        self.imports["statham.schema.exceptions"].add("ValidationError")
+        if len(conditions) == 1:
+            lines = [f"{indent}if {conditions[0]}:"]
+        else:
+            lines = [f"{indent}if ("]
+            lines.extend(
+                f"{indent}    {'or ' if idx else ''}{condition}"
+                for idx, condition in enumerate(conditions)
+            )
+            lines.append(f"{indent}):")
+        return lines + [f"{indent}    raise ValidationError"]
+
+    def _model(self, indent: str) -> List[str]:
+        """Validate the value, then construct each property.
+
+        This follows ``Properties.__call__``. Keys are evaluated in order:
+        first the name of each property, then any other key of the value.
+        Each key is evaluated against the property with that source, or
+        otherwise as an additional property.
+        """
+        model = self.model
+        props = dict(cast(_PropertyDict, model.properties))
+        by_source = {prop.source: prop for prop in props.values()}
+        lines = self._raise_if(self._model_conditions(by_source), indent)
+        lines.append(f"{indent}results = {{}}")
+        for name in props:
+            prop = by_source.get(name)
+            if prop is None:
+                # Only evaluated when the name of a property isn't a source.
+                lines.extend(
+                    self._additional(
+                        f"value[{name!r}]",
+                        f"results[{name!r}]",
+                        indent,
+                        present=f"{name!r} in value",
+                    )
+                )
+                continue
+            lines.append(f"{indent}sub = value.get({name!r}, NOT_PASSED)")
+            lines.extend(self._property(prop, "sub", indent))
+        renamed = [
+            prop for prop in by_source.values() if prop.source not in props
+        ]
+        if model.additionalProperties or renamed:
+            lines.extend(self._remaining(props, renamed, indent))
+        self.imports[_COMPILED].add("NOT_PASSED")
+        return lines
+
+    def _model_conditions(
+        self, by_source: Dict[Optional[str], _Property]
+    ) -> List[str]:
+        """Get the conditions on which a value fails validation against the
+        keywords of the model.
+
+        :param by_source: The properties of the model, by their source.
+        """
+        model = self.model
+        properties = cast(_PropertyDict, model.properties)
+        required = (
+            [] if isinstance(model.required, NotPassed) else model.required
+        )
+        required = list(required) + properties.required
+        conditions = []
+        if required:
+            keys = self.constant(_frozenset(required))
+            conditions.append(f"not value.keys() >= {keys}")
+        if not model.additionalProperties:
+            allowed = self.constant(
+                _frozenset(
+                    source
+                    for source, prop in by_source.items()
+                    if not isinstance(prop.element, Nothing)
+                )
+            )
+            conditions.append(f"not value.keys() <= {allowed}")
+        for keyword, comparison in (
+            ("minProperties", "<"),
+            ("maxProperties", ">"),
+        ):
+            limit = getattr(model, keyword)
+            if not isinstance(limit, NotPassed):
+                conditions.append(f"len(value) {comparison} {limit!r}")
+        return conditions
+
+    def _remaining(
+        self,
+        props: Dict[str, _Property],
+        renamed: List[_Property],
+        indent: str,
+    ) -> List[str]:
+        """Evaluate keys of the value which aren't property names."""
+        lines = []
+        inner = indent
+        if props:
+            names = self.constant(_frozenset(props))
+            lines.append(f"{indent}if not value.keys() <= {names}:")
+            inner = indent + "    "
+        lines.append(f"{inner}for key, sub in value.items():")
+        body = inner + "    "
+        if props:
+            lines += [f"{body}if key in {names}:", f"{body}    continue"]
+        for idx, prop in enumerate(renamed):
+            keyword = "elif" if idx else "if"
+            lines.append(f"{body}{keyword} key == {prop.source!r}:")
+            lines.extend(self._property(prop, "sub", body + "    "))
+        if renamed:
+            lines.append(f"{body}else:")
+            body += "    "
+        lines.extend(self._additional("sub", "results[key]", body))
+        return lines
+
+    def _additional(
+        self, value: str, target: str, indent: str, present: str = None
+    ) -> List[str]:
+        """Evaluate an additional property.
+
+        If given, ``present`` is the condition on which the value is
+        present. Otherwise, it is always present.
+        """
+        if self.model.additionalProperties:
+            self.imports[_COMPILED].add("additional")
+            result = f"additional({value})"
+        else:
+            result = None
+        if present is None:
+            if result is None:
+                self.imports["statham.schema.exceptions"].add("ValidationError")
+                return [f"{indent}raise ValidationError"]
+            return [f"{indent}{target} = {result}"]
+        if result is None:
+            return [f"{indent}{target} = NOT_PASSED"]
+        return [f"{indent}{target} = {result} if {present} else NOT_PASSED"]
+
+    def _property(self, prop: _Property, value: str, indent: str) -> List[str]:
+        prop_expression = f"{self.model.__name__}.properties[{prop.name!r}]"
+        return self._element(
+            prop.element,
+            f"{prop_expression}.element",
+            value,
+            f"results[{prop.name!r}]",
+            prop_expression,
+            indent,
+        )
+
+    # pylint: disable=too-many-arguments
+    def _element(
+        self,
+        element: Element,
+        expression: str,
+        value: str,
+        target: str,
+        prop: str,
+        indent: str,
+    ) -> List[str]:
+        """Evaluate an element against a value, assigning the result.
+
+        :param element: The element to evaluate.
+        :param expression: Expression of the element, relative to the
+            model.
+        :param value: Name of the variable holding the value.
+        :param target: Target to which the result is assigned.
+        :param prop: Expression of the enclosing property, relative to the
+            model.
+        :param indent: Indentation of the lines.
+        """
+        if isinstance(element, ObjectMeta):
+            self.imports[_COMPILED].add("construct")
+            return [
+                f"{indent}{target} = construct({element.__name__}, {value}, "
+                f"{self.constant(prop)})"
+            ]
+        # pylint: disable=unidiomatic-typecheck
+        if type(element) is Element and element == Element():
+            self.imports[_COMPILED].add("additional")
+            return [
+                f"{indent}{target} = {value} if {value} is NOT_PASSED "
+                f"else additional({value})"
+            ]
+        conditions = (
+            self._conditions(element, value)
+            if type(element) in _INLINE_ELEMENTS
+            and not isinstance(getattr(element, "items", None), list)
+            else None
+        )
+        if conditions is None:
+            evaluate = self.constant(expression)
+            return [
+                f"{indent}{target} = "
+                f"{evaluate}({value}, {self.constant(prop)})"
+            ]
+        default = element.default
+        if isinstance(default, NotPassed):
+            not_passed = f"{indent}    {target} = NOT_PASSED"
+        elif _is_literal(default) and not isinstance(default, (dict, list)):
+            # Scalar defaults give the same result each time.
+            evaluated = self.constant(
+                f"{self.constant(expression)}(NOT_PASSED, "
+                f"{self.constant(prop)})"
+            )
+            not_passed = f"{indent}    {target} = {evaluated}"
+        else:
+            # Defaults are evaluated as usual, as they may not be valid.
+            not_passed = (
+                f"{indent}    {target} = "
+                f"{self.constant(expression)}({value}, {self.constant(prop)})"
+            )
+        return [
+            f"{indent}if {value} is NOT_PASSED:",
+            not_passed,
+            f"{indent}else:",
+            *self._raise_if(conditions, indent + "    "),
+            *self._create(element, expression, value, target, prop, indent),
+        ]
+
+    # pylint: disable=too-many-arguments
+    def _create(
+        self,
+        element: Element,
+        expression: str,
+        value: str,
+        target: str,
+        prop: str,
+        indent: str,
+    ) -> List[str]:
+        """Construct a value which passed validation."""
+        indent += "    "
+        if isinstance(element, Number):
+            return [f"{indent}{target} = float({value})"]
+        if not isinstance(element, Array):
+            return [f"{indent}{target} = {value}"]
+        items, item, result = self.variables("items", "item", "result")
+        lines = [
+            f"{indent}{items} = []",
+            f"{indent}for {item} in {value}:",
+        ]
+        if isinstance(element.items, NotPassed):
+            self.imports[_COMPILED].add("additional")
+            lines.append(f"{indent}    {result} = additional({item})")
+        else:
+            # Arrays with a list of items are not compiled.
+            lines.extend(
+                self._element(
+                    cast(Element, element.items),
+                    f"{expression}.items",
+                    item,
+                    result,
+                    prop,
+                    indent + "    ",
+                )
+            )
+        return lines + [
+            f"{indent}    {items}.append({result})",
+            f"{indent}{target} = {items}",
+        ]
+
+    def _conditions(self, element: Element, value: str) -> Optional[List[str]]:
+        """Get the conditions on which a value fails validation.
+
+        The first condition checks the type of the value, and later
+        conditions may assume it. Returns ``None`` if any validator can't
+        be compiled.
+        """
+        validators = element.validators
+        type_validator = validators[0]
+        if not isinstance(type_validator, InstanceOf):
+            return None
+        types = type_validator.params["types"]
+        if not types or any(type_ not in _TYPE_NAMES for type_ in types):
+            return None
+        conditions = [_type_condition(types, value)]
+        for validator in validators[1:]:
+            applies = _applies(validator, types)
+            if applies is None:
+                return None
+            if not applies:
+                continue
+            condition = self._condition(validator, value)
+            if condition is None:
+                return None
+            if condition:
+                conditions.append(condition)
+        return conditions
+
+    def _condition(self, validator: Validator, value: str) -> Optional[str]:
+        """Get the condition on which a value fails a validator.
+
+        Returns an empty string if the validator accepts any value of the
+        type, and ``None`` if the validator can't be compiled.
+        """
+        # pylint: disable=too-many-return-statements
+        params = validator.params
+        if isinstance(validator, AdditionalItems):
+            return None if isinstance(params["items"], list) else ""
+        if not all(
+            _is_literal(params[keyword]) for keyword in validator.keywords
+        ):
+            return None
+        if type(validator) in _COMPARISONS:
+            template, keyword = _COMPARISONS[type(validator)]
+            return template.format(value=value, param=params[keyword])
+        if isinstance(validator, Pattern):
+            self.imports["re"] = set()
+            pattern = self.constant(f"re.compile({params['pattern']!r})")
+            return f"not {pattern}.search({value})"
+        if isinstance(validator, Format):
+            self.imports["statham.schema.validation"].add("format_checker")
+            return f"not format_checker({params['format']!r}, {value})"
+        if isinstance(validator, MultipleOf):
+            multiple_of = params["multipleOf"]
+            if isinstance(multiple_of, float):
+                quotient = f"{value} / {multiple_of!r}"
+                return f"int({quotient}) != {quotient}"
+            return f"{value} % {multiple_of!r}"
+        if isinstance(validator, (Const, Enum)):
+            self.imports["statham.schema.validation.base"].add("replace_bool")
+            if isinstance(validator, Const):
+                const = self.constant(f"replace_bool({params['const']!r})")
+                return f"replace_bool({value}) != {const}"
+            enum = self.constant(
+                f"[replace_bool(value) for value in {params['enum']!r}]"
+            )
+            return f"replace_bool({value}) not in {enum}"
+        return None
+
+
+def _frozenset(values) -> str:
+    values = list(dict.fromkeys(values))
+    if not values:
+        return "frozenset()"
+    return f"frozenset({{{', '.join(map(repr, values))}}})"
+
+
+def _type_condition(types, value: str) -> str:
+    """Get the condition on which a value isn't an instance of any type.
+
+    Booleans aren't accepted as numbers, as in
+    :class:`~statham.schema.validation.InstanceOf`.
+    """
+    if types == (type(None),):
+        return f"{value} is not None"
+    names = [_TYPE_NAMES[type_] for type_ in types]
+    condition = (
+        f"not isinstance({value}, {names[0]})"
+        if len(names) == 1
+        else f"not isinstance({value}, ({', '.join(names)}))"
+    )
+    if bool not in types and int in types:
+        condition += f" or isinstance({value}, bool)"
+    return condition
+
+
+def _applies(validator: Validator, types) -> Optional[bool]:
+    """Check whether a validator applies to values of the given types.
+
+    Returns ``None`` if it applies to some of the types, but not others.
+    """
+    if not validator.types:
+        return True
+    applies = {
+        bool in validator.types
+        if type_ is bool
+        else issubclass(type_, validator.types)
+        for type_ in types
+    }
+    return applies.pop() if len(applies) == 1 else None
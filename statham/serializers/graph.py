@@ -0,0 +1,169 @@
+"""Index of the sub-elements of Element trees, shared by serializers."""
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from statham.schema.elements import Element
+from statham.schema.elements.meta import ObjectMeta
+
+
+_CHILD_PATHS: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(path.split("."))
+    for path in (  # Possible paths to immediate children.
+        "items",
+        "additionalItems",
+        "contains",
+        "properties.*.element",
+        "additionalProperties",
+        "patternProperties.*",
+        "propertyNames",
+        "dependencies.*",
+        "elements",
+        "element",
+    )
+)
+
+
+class ElementGraph:
+    """Index of every element reachable from some root elements.
+
+    Elements are traversed once, depth-first, on construction, and each
+    element is visited once no matter how many elements refer to it. The
+    immediate children of each element are cached, along with each object
+    class and the object classes it depends on.
+
+    The graph is not updated if elements are modified after construction.
+
+    :param roots: The elements from which to traverse.
+    """
+
+    def __init__(self, *roots: Element):
+        self.roots: Tuple[Element, ...] = roots
+        self.elements: List[Element] = []
+        """Each reachable element once, in the order they are found."""
+        self._children: Dict[int, List[Element]] = {}
+        self._dependencies: Dict[int, List[ObjectMeta]] = {}
+        self._dependents: Dict[int, List[ObjectMeta]] = {}
+        for root in roots:
+            self._traverse(root)
+        found: Dict[int, ObjectMeta] = {}
+        for element in chain(roots, self.elements):
+            if isinstance(element, ObjectMeta):
+                found.setdefault(id(element), element)
+        self.object_classes: List[ObjectMeta] = list(found.values())
+        """Each object class, with object class roots first, and then in
+        the order they are found.
+        """
+        self.element_types: Set[type] = {
+            type(element) for element in self.elements
+        }
+        """The type of each reachable element."""
+
+    def children(self, element: Element) -> List[Element]:
+        """Get the immediate children of an element in the graph."""
+        return self._children[id(element)]
+
+    def dependencies(self, object_class: ObjectMeta) -> List[ObjectMeta]:
+        """Get the object classes an object class directly depends on.
+
+        These are the nearest object classes among its sub-elements, as
+        any further object classes are dependencies of those.
+        """
+        key = id(object_class)
+        if key not in self._dependencies:
+            self._index_dependencies()
+        return self._dependencies[key]
+
+    def dependents(self, object_class: ObjectMeta) -> List[ObjectMeta]:
+        """Get the object classes which directly depend on an object class."""
+        key = id(object_class)
+        if key not in self._dependents:
+            self._index_dependencies()
+        return self._dependents[key]
+
+    def _traverse(self, root: Element):
+        """Visit the elements reachable from a root, in pre-order."""
+        if id(root) in self._children:
+            return
+        self._visit(root)
+        stack = [iter(self._children[id(root)])]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                continue
+            if id(child) in self._children:
+                continue
+            self._visit(child)
+            stack.append(iter(self._children[id(child)]))
+
+    def _visit(self, element: Element):
+        self.elements.append(element)
+        self._children[id(element)] = _immediate_children(element)
+
+    def _index_dependencies(self):
+        """Find the nearest object dependencies of every object class."""
+        for object_class in self.object_classes:
+            self._dependencies[id(object_class)] = []
+            self._dependents[id(object_class)] = []
+        for object_class in self.object_classes:
+            dependencies: Dict[int, ObjectMeta] = {}
+            seen: Set[int] = set()
+            stack = list(self.children(object_class))
+            while stack:
+                element = stack.pop()
+                if isinstance(element, ObjectMeta):
+                    dependencies.setdefault(id(element), element)
+                elif id(element) not in seen:
+                    seen.add(id(element))
+                    stack.extend(self.children(element))
+            self._dependencies[id(object_class)] = list(dependencies.values())
+            for dependency in dependencies.values():
+                self._dependents[id(dependency)].append(object_class)
+
+
+def _immediate_children(element: Any) -> List[Element]:
+    """Get the sub-elements directly referenced by an element."""
+    return [
+        child
+        for path in _CHILD_PATHS
+        for child in _get_path(element, path)
+        if isinstance(child, Element)
+    ]
+
+
+def _get_path(element: Any, path: Sequence[str]) -> List[Any]:
+    """Get items matching a path of segments.
+
+    Uses dictionary lookup for dictionaries with a matching key, and
+    attribute access otherwise. Elements are not subscripted, as this is
+    slow for generic classes. If an item is a list, chain the remaining
+    results for each item. If a path segment is * then get for all values
+    (dictionary only).
+
+    If there is no match on a path, then return nothing at all.
+    """
+    first, rest = path[0], path[1:]
+    next_item: Optional[Any]
+    if first == "*":
+        try:
+            next_item = list(element.values())
+        except AttributeError:
+            return []
+    elif isinstance(element, dict) and first in element:
+        next_item = element[first]
+    else:
+        try:
+            next_item = getattr(element, first)
+        except AttributeError:
+            return []
+    if isinstance(next_item, list):
+        if not rest:
+            return next_item
+        return list(
+            chain.from_iterable(
+                _get_path(next_subitem, rest) for next_subitem in next_item
+            )
+        )
+    if not rest:
+        return [next_item]
+    return _get_path(next_item, rest)
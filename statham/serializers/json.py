@@ -1,6 +1,4 @@
-import inspect
-from functools import partial
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from statham.schema.elements import (
     Array,
@@ -15,8 +13,10 @@ from statham.schema.elements import (
     String,
 )
 from statham.schema.elements.meta import ObjectMeta
+from statham.schema.fingerprint import fingerprint
+from statham.schema.helpers import keyword_table
 from statham.schema.property import _Property
-from statham.serializers.orderer import get_object_classes
+from statham.serializers.graph import ElementGraph
 
 
 def serialize_json(
@@ -27,6 +27,9 @@ def serialize_json(
     Object classes are included in definitions. The first element is
     the top-level schema.
 
+    Each element is serialized once, so sub-elements which are shared
+    between elements also share their serialized dictionaries.
+
     :param elements: The :class:`~statham.schema.elements.Element` objects
         to serialize.
     :param definitions: A dictionary of elements which should be members
@@ -35,21 +38,22 @@ def serialize_json(
         for the provided element(s).
     """
     primary = elements[0]
-    object_classes = get_object_classes(*elements)
-    serialize = partial(
-        _serialize_element, object_refs=True, definitions=definitions
-    )
+    object_classes = ElementGraph(*elements).object_classes
+    serializer = _Serializer(object_refs=True, definitions=definitions)
     schema: Dict[str, Any] = {
-        **serialize(primary),
+        **serializer.element(primary),
         "definitions": {
-            object_class.__name__: serialize(object_class)
+            object_class.__name__: serializer.element(object_class)
             for object_class in object_classes
             if object_class is not primary
         },
     }
     if definitions:
         schema["definitions"].update(
-            {key: serialize(element) for key, element in definitions.items()}
+            {
+                key: serializer.element(element)
+                for key, element in definitions.items()
+            }
         )
     if not schema["definitions"]:
         del schema["definitions"]
@@ -65,35 +69,9 @@ def _serialize_element(
 
     This does the heavy lifting behind `serialize_json`.
     """
-    if isinstance(element, Nothing):
-        return False
-    schema = {
-        param.name: getattr(element, param.name, param.default)
-        for param in inspect.signature(Element.__init__).parameters.values()
-        if param.kind == param.KEYWORD_ONLY
-        and getattr(element, param.name, param.default) != param.default
-    }
-    if not schema.get("properties", True):
-        del schema["properties"]
-    if "properties" in schema:
-        schema["required"] = [
-            prop.source or name
-            for name, prop in schema["properties"].items()
-            if prop.required
-        ]
-    if not schema.get("required", True):
-        del schema["required"]
-    if isinstance(element, CompositionElement):
-        schema[element.mode] = element.elements
-    if isinstance(element, Not):
-        schema["not"] = element.element
-    if type(element) in _TYPE_MAPPING:  # pylint: disable=unidiomatic-typecheck
-        schema["type"] = _TYPE_MAPPING[type(element)]
-    if isinstance(element, ObjectMeta):
-        schema["title"] = element.__name__
-    return _serialize_recursive(
-        schema, object_refs=object_refs, definitions=definitions
-    )
+    return _Serializer(
+        object_refs=object_refs, definitions=definitions
+    ).element(element)
 
 
 _TYPE_MAPPING = {
@@ -107,45 +85,90 @@ _TYPE_MAPPING = {
 }
 
 
-def _serialize_recursive(
-    data: Any, object_refs: bool = False, definitions: Dict[str, Element] = None
-) -> Any:
-    """Recursively serialize schema elements."""
-    recur = partial(
-        _serialize_recursive, object_refs=object_refs, definitions=definitions
-    )
-    if isinstance(data, _Property):
-        data = data.element
-    if isinstance(data, ObjectMeta) and object_refs:
-        return {"$ref": f"#/definitions/{data.__name__}"}
-    if isinstance(data, Element):
-        return _from_definitions(
-            definitions,
-            data,
-            _serialize_element(
-                data, object_refs=object_refs, definitions=definitions
-            ),
-        )
-    if not isinstance(data, (list, dict)):
-        return data
-    if isinstance(data, list):
-        return [recur(item) for item in data]
-    return {key: recur(value) for key, value in data.items()}
+class _Serializer:
+    """State for serializing elements to JSON Schema.
 
+    Sub-elements are serialized once each, by identity. Definitions are
+    indexed by fingerprint, so that finding the definition matching an
+    element only compares it to definitions with the same fingerprint.
+    """
 
-def _from_definitions(
-    definitions: Optional[Dict[str, Element]],
-    element: Element,
-    default: Any = None,
-):
-    """Check if this element is present in definitions."""
-    if not definitions:
-        return default
-    return next(
-        (
-            {"$ref": f"#/definitions/{key}"}
-            for key, definition in definitions.items()
-            if definition == element
-        ),
-        default,
-    )
+    def __init__(
+        self,
+        object_refs: bool = False,
+        definitions: Optional[Dict[str, Element]] = None,
+    ):
+        self.object_refs = object_refs
+        self.definitions: Dict[str, List[Tuple[str, Element]]] = {}
+        for key, definition in (definitions or {}).items():
+            self.definitions.setdefault(fingerprint(definition), []).append(
+                (key, definition)
+            )
+        self.serialized: Dict[int, Any] = {}
+        self.definition_keys: Dict[int, Optional[str]] = {}
+
+    def element(self, element: Element) -> Any:
+        """Convert a schema element to a JSON Schema dictionary."""
+        if isinstance(element, Nothing):
+            return False
+        schema = {
+            param.name: getattr(element, param.name, param.default)
+            for param in keyword_table(Element).keyword_only
+            if getattr(element, param.name, param.default) != param.default
+        }
+        if not schema.get("properties", True):
+            del schema["properties"]
+        if "properties" in schema:
+            schema["required"] = [
+                prop.source or name
+                for name, prop in schema["properties"].items()
+                if prop.required
+            ]
+        if not schema.get("required", True):
+            del schema["required"]
+        if isinstance(element, CompositionElement):
+            schema[element.mode] = element.elements
+        if isinstance(element, Not):
+            schema["not"] = element.element
+        # pylint: disable=unidiomatic-typecheck
+        if type(element) in _TYPE_MAPPING:
+            schema["type"] = _TYPE_MAPPING[type(element)]
+        if isinstance(element, ObjectMeta):
+            schema["title"] = element.__name__
+        return self.recursive(schema)
+
+    def recursive(self, data: Any) -> Any:
+        """Recursively serialize schema elements."""
+        if isinstance(data, _Property):
+            data = data.element
+        if isinstance(data, ObjectMeta) and self.object_refs:
+            return {"$ref": f"#/definitions/{data.__name__}"}
+        if isinstance(data, Element):
+            key = self.definition_key(data)
+            if key is not None:
+                return {"$ref": f"#/definitions/{key}"}
+            if id(data) not in self.serialized:
+                self.serialized[id(data)] = self.element(data)
+            return self.serialized[id(data)]
+        if not isinstance(data, (list, dict)):
+            return data
+        if isinstance(data, list):
+            return [self.recursive(item) for item in data]
+        return {key: self.recursive(value) for key, value in data.items()}
+
+    def definition_key(self, element: Element) -> Optional[str]:
+        """Get the key of the first definition equal to an element."""
+        if not self.definitions:
+            return None
+        if id(element) not in self.definition_keys:
+            self.definition_keys[id(element)] = next(
+                (
+                    key
+                    for key, definition in self.definitions.get(
+                        fingerprint(element), []
+                    )
+                    if definition is element or definition == element
+                ),
+                None,
+            )
+        return self.definition_keys[id(element)]
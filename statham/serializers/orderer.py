@@ -1,148 +1,135 @@
 """Iteration tools for Element trees."""
-from itertools import chain
-from typing import Any, Dict, Iterator, List, Set
+import heapq
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from statham.schema.elements import Element
 from statham.schema.elements.meta import ObjectMeta
 from statham.schema.exceptions import SchemaParseError
+from statham.serializers.graph import _immediate_children, ElementGraph
 
 
 # TODO: Generate non-object elements.
 
 
-def orderer(*elements: Element) -> Iterator[ObjectMeta]:
+def orderer(
+    *elements: Element,
+    graph: Optional[ElementGraph] = None,
+    forward: bool = False,
+) -> Iterator[ObjectMeta]:
     """Iterate object classes in declaration order.
 
     Inspects the full DAG of elements and orders in such a way that
     each object class' dependencies are returned before it is.
 
-    Accepts multiple elements, in case there are multiple start points of
-    the DAG.
-
     Assumes each object class in the tree has a unique name.
+
+    Classes are topologically sorted using Kahn's algorithm. Where more
+    than one class is ready to be declared, the class found first when
+    traversing the elements is declared first.
+
+    :param elements: The elements from which to find object classes.
+        Accepts multiple elements, in case there are multiple start points
+        of the DAG.
+    :param graph: An :class:`~statham.serializers.graph.ElementGraph` of
+        the elements, if one has already been built.
+    :param forward: If :const:`True`, order classes which depend on each
+        other, or on themselves, rather than failing. Where no class is
+        ready, the class found first is declared, so it refers forward to
+        classes declared after it.
+    :raises SchemaParseError: if classes depend on each other, and
+        ``forward`` is false.
     """
-    object_classes: List[ObjectMeta] = get_object_classes(*elements)
-    object_dependencies: Dict[str, List[str]] = {
-        object_class.__name__: [
-            dep.__name__
-            for dep in get_children(object_class)
-            if isinstance(dep, ObjectMeta)
-        ]
-        for object_class in object_classes
-    }
-
-    def has_cycle(name):
-        return name in object_dependencies[name]
-
-    def from_name(name: str) -> ObjectMeta:
-        """Get the object class from the name."""
-        return next(filter(lambda oc: oc.__name__ == name, object_classes))
-
-    def pop_name(name: str) -> ObjectMeta:
-        """Remove a object class from each sub-tree, and return it."""
-        object_dependencies.update(
-            {
-                name_: [dep for dep in deps if dep != name]
-                for name_, deps in object_dependencies.items()
-            }
-        )
-        del object_dependencies[name]
-        return from_name(name)
-
-    cycles: List[str] = sorted(
-        name for name in object_dependencies if has_cycle(name)
-    )
-    if cycles:
-        raise SchemaParseError.unresolvable_declaration()
-
-    def _next() -> ObjectMeta:
-        next_name = next(
-            map(
-                lambda _: _[0],
-                filter(lambda _: not _[1], object_dependencies.items()),
-            )
-        )
-        return pop_name(next_name)
-
-    try:
-        while True:
-            yield _next()
-    except StopIteration:
-        assert not object_dependencies.values()
-        return
+    graph = graph or ElementGraph(*elements)
+    classes: Dict[str, ObjectMeta] = {}
+    for object_class in graph.object_classes:
+        classes.setdefault(object_class.__name__, object_class)
+    yield from _sort(classes, graph, forward)
+
+
+def _sort(
+    classes: Dict[str, ObjectMeta], graph: ElementGraph, forward: bool
+) -> List[ObjectMeta]:
+    """Topologically sort object classes by name, see :func:`orderer`."""
+    names = list(classes)
+    position = {name: idx for idx, name in enumerate(names)}
+    dependents, remaining = _dependents(classes, graph)
+    ready = [position[name] for name in names if not remaining[name]]
+    heapq.heapify(ready)
+    ordered: Dict[str, ObjectMeta] = {}
+    candidates = iter(names)
+    while len(ordered) < len(names):
+        if not ready:
+            if not forward:
+                raise SchemaParseError.unresolvable_declaration()
+            # Break the cycle at the first class which remains. Classes
+            # passed over are already declared, so are not revisited.
+            first = next(name for name in candidates if name not in ordered)
+            heapq.heappush(ready, position[first])
+        name = names[heapq.heappop(ready)]
+        if name in ordered:
+            # Declared to break a cycle before it was ready.
+            continue
+        ordered[name] = classes[name]
+        for dependent in dependents[name]:
+            remaining[dependent] -= 1
+            if not remaining[dependent]:
+                heapq.heappush(ready, position[dependent])
+    return list(ordered.values())
+
+
+def _dependents(
+    classes: Dict[str, ObjectMeta], graph: ElementGraph
+) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+    """Index the names of the classes which depend on each class, and the
+    number of classes each class depends on.
+    """
+    dependents: Dict[str, List[str]] = {name: [] for name in classes}
+    remaining: Dict[str, int] = {}
+    for name, object_class in classes.items():
+        dependencies = {
+            dependency.__name__
+            for dependency in graph.dependencies(object_class)
+        }
+        remaining[name] = len(dependencies)
+        for dependency in dependencies:
+            dependents[dependency].append(name)
+    return dependents, remaining
 
 
 def get_object_classes(*elements: Element) -> List[ObjectMeta]:
-    return [
-        element
-        for element in list(elements)
-        + [child for element in elements for child in get_children(element)]
-        if isinstance(element, ObjectMeta)
-    ]
+    """Get each object class in the trees of the given elements.
+
+    Object classes are returned once each, with the given elements first,
+    and then in the order they are found. Sub-trees shared between the
+    given elements are only traversed once.
+    """
+    return ElementGraph(*elements).object_classes
+
 
+def get_children(
+    element: Any, seen: Optional[Set[int]] = None
+) -> Iterator[Element]:
+    """Iterate all child elements of an element.
 
-def get_children(element: Any, seen: Set[int] = None) -> Iterator[Element]:
-    """Iterate all child elements of an element."""
-    seen = seen or set()
+    Children are iterated depth-first, each followed by its own children.
+    Elements which have already been seen are yielded again, but their
+    children are not. The traversal is iterative, so deeply nested
+    elements do not exceed the recursion limit.
+    """
+    seen = set() if seen is None else seen
     if id(element) in seen:
         yield element
         return
     seen.add(id(element))
-    paths = [  # Possible paths to immediate children.
-        "items",
-        "additionalItems",
-        "contains",
-        "properties.*.element",
-        "additionalProperties",
-        "patternProperties.*",
-        "propertyNames",
-        "dependencies.*",
-        "elements",
-        "element",
-    ]
-    children = [
-        child
-        for path in paths
-        for child in _get_path(element, path)
-        if isinstance(child, Element)
-    ]
-    for child in children:
+    stack = [iter(_immediate_children(element))]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            continue
         yield child
-        yield from get_children(child, seen)
-
-
-def _get_path(element, path):
-    """Get items matching a dot-separated path.
-
-    Assumes dictionary lookup, but falls back to attribute access. If an
-    item is a list, chain the remaining results for each item. If a path
-    segment is * then get for all values (dictionary only).
-
-    If there is no match on a path, then return nothing at all.
-    """
-    first, *rest = path.split(".")
-    if first == "*":
-        try:
-            next_item = list(element.values())
-        except AttributeError:
-            return []
-    else:
-        try:
-            next_item = element[first]
-        except (KeyError, TypeError):
-            try:
-                next_item = getattr(element, first)
-            except AttributeError:
-                return []
-    if isinstance(next_item, list):
-        if not rest:
-            return next_item
-        return list(
-            chain.from_iterable(
-                _get_path(next_subitem, ".".join(rest))
-                for next_subitem in next_item
-            )
-        )
-    if not rest:
-        return [next_item]
-    return _get_path(next_item, ".".join(rest))
+        if id(child) in seen:
+            yield child
+            continue
+        seen.add(id(child))
+        stack.append(iter(_immediate_children(child)))
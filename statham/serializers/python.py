@@ -1,42 +1,421 @@
-from typing import Set, Type, Union
+import keyword
+import re
+from typing import cast, Dict, Iterable, List, Optional, Set
 
 from statham.schema.elements import Element, Object
 from statham.schema.elements.meta import ObjectMeta
-from statham.serializers.orderer import orderer, get_children
+from statham.schema.property import _Property
+from statham.serializers.compiler import compile_model, CompiledModel
+from statham.serializers.graph import ElementGraph
+from statham.serializers.orderer import orderer
 
 
-def serialize_python(*elements: Element) -> str:
+def serialize_python(*elements: Element, compiled: bool = False) -> str:
     """Serialize schema elements to python declaration string.
 
     Captures declaration of the first Object elements, and any subsequent
     elements this depends on. Module imports and declaration order are
     dynamically inferred.
 
+    Object classes which depend on each other, or on themselves, are
+    declared with forward references: properties and class arguments
+    which refer to classes declared later are annotated as strings, and
+    assigned once every class is declared.
+
     :param elements: The :class:`~statham.schema.elements.Element` objects
         to serialize.
+    :param compiled: If :const:`True`, also declare a compiled function
+        for each model, with which its instances are validated and
+        constructed. See :mod:`statham.schema.compiled`.
     :return: Python module contents as a string, declaring the element tree.
     """
+    graph = ElementGraph(*elements)
+    object_models = list(orderer(*elements, graph=graph, forward=True))
+    forward = _forward_references(object_models, graph)
     declarations = "\n\n".join(
-        [object_model.python() for object_model in orderer(*elements)]
+        [
+            object_model.python(forward[id(object_model)])
+            for object_model in object_models
+        ]
+        + _bindings(object_models, forward)
     )
-    imports = _get_imports(declarations, *elements)
+    functions = _compile(object_models) if compiled else []
+    imports = _get_imports(
+        declarations, graph.element_types, _compiled_imports(functions)
+    )
+    if functions:
+        declarations = "\n\n".join(
+            [declarations] + [function.source for function in functions]
+        )
     return "\n\n\n".join(block for block in [imports, declarations] if block)
 
 
-def _get_imports(declarations: str, *elements: Element) -> str:
-    """Get import statements required by the elements."""
+def serialize_python_package(
+    *elements: Element, compiled: bool = False
+) -> Dict[str, str]:
+    """Serialize schema elements to the modules of a python package.
+
+    Each object class is declared in its own module, which imports the
+    modules declaring its dependencies. Object classes which depend on each
+    other, directly or through other classes, are declared together in one
+    module, with forward references as :func:`serialize_python`, so that
+    modules never import each other. The package ``__init__`` module
+    exposes each class by name, but only imports its module when the class
+    is first accessed (see :pep:`562`). A process importing the package
+    therefore only builds the classes it uses, and their dependencies.
+
+    Importing the generated package requires Python 3.7 or later.
+
+    :param elements: The :class:`~statham.schema.elements.Element` objects
+        to serialize.
+    :param compiled: If :const:`True`, also declare a compiled function
+        for each model, as :func:`serialize_python`.
+    :return: The contents of each module of the package, keyed by file
+        name, starting with ``"__init__.py"``.
+    """
+    graph = ElementGraph(*elements)
+    object_classes = list(orderer(*elements, graph=graph, forward=True))
+    class_modules = _module_names(
+        [object_class.__name__ for object_class in object_classes]
+    )
+    groups = _groups(object_classes, graph)
+    module_names = {
+        object_class.__name__: class_modules[group[0].__name__]
+        for group in groups
+        for object_class in group
+    }
+    modules = {"__init__.py": _package_init(module_names)}
+    for group in groups:
+        modules[f"{module_names[group[0].__name__]}.py"] = _package_module(
+            group, graph, module_names, compiled
+        )
+    return modules
+
+
+def _package_module(
+    group: List[ObjectMeta],
+    graph: ElementGraph,
+    module_names: Dict[str, str],
+    compiled: bool,
+) -> str:
+    """Declare a group of object classes in a module of a package.
+
+    Classes outside the group are imported from the modules declaring them.
+    """
+    names = {object_class.__name__ for object_class in group}
+    forward = _forward_references(
+        group,
+        graph,
+        {
+            id(object_class)
+            for object_class in graph.object_classes
+            if object_class.__name__ not in names
+        },
+    )
+    declaration = "\n\n".join(
+        [
+            object_class.python(forward[id(object_class)])
+            for object_class in group
+        ]
+        + _bindings(group, forward)
+    )
+    functions = _compile(group) if compiled else []
+    imported: Dict[str, Set[str]] = {}
+    for object_class in group:
+        for dependency in graph.dependencies(object_class):
+            if dependency.__name__ not in names:
+                imported.setdefault(
+                    module_names[dependency.__name__], set()
+                ).add(dependency.__name__)
     imports = [
-        _get_standard_imports(declarations),
-        _get_statham_imports(declarations, *elements),
+        _get_imports(
+            declaration,
+            set().union(
+                *(_element_types(object_class, graph) for object_class in group)
+            ),
+            _compiled_imports(functions),
+        ),
+        "\n".join(
+            f"from .{module_name} import "
+            f"{', '.join(sorted(imported[module_name]))}"
+            for module_name in sorted(imported)
+        ),
+    ]
+    return "\n\n\n".join(
+        [
+            "\n\n".join(block for block in imports if block),
+            "\n\n".join(
+                [declaration] + [function.source for function in functions]
+            ),
+        ]
+    )
+
+
+def _groups(
+    object_classes: List[ObjectMeta], graph: ElementGraph
+) -> List[List[ObjectMeta]]:
+    """Group object classes which depend on each other.
+
+    Groups are the strongly connected components of the dependency graph,
+    found with Tarjan's algorithm. Each group follows the groups it depends
+    on, and keeps the declaration order of its classes.
+
+    :param object_classes: Object classes in declaration order, as from
+        :func:`~statham.serializers.orderer.orderer`.
+    """
+    # pylint: disable=too-many-locals
+    classes = {
+        object_class.__name__: object_class for object_class in object_classes
+    }
+    position = {name: idx for idx, name in enumerate(classes)}
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    groups: List[List[ObjectMeta]] = []
+    for root in classes:
+        if root in index:
+            continue
+        work = [(root, iter(graph.dependencies(classes[root])))]
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            name, dependencies = work[-1]
+            dependency = next(dependencies, None)
+            if dependency is not None:
+                child = dependency.__name__
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append(
+                        (child, iter(graph.dependencies(classes[child])))
+                    )
+                elif child in on_stack:
+                    lowlink[name] = min(lowlink[name], index[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[name])
+            if lowlink[name] != index[name]:
+                continue
+            members: List[str] = []
+            while not members or members[-1] != name:
+                members.append(stack.pop())
+                on_stack.discard(members[-1])
+            groups.append(
+                [
+                    classes[member]
+                    for member in sorted(members, key=position.__getitem__)
+                ]
+            )
+    return groups
+
+
+_FORWARD_KEYWORDS = (
+    "additionalProperties",
+    "patternProperties",
+    "propertyNames",
+    "dependencies",
+)
+"""Class arguments of object classes which may refer to other classes."""
+
+
+def _forward_references(
+    object_classes: List[ObjectMeta],
+    graph: ElementGraph,
+    imported: Optional[Set[int]] = None,
+) -> Dict[int, Set[str]]:
+    """Find the properties and class arguments of each object class which
+    refer to classes declared after it, or to itself.
+
+    :param imported: The ids of object classes which are imported, rather
+        than declared with these classes.
+    :return: The names of these, keyed by the id of each object class.
+    """
+    declared: Set[int] = set(imported or ())
+    forward: Dict[int, Set[str]] = {}
+    for object_class in object_classes:
+        attributes: Dict[str, List[Element]] = {
+            name: [prop.element]
+            for name, prop in cast(
+                Dict[str, _Property], object_class.properties or {}
+            ).items()
+        }
+        for keyword_name in _FORWARD_KEYWORDS:
+            value = getattr(object_class, keyword_name, None)
+            values = value.values() if isinstance(value, dict) else [value]
+            attributes.setdefault(keyword_name, []).extend(
+                sub for sub in values if isinstance(sub, Element)
+            )
+        forward[id(object_class)] = {
+            name
+            for name, sub_elements in attributes.items()
+            if not _declared(sub_elements, declared, graph)
+        }
+        declared.add(id(object_class))
+    return forward
+
+
+def _declared(
+    elements: List[Element], declared: Set[int], graph: ElementGraph
+) -> bool:
+    """Check whether the nearest object classes of elements are declared."""
+    seen: Set[int] = set()
+    stack = list(elements)
+    while stack:
+        element = stack.pop()
+        if isinstance(element, ObjectMeta):
+            if id(element) not in declared:
+                return False
+        elif id(element) not in seen:
+            seen.add(id(element))
+            stack.extend(graph.children(element))
+    return True
+
+
+def _bindings(
+    object_classes: List[ObjectMeta], forward: Dict[int, Set[str]]
+) -> List[str]:
+    """Assign the forward references of object classes."""
+    bindings = []
+    for object_class in object_classes:
+        names = forward[id(object_class)]
+        class_name = object_class.__name__
+        for name, prop in cast(
+            Dict[str, _Property], object_class.properties or {}
+        ).items():
+            if name in names:
+                bindings.append(
+                    f"{class_name}.properties[{name!r}] = {prop!r}\n"
+                )
+        bindings.extend(
+            f"{class_name}.{keyword_name} = "
+            f"{getattr(object_class, keyword_name)!r}\n"
+            for keyword_name in _FORWARD_KEYWORDS
+            if keyword_name in names
+        )
+    return ["".join(bindings)] if bindings else []
+
+
+def _compile(object_classes: Iterable[ObjectMeta]) -> List[CompiledModel]:
+    """Compile each object class which may be compiled."""
+    functions = map(compile_model, object_classes)
+    return [function for function in functions if function]
+
+
+def _compiled_imports(functions: List[CompiledModel]) -> Dict[str, Set[str]]:
+    """Get the names imported by compiled functions from each module."""
+    imports: Dict[str, Set[str]] = {}
+    for function in functions:
+        for module, names in function.imports.items():
+            imports.setdefault(module, set()).update(names)
+    return imports
+
+
+def _element_types(object_class: ObjectMeta, graph: ElementGraph) -> Set[type]:
+    """Get the types of elements declared with an object class.
+
+    These are the object class itself and its sub-elements, up to the
+    nearest object classes, which are declared in their own modules.
+    """
+    types: Set[type] = {type(object_class)}
+    seen = {id(object_class)}
+    stack = list(graph.children(object_class))
+    while stack:
+        element = stack.pop()
+        if isinstance(element, ObjectMeta) or id(element) in seen:
+            continue
+        seen.add(id(element))
+        types.add(type(element))
+        stack.extend(graph.children(element))
+    return types
+
+
+def _module_names(class_names: List[str]) -> Dict[str, str]:
+    """Choose a distinct module name for each class.
+
+    Class names are converted to snake case. Module names are distinct
+    regardless of case, so that packages may be written to case-insensitive
+    file systems, and never equal a class name or a keyword.
+    """
+    reserved = set(class_names)
+    used: Set[str] = set()
+    module_names = {}
+    for class_name in class_names:
+        name = re.sub(
+            "(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", "_", class_name
+        ).lower()
+        while name in used or name in reserved or keyword.iskeyword(name):
+            name += "_"
+        used.add(name)
+        module_names[class_name] = name
+    return module_names
+
+
+# Names are imported privately, so that they never shadow a model.
+_PACKAGE_INIT = '''"""Generated models, each imported when it is first used."""
+from importlib import import_module as _import_module
+
+
+_MODULES = {modules}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module {{__name__}} has no attribute {{name}}")
+    value = getattr(_import_module(f".{{_MODULES[name]}}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+'''
+
+
+def _package_init(module_names: Dict[str, str]) -> str:
+    """Get the ``__init__`` module of a package, exposing classes lazily."""
+    entries = [
+        f"    {class_name!r}: {module_name!r},\n"
+        for class_name, module_name in sorted(module_names.items())
+    ]
+    modules = "{\n" + "".join(entries) + "}" if entries else "{}"
+    return _PACKAGE_INIT.format(modules=modules)
+
+
+def _get_imports(
+    declarations: str,
+    element_types: Set[type],
+    compiled_imports: Dict[str, Set[str]] = None,
+) -> str:
+    """Get import statements required by the elements, and by any compiled
+    functions.
+    """
+    compiled_imports = compiled_imports or {}
+    imports = [
+        _get_standard_imports(declarations, compiled_imports),
+        _get_statham_imports(declarations, element_types, compiled_imports),
     ]
     return "\n\n".join(block for block in imports if block)
 
 
-def _get_standard_imports(declaration: str) -> str:
+def _get_standard_imports(
+    declaration: str, compiled_imports: Dict[str, Set[str]]
+) -> str:
     """Get group if imports from standard library.
 
-    Currently only includes type annotations.
+    Includes type annotations, and modules used by compiled functions.
     """
+    standard_imports = [
+        f"import {module}"
+        for module in sorted(compiled_imports)
+        if not module.startswith("statham.")
+    ]
     type_imports = ", ".join(
         [
             annotation
@@ -44,48 +423,51 @@ def _get_standard_imports(declaration: str) -> str:
             if annotation in declaration
         ]
     )
-    if not type_imports:
-        return ""
-    return f"from typing import {type_imports}"
+    if type_imports:
+        standard_imports.append(f"from typing import {type_imports}")
+    return "\n".join(standard_imports)
 
 
-def _get_statham_imports(declaration: str, *elements: Element) -> str:
+def _get_statham_imports(
+    declaration: str,
+    element_types: Set[type],
+    compiled_imports: Dict[str, Set[str]],
+) -> str:
     """Construct imports from statham submodules."""
-    statham_imports = []
+    statham_imports = {
+        module: f"from {module} import {', '.join(sorted(names))}"
+        for module, names in compiled_imports.items()
+        if module.startswith("statham.")
+    }
     if "Maybe" in declaration:
-        statham_imports.append("from statham.schema.constants import Maybe")
-    element_imports = _get_element_imports(*elements)
+        statham_imports[
+            "statham.schema.constants"
+        ] = "from statham.schema.constants import Maybe"
+    element_imports = _get_element_imports(element_types)
     if element_imports:
-        statham_imports.append(element_imports)
+        statham_imports["statham.schema.elements"] = element_imports
     if "Property" in declaration:
-        statham_imports.append("from statham.schema.property import Property")
-    return "\n".join(statham_imports)
+        statham_imports[
+            "statham.schema.property"
+        ] = "from statham.schema.property import Property"
+    return "\n".join(
+        statham_imports[module] for module in sorted(statham_imports)
+    )
 
 
-def _get_element_imports(*elements: Element) -> str:
+def _get_element_imports(element_types: Set[type]) -> str:
     """Get the import string for the elements in use."""
     prefix = "from statham.schema.elements import "
     max_length = 80
-    import_names = [
-        elem_type.__name__
-        for elem_type in set.union(
-            *(_get_single_element_imports(element) for element in elements)
-        )
-    ]
+    import_names = {
+        Object.__name__
+        if issubclass(elem_type, ObjectMeta)
+        else elem_type.__name__
+        for elem_type in element_types
+    }
     if not import_names:
         return ""
     imports = ", ".join(sorted(import_names))
     if max_length < len(prefix) + len(imports):
         imports = "\n    ".join(["("] + imports.split(" ")) + ",\n)"
     return prefix + imports
-
-
-def _get_single_element_imports(
-    element: Element,
-) -> Set[Union[Type[Element], ObjectMeta]]:
-    """Extract the set of element types used by a given element."""
-    get_type = (
-        lambda elem: Object if isinstance(elem, ObjectMeta) else type(elem)
-    )
-    children = [element, *get_children(element)]
-    return set(map(get_type, children))  # type: ignore
@@ -0,0 +1,150 @@
+"""Regenerate models as schema files change.
+
+Documents are kept in memory between regenerations, and only reloaded once
+their file changes. Changes are detected by polling the modification time
+of each input and each local document recorded in the
+:class:`~statham.batch.DependencyManifest`, and only outputs whose
+documents have changed are regenerated.
+"""
+import os
+from threading import Event
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from json_ref_dict.exceptions import DocumentParseError
+from json_ref_dict.loader import default_get_document, get_document
+
+from statham.batch import (
+    BatchResult,
+    collect_inputs,
+    DependencyManifest,
+    generate_batch,
+    MANIFEST_NAME,
+)
+from statham.cache import local_path
+
+
+class DocumentStore:
+    """Document loader which keeps documents until they are invalidated.
+
+    Register with :data:`json_ref_dict.loader.get_document` to use it when
+    resolving references. Documents are loaded by any other registered
+    loaders, or by the default loader, bypassing its cache.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, object] = {}
+
+    def __call__(self, base_uri: str):
+        if base_uri not in self.documents:
+            self.documents[base_uri] = self._load(base_uri)
+        return self.documents[base_uri]
+
+    def invalidate(self, paths: List[str]):
+        """Forget documents loaded from the given local files."""
+        paths = [os.path.abspath(path) for path in paths]
+        for base_uri in list(self.documents):
+            path = local_path(base_uri)
+            if path is not None and os.path.abspath(path) in paths:
+                del self.documents[base_uri]
+
+    def _load(self, base_uri: str):
+        for loader in get_document:
+            if loader is not self:
+                loaded = loader(base_uri)
+                if loaded is not ...:
+                    return loaded
+        try:
+            return default_get_document.__wrapped__(base_uri)
+        except Exception as exc:
+            raise DocumentParseError(
+                f"Failed to load uri '{base_uri}'."
+            ) from exc
+
+
+# pylint: disable=too-many-arguments
+def watch(
+    input_arg: str,
+    output_dir: str,
+    manifest: bool = False,
+    cache_dir: Optional[str] = None,
+    report: Callable[[List[BatchResult], float], None] = lambda *_: None,
+    interval: float = 0.05,
+    stop: Optional[Event] = None,
+):
+    """Generate models for schemas, and regenerate them when they change.
+
+    Inputs are collected again on each change, so new schema files are
+    picked up.
+
+    :param input_arg: The batch input, as accepted by
+        :func:`~statham.batch.collect_inputs`.
+    :param output_dir: Directory in which to write the generated modules.
+    :param manifest: Whether ``input_arg`` is a manifest file.
+    :param cache_dir: Optional directory for a
+        :class:`~statham.cache.SchemaCache`.
+    :param report: Called with the results and duration of each
+        generation.
+    :param interval: Seconds to wait between checks for changes.
+    :param stop: Optional event which stops watching when set. Otherwise,
+        this runs until interrupted.
+    """
+    stop = stop or Event()
+    store = DocumentStore()
+    get_document.register(store)
+    try:
+        changed: List[str] = []
+        while not stop.is_set():
+            store.invalidate(changed)
+            before = _snapshot(input_arg, output_dir, manifest)
+            start = perf_counter()
+            results = generate_batch(
+                collect_inputs(input_arg, manifest=manifest),
+                output_dir,
+                jobs=1,
+                cache_dir=cache_dir,
+                incremental=True,
+            )
+            report(results, perf_counter() - start)
+            # Files changed during generation should still be detected.
+            snapshot = {
+                path: before.get(path, stat)
+                for path, stat in _snapshot(
+                    input_arg, output_dir, manifest
+                ).items()
+            }
+            changed = []
+            while not changed and not stop.wait(interval):
+                current = _snapshot(input_arg, output_dir, manifest)
+                changed = [
+                    path
+                    for path in set(snapshot) | set(current)
+                    if snapshot.get(path) != current.get(path)
+                ]
+    except KeyboardInterrupt:
+        pass
+    finally:
+        get_document.unregister(store)
+
+
+def _snapshot(
+    input_arg: str, output_dir: str, manifest: bool
+) -> Dict[str, Tuple[int, int]]:
+    """Get the modification time and size of each watched file."""
+    paths = set(collect_inputs(input_arg, manifest=manifest))
+    if manifest:
+        paths.add(input_arg)
+    entries = DependencyManifest(os.path.join(output_dir, MANIFEST_NAME))
+    for dependencies in entries.entries.values():
+        for document in dependencies.documents:
+            path = local_path(document)
+            if path is not None:
+                paths.add(path)
+    snapshot = {}
+    for path in {path.split("#")[0] for path in paths}:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
@@ -396,6 +396,15 @@ class TestRequired:
         with no_raise():
             _ = self.MyObject({"value": 1})
 
+    def test_required_properties_do_not_modify_keyword(self):
+        class MyObject(Object, required=["value"]):
+            other = Property(String(), required=True)
+
+        for _ in range(2):
+            with pytest.raises(ValidationError):
+                _ = MyObject({})
+        assert MyObject.required == ["value"]
+
 
 def test_object_classes_accept_custom_attributes():
     with no_raise():
@@ -520,3 +529,19 @@ class TestObjectDescription:
             """My docstring."""
 
         assert MyObject.description == "My description"
+
+
+def test_model_hash_follows_changes_to_properties():
+    class Changing(Object):
+        value = Property(String())
+
+    _ = hash(Changing)
+    Changing.properties["other"] = Property(Integer())
+
+    class Changed(Object):
+        value = Property(String())
+        other = Property(Integer())
+
+    Changed.__name__ = "Changing"
+    assert Changing == Changed
+    assert hash(Changing) == hash(Changed)
@@ -0,0 +1,124 @@
+from concurrent.futures import ProcessPoolExecutor
+import gc
+import pickle
+
+import pytest
+
+from statham.schema.elements import Array, meta, Object, String
+from statham.schema.exceptions import ValidationError
+from statham.schema.parser import parse_element
+from statham.schema.property import Property
+
+
+class ImportableModel(Object):
+
+    value = Property(String(), required=True)
+
+
+SCHEMA = {
+    "type": "object",
+    "title": "Parent",
+    "required": ["name"],
+    "properties": {
+        "name": {"type": "string"},
+        "class": {"type": "string"},
+        "child": {
+            "type": "object",
+            "title": "Child",
+            "properties": {"value": {"type": "integer"}},
+        },
+        "other": {},
+    },
+}
+
+
+@pytest.fixture()
+def model():
+    return parse_element(SCHEMA)
+
+
+@pytest.fixture()
+def fresh_registry(monkeypatch):
+    """Simulate unpickling in a process which has never seen the model."""
+
+    def _clear():
+        for name in ("_PICKLED_MODELS", "_REBUILT_MODELS"):
+            monkeypatch.setattr(meta, name, type(getattr(meta, name))())
+
+    return _clear
+
+
+def test_importable_model_is_pickled_by_reference():
+    assert pickle.loads(pickle.dumps(ImportableModel)) is ImportableModel
+    assert b"_rebuild_model" not in pickle.dumps(ImportableModel)
+
+
+def test_parsed_model_round_trips_to_same_class(model):
+    assert pickle.loads(pickle.dumps(model)) is model
+
+
+def test_parsed_model_is_rebuilt_once(model, fresh_registry):
+    payload = pickle.dumps(model)
+    fresh_registry()
+    rebuilt = pickle.loads(payload)
+    assert rebuilt is not model
+    assert rebuilt == model
+    assert rebuilt.__name__ == "Parent"
+    assert pickle.loads(payload) is rebuilt
+
+
+def test_rebuilt_model_is_collected_when_unused(model, fresh_registry):
+    payload = pickle.dumps(model)
+    fresh_registry()
+    rebuilt = pickle.loads(payload)
+    assert rebuilt in meta._REBUILT_MODELS.values()
+    del rebuilt
+    gc.collect()
+    assert not meta._REBUILT_MODELS
+
+
+def test_rebuilt_model_validates_like_original(model, fresh_registry):
+    payload = pickle.dumps(model)
+    fresh_registry()
+    rebuilt = pickle.loads(payload)
+    instance = rebuilt({"name": "foo", "class": "bar", "child": {"value": 1}})
+    assert instance.class_ == "bar"
+    assert instance.child.value == 1
+    with pytest.raises(ValidationError):
+        _ = rebuilt({"class": "bar"})
+
+
+def test_instances_round_trip(model):
+    instance = model({"name": "foo", "child": {"value": 1}, "other": {"a": 1}})
+    loaded = pickle.loads(pickle.dumps(instance))
+    assert loaded == instance
+    assert loaded.child.value == 1
+    assert loaded.other.a == 1
+
+
+def test_instances_are_not_revalidated(model, monkeypatch):
+    instance = model({"name": "foo"})
+    payload = pickle.dumps(instance)
+    monkeypatch.setattr(type(model), "validators", property(lambda _: 1 / 0))
+    assert pickle.loads(payload) == instance
+
+
+def _get_name(instance):
+    return instance.name
+
+
+def test_instances_can_be_sent_to_worker_processes(model):
+    instances = [model({"name": str(idx)}) for idx in range(3)]
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert list(executor.map(_get_name, instances)) == ["0", "1", "2"]
+
+
+def test_recursive_models_can_be_pickled(fresh_registry):
+    node = Object.inline("Node", properties={"value": Property(String())})
+    node.properties["children"] = Property(Array(node))
+    payload = pickle.dumps(node)
+    fresh_registry()
+    rebuilt = pickle.loads(payload)
+    assert rebuilt.properties["children"].element.items is rebuilt
+    instance = rebuilt({"value": "a", "children": [{"value": "b"}]})
+    assert instance.children[0].value == "b"
@@ -0,0 +1,87 @@
+import json
+
+from json_ref_dict import RefDict
+import pytest
+
+from statham.schema.exceptions import (
+    FeatureNotImplementedError,
+    SchemaParseError,
+)
+from statham.schema.parser import Definitions, parse
+from statham.serializers import serialize_python
+
+
+SCHEMA = {
+    "type": "object",
+    "title": "Root",
+    "definitions": {
+        "poll": {
+            "type": "object",
+            "title": "Poll",
+            "properties": {"choice": {"$ref": "#/definitions/choice"}},
+        },
+        "choice": {
+            "type": "object",
+            "title": "Choice",
+            "properties": {"text": {"type": "string"}},
+        },
+        "unused": {"type": "object", "title": "Unused"},
+        "unsupported": {"if": {}},
+        "malformed": 1,
+    },
+}
+
+
+@pytest.fixture()
+def schema(tmp_path):
+    filepath = tmp_path / "schema.json"
+    filepath.write_text(json.dumps(SCHEMA))
+    return RefDict.from_uri(f"{filepath}#/")
+
+
+def test_definitions_are_parsed_when_requested(schema):
+    definitions = Definitions(schema)
+    poll = definitions["poll"]
+    assert poll.__name__ == "Poll"
+    assert definitions["choice"] is poll.properties["choice"].element
+    assert definitions["poll"] is poll
+    with pytest.raises(FeatureNotImplementedError):
+        _ = definitions["unsupported"]
+
+
+def test_definitions_iterates_names_of_valid_definitions(schema):
+    definitions = Definitions(schema)
+    assert list(definitions) == ["poll", "choice", "unused", "unsupported"]
+    assert len(definitions) == 4
+    assert "malformed" not in definitions
+    assert "missing" not in definitions
+
+
+def test_definitions_root_shares_parsed_definitions(schema):
+    definitions = Definitions(schema)
+    choice = definitions["choice"]
+    assert definitions.root.__name__ == "Root"
+    assert definitions["poll"].properties["choice"].element is choice
+
+
+def test_definitions_of_plain_schemas():
+    shared = {"type": "string"}
+    schema = {"definitions": {"a": shared, "b": {"items": shared}}}
+    definitions = Definitions(schema)
+    assert definitions["b"].items is definitions["a"]
+
+
+def test_parse_selected_definitions(schema):
+    elements = parse(schema, select=["poll"])
+    assert [element.__name__ for element in elements] == ["Poll"]
+    module = serialize_python(*elements)
+    assert "class Choice(Object" in module
+    assert "class Unused" not in module
+    assert "class Root" not in module
+
+
+@pytest.mark.parametrize("name", ["missing", "malformed"])
+def test_parse_missing_selected_definition(schema, name):
+    with pytest.raises(SchemaParseError) as excinfo:
+        _ = parse(schema, select=["poll", name])
+    assert str(excinfo.value) == f"No definition named '{name}' in schema."
@@ -0,0 +1,133 @@
+import json
+from os import listdir, path
+from typing import Any, Dict
+
+from json_ref_dict import materialize, RefDict
+import pytest
+
+from statham.schema.elements import Array, Object
+from statham.schema.exceptions import FeatureNotImplementedError
+from statham.schema.parser import parse, parse_element
+from statham.serializers import serialize_python
+from statham.titles import title_labeller
+
+
+@pytest.fixture()
+def write_schema(tmp_path):
+    def _write(schema):
+        filepath = tmp_path / "schema.json"
+        filepath.write_text(json.dumps(schema))
+        return RefDict.from_uri(f"{filepath}#/")
+
+    return _write
+
+
+SCHEMA_DIRECTORY = "tests/jsonschemas"
+
+
+@pytest.mark.parametrize(
+    "filename",
+    sorted(
+        filename
+        for filename in listdir(SCHEMA_DIRECTORY)
+        if filename.endswith(".json")
+    ),
+)
+def test_parsing_references_matches_materialized_schema(filename):
+    uri = path.join(SCHEMA_DIRECTORY, filename) + "#/"
+    materialized = materialize(
+        RefDict.from_uri(uri), context_labeller=title_labeller()
+    )
+    assert serialize_python(*parse(RefDict.from_uri(uri))) == (
+        serialize_python(*parse(materialized))
+    )
+
+
+def test_referenced_schemas_are_parsed_once(write_schema):
+    schema = write_schema(
+        {
+            "type": "array",
+            "items": [
+                {"$ref": "#/definitions/name"},
+                {"$ref": "#/definitions/name"},
+            ],
+            "definitions": {"name": {"type": "string", "minLength": 1}},
+        }
+    )
+    root, name = parse(schema)
+    assert root.items[0] is name
+    assert root.items[1] is name
+
+
+def test_objects_without_titles_are_named_from_uri(write_schema):
+    schema = write_schema(
+        {
+            "type": "object",
+            "properties": {"value": {"$ref": "#/definitions/other"}},
+            "definitions": {"other": {"type": "object"}},
+        }
+    )
+    root, other = parse(schema)
+    assert root.__name__ == "Schema"
+    assert other.__name__ == "Other"
+    assert root.properties["value"].element is other
+
+
+def test_recursive_models_refer_to_themselves(write_schema):
+    schema = write_schema(
+        {
+            "type": "object",
+            "title": "Node",
+            "properties": {
+                "value": {"type": "integer"},
+                "children": {"type": "array", "items": {"$ref": "#"}},
+            },
+        }
+    )
+    node = parse_element(schema)
+    children = node.properties["children"].element
+    assert isinstance(children, Array)
+    assert children.items is node
+    instance = node({"value": 1, "children": [{"value": 2, "children": []}]})
+    assert isinstance(instance.children[0], Object)
+    assert instance.children[0].value == 2
+
+
+def test_mutually_recursive_models(write_schema):
+    schema = write_schema(
+        {
+            "type": "object",
+            "title": "Parent",
+            "properties": {"child": {"$ref": "#/definitions/child"}},
+            "definitions": {
+                "child": {
+                    "type": "object",
+                    "title": "Child",
+                    "properties": {"parent": {"$ref": "#"}},
+                }
+            },
+        }
+    )
+    parent, child = parse(schema)
+    assert parent.properties["child"].element is child
+    assert child.properties["parent"].element is parent
+    namespace: Dict[str, Any] = {}
+    exec(
+        serialize_python(parent, child), namespace
+    )  # pylint: disable=exec-used
+    instance = namespace["Parent"]({"child": {"parent": {"child": {}}}})
+    assert isinstance(instance.child.parent, namespace["Parent"])
+    assert isinstance(instance.child.parent.child, namespace["Child"])
+
+
+def test_non_model_cycles_fail_fast(write_schema):
+    schema = write_schema(
+        {
+            "definitions": {
+                "value": {"anyOf": [{"$ref": "#/definitions/value"}]}
+            },
+        }
+    )
+    with pytest.raises(FeatureNotImplementedError) as excinfo:
+        _ = parse(schema)
+    assert "#/definitions/value" in str(excinfo.value)
@@ -1,6 +1,8 @@
+from copy import deepcopy
+
 import pytest
 
-from statham.schema.elements import Element, Object
+from statham.schema.elements import Array, Element, Object, String
 from statham.schema.exceptions import FeatureNotImplementedError
 from statham.schema.parser import parse, parse_element
 
@@ -71,3 +73,139 @@ def test_parser_detects_cyclical_references():
     schema["properties"]["value"] = schema
     with pytest.raises(FeatureNotImplementedError):
         _ = parse_element(schema)
+
+
+def _cyclical_property():
+    schema = {"type": "object", "title": "Foo", "properties": {}}
+    schema["properties"]["a/b"] = schema
+    return schema
+
+
+def _cyclical_item():
+    schema = {"type": "array", "items": [{"type": "string"}, {}]}
+    schema["items"][1]["anyOf"] = [schema]
+    return schema
+
+
+def _cyclical_definition():
+    schema = {"definitions": {"foo": {}}}
+    schema["definitions"]["foo"]["not"] = schema["definitions"]["foo"]
+    return schema
+
+
+@pytest.mark.parametrize(
+    "schema,pointer",
+    [
+        (_cyclical_property(), "#/properties/a~1b"),
+        (_cyclical_item(), "#/items/1/anyOf/0"),
+        (_cyclical_definition(), "#/definitions/foo/not"),
+    ],
+)
+def test_parser_reports_pointer_of_cycles(schema, pointer):
+    with pytest.raises(FeatureNotImplementedError) as excinfo:
+        _ = parse(schema)
+    assert str(excinfo.value).endswith(f"Cycle found at: {pointer}")
+
+
+def test_parser_parses_deeply_nested_schemas():
+    schema = {"type": "string"}
+    for _ in range(5000):
+        schema = {"type": "array", "items": schema}
+    element = parse_element(schema)
+    depth = 0
+    while isinstance(element, Array):
+        element = element.items
+        depth += 1
+    assert depth == 5000
+    assert element == String()
+
+
+def test_parser_parses_shared_sub_schemas_once():
+    shared = {"type": "string", "minLength": 1}
+    schema = {
+        "type": "array",
+        "items": [shared, shared],
+        "additionalItems": shared,
+    }
+    parsed = parse_element(schema)
+    assert parsed.items[0] is parsed.items[1]
+    assert parsed.additionalItems is parsed.items[0]
+
+
+def test_parser_does_not_mutate_shared_elements_for_defaults():
+    shared = {"type": "string"}
+    schema = {
+        "type": "array",
+        "items": [shared, {"allOf": [shared], "default": "foo"}],
+    }
+    parsed = parse_element(schema)
+    assert parsed.items[0] == String()
+    assert parsed.items[1] == String(default="foo")
+
+
+def test_parser_dedupes_many_inlined_models():
+    model = {
+        "type": "object",
+        "title": "Foo",
+        "properties": {"value": {"type": "string"}},
+    }
+    schema = {
+        "type": "object",
+        "title": "Root",
+        "properties": {
+            f"value_{idx}": {**model, "properties": {**model["properties"]}}
+            for idx in range(200)
+        },
+    }
+    parsed = parse_element(schema)
+    models = {id(prop.element) for prop in parsed.properties.values()}
+    assert len(models) == 1
+
+
+NESTED_SCHEMA = {
+    "type": "object",
+    "title": "Foo",
+    "required": ["value", "other"],
+    "properties": {
+        "value": {"type": "string", "enum": ["a", "b"]},
+        "items": {
+            "type": "array",
+            "items": {"type": "object", "title": "Bar"},
+            "additionalItems": False,
+        },
+        "choice": {
+            "oneOf": [{"type": "string"}, {"type": "integer"}],
+            "default": {"value": 1},
+        },
+    },
+    "patternProperties": {"^x-": {"type": "string"}},
+    "additionalProperties": {"type": "integer"},
+    "dependencies": {"value": ["other"], "items": {"required": ["value"]}},
+}
+
+
+def test_parser_does_not_mutate_input():
+    schema = deepcopy(NESTED_SCHEMA)
+    _ = parse(schema)
+    assert schema == NESTED_SCHEMA
+
+
+def test_parsing_the_same_schema_twice_is_consistent():
+    schema = deepcopy(NESTED_SCHEMA)
+    assert parse(schema) == parse(schema)
+
+
+def test_parser_shares_literal_values():
+    schema = {"enum": [{"value": 1}, 2], "default": {"value": [1]}}
+    element = parse_element(schema)
+    assert element.enum is schema["enum"]
+    assert element.default is schema["default"]
+
+
+def test_parser_removes_annotations_from_literal_values():
+    shared = {"value": 1}
+    schema = {"enum": [{"value": 2, "_x_autotitle": "Enum"}, shared]}
+    element = parse_element(schema)
+    assert element.enum == [{"value": 2}, {"value": 1}]
+    assert element.enum[1] is shared
+    assert "_x_autotitle" in schema["enum"][0]
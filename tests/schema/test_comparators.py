@@ -47,46 +47,46 @@ InlineBaz = Object.inline(
 )
 
 
-@pytest.mark.parametrize(
-    "left,right",
-    [
-        (String(), String()),
-        (String(minLength=3), String(minLength=3)),
-        (Array(String()), Array(String())),
-        (Array(String(), minItems=3), Array(String(), minItems=3)),
-        (Array(String(minLength=3)), Array(String(minLength=3))),
-        (
-            Array(Element(), contains=String()),
-            Array(Element(), contains=String()),
-        ),
-        (Foo, Bar),
-        (Raz, Maz),
-        (Foo, InlineFoo),
-        (InlineFoo, InlineBar),
-        (Baz, InlineBaz),
-    ],
-)
+EQUIVALENT = [
+    (String(), String()),
+    (String(minLength=3), String(minLength=3)),
+    (Array(String()), Array(String())),
+    (Array(String(), minItems=3), Array(String(), minItems=3)),
+    (Array(String(minLength=3)), Array(String(minLength=3))),
+    (
+        Array(Element(), contains=String()),
+        Array(Element(), contains=String()),
+    ),
+    (Foo, Bar),
+    (Raz, Maz),
+    (Foo, InlineFoo),
+    (InlineFoo, InlineBar),
+    (Baz, InlineBaz),
+]
+
+
+NON_EQUIVALENT = [
+    (String(), String(default="foo")),
+    (Array(String()), Array(String(), minItems=3)),
+    (Array(String()), Array(String(minLength=3))),
+    (Array(Element()), Array(Element(), contains=String())),
+    (Foo, Baz),
+    (Foo, Mux),
+    (Foo, Qux),
+    (Foo, Raz),
+    (Foo, Taz),
+    (Foo, Doo),
+    (Foo, InlineBaz),
+    (InlineFoo, Baz),
+    (InlineFoo, InlineBaz),
+]
+
+
+@pytest.mark.parametrize("left,right", EQUIVALENT)
 def test_equivalent_schemas_are_equal(left, right):
     assert left == right
 
 
-@pytest.mark.parametrize(
-    "left,right",
-    [
-        (String(), String(default="foo")),
-        (Array(String()), Array(String(), minItems=3)),
-        (Array(String()), Array(String(minLength=3))),
-        (Array(Element()), Array(Element(), contains=String())),
-        (Foo, Baz),
-        (Foo, Mux),
-        (Foo, Qux),
-        (Foo, Raz),
-        (Foo, Taz),
-        (Foo, Doo),
-        (Foo, InlineBaz),
-        (InlineFoo, Baz),
-        (InlineFoo, InlineBaz),
-    ],
-)
+@pytest.mark.parametrize("left,right", NON_EQUIVALENT)
 def test_non_equivalent_schemas_are_not_equal(left, right):
     assert left != right
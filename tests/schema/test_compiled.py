@@ -0,0 +1,82 @@
+import pytest
+
+from statham.schema.compiled import additional, compiled, construct
+from statham.schema.constants import NotPassed
+from statham.schema.elements import Array, Object, String
+from statham.schema.engine import validate
+from statham.schema.exceptions import ValidationError
+from statham.schema.property import Property
+
+
+@pytest.fixture()
+def model():
+    class Model(Object, default={"value": "default"}):
+        value = Property(String(), required=True)
+
+    Model.calls = calls = []
+
+    @compiled(Model)
+    def _compiled_model(value):
+        calls.append(value)
+        if not isinstance(value.get("value"), str):
+            raise ValidationError
+        return {"value": "compiled"}
+
+    return Model
+
+
+def test_compiled_function_constructs_instances(model):
+    assert model({"value": "a"}).value == "compiled"
+    assert Array(model)([{"value": "a"}])[0].value == "compiled"
+    assert model.calls == [{"value": "a"}] * 2
+
+
+def test_compiled_function_is_not_used_for_other_values(model):
+    instance = model()
+    assert instance.value == "compiled"
+    assert model(instance) is instance
+    with pytest.raises(ValidationError):
+        _ = model([])
+    assert model.calls == [{"value": "default"}]
+
+
+def test_values_rejected_by_compiled_function_are_validated(model):
+    with pytest.raises(ValidationError) as excinfo:
+        _ = model({"value": 1})
+    assert "Must be of type (str)" in str(excinfo.value)
+    assert model.calls == [{"value": 1}]
+
+
+def test_compiled_function_is_not_used_with_limited_depth(model):
+    assert validate(model, {"value": "a"}, max_depth=1).value == "a"
+    assert not model.calls
+
+
+@pytest.mark.parametrize(
+    "attribute,value",
+    [
+        ("additionalProperties", False),
+        ("properties", {"other": Property(String())}),
+    ],
+)
+def test_compiled_function_is_discarded_when_model_changes(
+    model, attribute, value
+):
+    setattr(model, attribute, value)
+    assert "__compiled__" not in vars(model)
+    _ = model({"value": "a"})
+    assert not model.calls
+
+
+def test_construct(model):
+    prop = Property(model)
+    assert construct(model, {"value": "a"}, prop).value == "compiled"
+    assert construct(model, NotPassed(), prop).value == "compiled"
+    assert model.calls == [{"value": "a"}, {"value": "default"}]
+
+
+def test_additional():
+    value = additional({"a": [{"b": 1}]})
+    assert value == {"a": [{"b": 1}]}
+    assert value.a[0].b == 1
+    assert additional(1) == 1
@@ -0,0 +1,331 @@
+from copy import copy
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from statham.schema.constants import NotPassed
+from statham.schema.engine import (
+    Engine,
+    install,
+    installed,
+    uninstall,
+    validate,
+)
+from statham.schema.elements import (
+    AnyOf,
+    Array,
+    Element,
+    Integer,
+    Not,
+    Object,
+    String,
+)
+from statham.schema.exceptions import ValidationError
+from statham.schema.property import Property, _Property
+
+
+def _nested_lists(depth: int) -> List[Any]:
+    value: List[Any] = []
+    for _ in range(depth - 1):
+        value = [value]
+    return value
+
+
+def _nested_dicts(depth: int) -> Dict[str, Any]:
+    value: Dict[str, Any] = {"value": "leaf"}
+    for _ in range(depth - 1):
+        value = {"value": "node", "children": [value]}
+    return value
+
+
+class Node(Object):
+    value = Property(String(), required=True)
+
+
+Node.properties["children"] = _Property(Array(Node))
+
+
+def _depth(value: Any) -> int:
+    depth = 0
+    while isinstance(value, list):
+        value = value[0] if value else None
+        depth += 1
+    return depth
+
+
+@pytest.mark.parametrize("element", [Element(), Array(Element())])
+def test_deeply_nested_lists_are_validated(element):
+    assert _depth(element(_nested_lists(12000))) == 12000
+
+
+def test_deeply_nested_recursive_models_are_validated():
+    node = Node(_nested_dicts(10000))
+    depth = 1
+    while node.children:
+        node = node.children[0]
+        depth += 1
+    assert depth == 10000
+    assert node.value == "leaf"
+
+
+def test_errors_in_deeply_nested_values_propagate():
+    value = _nested_dicts(10000)
+    leaf = value
+    while "children" in leaf:
+        leaf = leaf["children"][0]
+    leaf["value"] = 1
+    with pytest.raises(ValidationError):
+        _ = Node(value)
+
+
+def test_contains_in_deeply_nested_values():
+    element = Array(Element(), contains=Element())
+    nested = Element(contains=Integer())
+    value: List[Any] = [1]
+    for _ in range(2000):
+        value = [value, 1]
+    assert _depth(element(value)) == 2001
+    assert _depth(nested(value)) == 2001
+
+
+@pytest.mark.parametrize(
+    "element,value,depth",
+    [
+        (Element(), _nested_lists(5), 4),
+        (Node, _nested_dicts(3), 5),
+        (Array(Array(Array(Integer()))), [[[1]], [[]]], 3),
+    ],
+)
+def test_max_depth(element, value, depth):
+    assert validate(element, value, max_depth=depth) == element(value)
+    with pytest.raises(ValidationError) as excinfo:
+        _ = validate(element, value, max_depth=depth - 1)
+    assert f"Exceeds the maximum nesting depth of {depth - 1}." in str(
+        excinfo.value
+    )
+
+
+@pytest.mark.parametrize(
+    "element",
+    [
+        Not(Array(Element())),
+        AnyOf(Array(Element()), Array(Integer())),
+        Element(contains=Element()),
+    ],
+)
+def test_max_depth_cannot_be_caught_by_compositions(element):
+    with pytest.raises(ValidationError):
+        _ = validate(element, _nested_lists(5), max_depth=2)
+
+
+def test_engine_computes_validators_once_per_element():
+    calls = []
+
+    class Counted(String):
+        @property
+        def validators(self):
+            calls.append(self)
+            return super().validators
+
+    element = Array(Counted(minLength=1))
+    engine = Engine()
+    assert engine.validate(element, ["a", "b", "c"]) == ["a", "b", "c"]
+    assert engine.validate(element, ["d"]) == ["d"]
+    assert element(["e"]) == ["e"]
+    assert len(calls) == 1
+
+
+def test_validators_are_recomputed_when_elements_are_modified():
+    element = String(minLength=1)
+    assert element("a") == "a"
+    element.minLength = 2
+    with pytest.raises(ValidationError):
+        _ = element("a")
+    copied = copy(element)
+    copied.minLength = 1
+    assert copied("a") == "a"
+    with pytest.raises(ValidationError):
+        _ = element("a")
+
+
+def test_validators_are_recomputed_when_models_are_modified():
+    class Model(Object, additionalProperties=False):
+        value = Property(String())
+
+    assert Model({"value": "a"}).value == "a"
+    with pytest.raises(ValidationError):
+        _ = Model({"other": 1})
+    Model.properties["other"] = Property(Integer(), required=True)
+    assert Model({"other": 1}).other == 1
+    with pytest.raises(ValidationError):
+        _ = Model({"value": "a"})
+    Model.additionalProperties = True
+    Model.properties = {"value": Property(String())}
+    assert Model({"other": 1})["other"] == 1
+
+
+@pytest.mark.parametrize(
+    "element,modify,value",
+    [
+        (Element(required=["a"]), lambda e: e.required.append("b"), {"a": 1}),
+        (Element(enum=[1, 2]), lambda e: e.enum.remove(1), 1),
+        (
+            Element(
+                patternProperties={"^a": Element()}, additionalProperties=False
+            ),
+            lambda e: e.patternProperties.pop("^a"),
+            {"a": 1},
+        ),
+        (
+            Element(dependencies={"a": []}),
+            lambda e: e.dependencies.update(a=["b"]),
+            {"a": 1},
+        ),
+        (
+            Element(
+                properties={"a": Property(Element())},
+                additionalProperties=False,
+            ),
+            lambda e: e.properties.pop("a"),
+            {"a": 1},
+        ),
+    ],
+)
+def test_validators_are_recomputed_when_keywords_are_modified_in_place(
+    element, modify, value
+):
+    assert element(value) == value
+    modify(element)
+    with pytest.raises(ValidationError):
+        _ = element(value)
+
+
+def test_validators_are_recomputed_when_model_keywords_are_modified_in_place():
+    class Model(Object, required=["value"]):
+        value = Property(String())
+
+    assert Model({"value": "a"}).value == "a"
+    Model.required.append("other")
+    with pytest.raises(ValidationError):
+        _ = Model({"value": "a"})
+
+
+def test_any_of_returns_first_match_without_evaluating_others():
+    calls = []
+
+    class Counted(Integer):
+        def __call__(self, value, property_=None):
+            calls.append(value)
+            return super().__call__(value, property_)
+
+    assert validate(AnyOf(String(), Counted(), Counted()), 1) == 1
+    assert calls == [1]
+
+
+def test_missing_properties_are_not_passed():
+    class Model(Object):
+        value = Property(String())
+        default = Property(String(default="default"))
+
+    instance = validate(Model, {})
+    assert isinstance(instance.value, NotPassed)
+    assert instance.default == "default"
+
+
+def test_validation_allocates_little_memory():
+    # Validators are computed once, rather than on every call, which
+    # allocated over 6KB for a single string.
+    element = String(minLength=1)
+    _ = element("value")
+    tracemalloc.start()
+    try:
+        _ = element("value")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 4096
+
+
+def test_engine_evaluates_custom_call():
+    class Upper(String):
+        def __call__(self, value, property_=None):
+            return super().__call__(value, property_).upper()
+
+    assert validate(Array(Upper()), ["a", "b"]) == ["A", "B"]
+
+
+def test_engine_evaluates_custom_construct():
+    class Length(Element):
+        def construct(self, value, property_):
+            return len(value)
+
+    assert validate(Array(Length()), ["a", [1, 2]]) == [1, 2]
+
+
+def test_engine_initialises_models_with_custom_init():
+    class Initialised(Object):
+        value = Property(String())
+
+        def __init__(self, value, property_=None):
+            super().__init__(value, property_)
+            self.initialised = True
+
+    instance = validate(Array(Initialised), [{"value": "a"}])[0]
+    assert instance.value == "a"
+    assert instance.initialised
+
+
+class _CountingEngine(Engine):
+    created: List[Optional[int]] = []
+
+    def __init__(self, max_depth=None):
+        super().__init__(max_depth)
+        self.created.append(max_depth)
+
+
+def test_installed_factory_creates_engines():
+    _CountingEngine.created = []
+    install(_CountingEngine)
+    try:
+        assert installed() is _CountingEngine
+        assert String()("a") == "a"
+        assert validate(String(), "a", max_depth=2) == "a"
+    finally:
+        uninstall(_CountingEngine)
+    assert installed() is Engine
+    assert _CountingEngine.created == [None, 2]
+
+
+def test_factories_may_be_uninstalled_in_any_order():
+    first, second = _CountingEngine, Engine
+    install(first)
+    install(second, compiled=False)
+    assert installed() is second
+    assert installed(below=second) is first
+    uninstall(first)
+    assert installed() is second
+    assert installed(below=second) is Engine
+    uninstall(second)
+    assert installed() is Engine
+    with pytest.raises(ValueError):
+        uninstall(second)
+
+
+def test_compiled_functions_are_used_unless_disabled():
+    calls = []
+
+    class Compiled(Object):
+        value = Property(String())
+
+    type.__setattr__(
+        Compiled, "__compiled__", lambda value: calls.append(value) or value
+    )
+    _ = Compiled({"value": "a"})
+    install(Engine, compiled=False)
+    try:
+        _ = Compiled({"value": "b"})
+    finally:
+        uninstall(Engine)
+    _ = Compiled({"value": "c"})
+    assert calls == [{"value": "a"}, {"value": "c"}]
@@ -0,0 +1,79 @@
+import pytest
+
+from statham.schema.elements import Element, Integer, Object, String
+from statham.schema.fingerprint import fingerprint
+from statham.schema.property import Property
+from tests.schema.test_comparators import EQUIVALENT, NON_EQUIVALENT
+
+
+@pytest.mark.parametrize("left,right", EQUIVALENT)
+def test_equivalent_schemas_have_equal_fingerprints(left, right):
+    assert fingerprint(left) == fingerprint(right)
+
+
+@pytest.mark.parametrize("left,right", NON_EQUIVALENT)
+def test_non_equivalent_schemas_have_distinct_fingerprints(left, right):
+    assert fingerprint(left) != fingerprint(right)
+
+
+@pytest.mark.parametrize(
+    "left,right",
+    [
+        (Element(default=1), Element(default=1.0)),
+        (Element(enum=[1, "a"]), Element(enum=[True, "a"])),
+        (Element(const={"a": 1, "b": 2}), Element(const={"b": 2, "a": 1})),
+    ],
+)
+def test_fingerprint_matches_python_equality_of_values(left, right):
+    assert left == right
+    assert fingerprint(left) == fingerprint(right)
+
+
+def test_fingerprint_is_cached_on_element():
+    element = String(minLength=1)
+    digest = fingerprint(element)
+    assert vars(element)["_fingerprint"] == digest
+    assert fingerprint(element) == digest
+
+
+def test_fingerprint_is_discarded_when_element_is_modified():
+    element = String()
+    digest = fingerprint(element)
+    element.minLength = 3
+    assert fingerprint(element) != digest
+    assert fingerprint(element) == fingerprint(String(minLength=3))
+
+
+def test_fingerprint_is_discarded_when_model_is_modified():
+    class Model(Object):
+        value = Property(String())
+
+    digest = fingerprint(Model)
+    hash_ = hash(Model)
+    Model.properties["other"] = Property(String())
+    assert fingerprint(Model) != digest
+    assert hash(Model) != hash_
+    digest = fingerprint(Model)
+    Model.additionalProperties = False
+    assert fingerprint(Model) != digest
+
+
+def test_model_fingerprint_is_not_inherited():
+    class Base(Object):
+        value = Property(String())
+
+    digest = fingerprint(Base)
+
+    class Child(Base):
+        other = Property(String())
+
+    assert fingerprint(Child) != digest
+
+
+def test_fingerprint_of_cyclical_element():
+    element = Element()
+    element.items = element
+    other = Element()
+    other.items = other
+    assert fingerprint(element) == fingerprint(other)
+    assert fingerprint(element) != fingerprint(Element(items=Element()))
@@ -0,0 +1,137 @@
+import gc
+import pickle
+
+from json_ref_dict import RefDict
+import pytest
+
+from statham.schema.elements import (
+    AnyOf,
+    Array,
+    Element,
+    Integer,
+    Nothing,
+    Object,
+    String,
+)
+from statham.schema.interning import intern_element, Interner
+from statham.schema.parser import parse
+from statham.schema.property import Property, _Property
+from statham.serializers import serialize_python
+
+
+@pytest.fixture()
+def interner():
+    return Interner()
+
+
+def test_equal_elements_are_interned_to_one_instance(interner):
+    first = interner.intern(Array(String(minLength=1), maxItems=3))
+    second = interner.intern(Array(String(minLength=1), maxItems=3))
+    assert first is second
+    assert interner.intern(first) is first
+
+
+def test_sub_elements_are_replaced_by_canonical_instances(interner):
+    string = interner.intern(String())
+    element = interner.intern(AnyOf(String(), Array(String())))
+    assert element.elements[0] is string
+    assert element.elements[1].items is string
+
+
+@pytest.mark.parametrize(
+    "left,right",
+    [
+        (String(), Element()),
+        (Element(), Nothing()),
+        (String(minLength=1), String(minLength=2)),
+        (Element(const=1), Element(const=True)),
+        (Array(Integer()), Array([Integer()])),
+        (
+            Element(
+                properties={"a": _Property(String()), "b": _Property(String())}
+            ),
+            Element(
+                properties={"b": _Property(String()), "a": _Property(String())}
+            ),
+        ),
+    ],
+)
+def test_distinct_elements_are_not_interned_together(interner, left, right):
+    assert interner.intern(left) is not interner.intern(right)
+
+
+def test_models_are_not_replaced(interner):
+    class First(Object):
+        value = Property(String())
+
+    class Second(Object):
+        value = Property(String())
+
+    assert First == Second
+    assert interner.intern(First) is First
+    assert interner.intern(Second) is Second
+    assert First.properties["value"].element is (
+        Second.properties["value"].element
+    )
+    assert interner.intern(Array(First)) is not interner.intern(Array(Second))
+
+
+def test_recursive_models_are_interned(interner):
+    class Node(Object):
+        value = Property(String())
+
+    Node.properties["children"] = _Property(Array(Node))
+    assert interner.intern(Node) is Node
+    assert Node.properties["children"].element.items is Node
+    assert interner.intern(Array(Node)) is Node.properties["children"].element
+
+
+def test_unused_elements_are_released(interner):
+    element = interner.intern(String(pattern="^unused$"))
+    assert len(interner) == 1
+    del element
+    gc.collect()
+    assert len(interner) == 0
+
+
+def test_interned_elements_may_be_pickled(interner):
+    element = interner.intern(AnyOf(String(), Integer()))
+    assert pickle.loads(pickle.dumps(element)) == element
+
+
+def test_intern_element_uses_a_shared_table():
+    assert intern_element(String(format="date")) is intern_element(
+        String(format="date")
+    )
+
+
+def test_parse_with_interner(interner):
+    schema = {
+        "type": "object",
+        "title": "Parent",
+        "properties": {
+            "first": {"type": "string"},
+            "second": {"type": "string"},
+            "children": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "title": "Child",
+                    "properties": {"name": {"type": "string"}},
+                },
+            },
+        },
+    }
+    (parent,) = parse(schema, interner=interner)
+    assert parent == parse(schema)[0]
+    elements = [prop.element for prop in parent.properties.values()]
+    assert elements[0] is elements[1]
+    child = elements[2].items
+    assert child.properties["name"].element is elements[0]
+
+
+def test_parse_with_interner_generates_the_same_models(interner):
+    uri = "tests/jsonschemas/simple.json#/"
+    assert serialize_python(
+        *parse(RefDict.from_uri(uri), interner=interner)
+    ) == serialize_python(*parse(RefDict.from_uri(uri)))
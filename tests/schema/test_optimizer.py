@@ -0,0 +1,252 @@
+import random
+from typing import Any, Callable, List
+
+import pytest
+
+from statham.schema import optimize  # pylint: disable=no-name-in-module
+from statham.schema.constants import NotPassed
+from statham.schema.elements import (
+    AllOf,
+    AnyOf,
+    Array,
+    Boolean,
+    Element,
+    Integer,
+    Not,
+    Nothing,
+    Null,
+    Number,
+    Object,
+    OneOf,
+    String,
+)
+from statham.schema.exceptions import ValidationError
+from statham.schema.property import Property
+
+
+class Model(Object):
+    value = Property(Integer())
+
+
+class Other(Object):
+    value = Property(Integer())
+
+
+@pytest.mark.parametrize(
+    "element,expected",
+    [
+        (AllOf(String()), String()),
+        (AnyOf(String()), String()),
+        (OneOf(String()), String()),
+        (AllOf(String(), default="a"), String(default="a")),
+        (
+            AllOf(Array(String()), AllOf(Element(minItems=1), Element())),
+            AllOf(Array(String()), Element(minItems=1)),
+        ),
+        (
+            AnyOf(AnyOf(String(), Null()), Boolean()),
+            AnyOf(String(), Null(), Boolean()),
+        ),
+        (
+            OneOf(OneOf(String(), Null()), Boolean()),
+            OneOf(OneOf(String(), Null()), Boolean()),
+        ),
+        (AnyOf(String(), String(), Null()), AnyOf(String(), Null())),
+        (AnyOf(Nothing(), String(), Null()), AnyOf(String(), Null())),
+        (OneOf(Nothing(), Nothing()), Nothing()),
+        (AllOf(String(), Nothing()), Nothing()),
+        (AnyOf(Null(), Element(), String()), AnyOf(Null(), Element())),
+        (
+            AllOf(Integer(minimum=1), Integer(minimum=3, maximum=10)),
+            Integer(minimum=3, maximum=10),
+        ),
+        (
+            AllOf(String(maxLength=5), Element(minLength=2), Null()),
+            AllOf(String(minLength=2, maxLength=5), Null()),
+        ),
+        (
+            AllOf(Integer(multipleOf=2), Integer(multipleOf=3)),
+            AllOf(Integer(multipleOf=2), Integer(multipleOf=3)),
+        ),
+        (
+            AllOf(Element(minimum=1), Integer(maximum=3)),
+            AllOf(Element(minimum=1), Integer(maximum=3)),
+        ),
+        (
+            AnyOf(Integer(minimum=3), Integer(maximum=0)),
+            AllOf(Integer(), AnyOf(Element(minimum=3), Element(maximum=0))),
+        ),
+        (
+            OneOf(String(minLength=3), String(pattern="^a")),
+            AllOf(String(), OneOf(Element(minLength=3), Element(pattern="^a"))),
+        ),
+        (AnyOf(Integer(minimum=3), Integer()), Integer()),
+        (Element(enum=[1, 2, 1, True]), Element(enum=[1, 2, True])),
+        (String(enum=["a", "a"]), String(const="a")),
+        (
+            AllOf(Model, default={"value": 1}),
+            AllOf(Model, default={"value": 1}),
+        ),
+        (AnyOf(Model, Other), AnyOf(Model, Other)),
+        (AnyOf(Model, Model), Model),
+        (
+            Array(AllOf(Array(AnyOf(String()))), maxItems=3),
+            Array(Array(String()), maxItems=3),
+        ),
+        (Not(AllOf(String())), Not(String())),
+    ],
+)
+def test_optimize(element, expected):
+    assert optimize(element) == expected
+    assert type(optimize(element)) is type(expected)
+
+
+def test_optimize_does_not_modify_elements():
+    nested = AnyOf(String())
+    element = Array(nested)
+    assert optimize(element) == Array(String())
+    assert element.items is nested
+
+
+def test_optimize_returns_simplest_elements_unchanged():
+    element = Array(String(), maxItems=3)
+    assert optimize(element) is element
+
+
+def test_optimize_optimizes_models_in_place():
+    class Parent(Object):
+        child = Property(AllOf(Model))
+        values = Property(Array(AnyOf(Integer(), Integer())))
+
+    assert optimize(Parent) is Parent
+    assert Parent.properties["child"].element is Model
+    assert Parent.properties["values"].element == Array(Integer())
+
+
+def test_optimize_recursive_models():
+    class Node(Object):
+        value = Property(AllOf(String()))
+
+    Node.properties["children"] = Property(Array(AnyOf(Node)))
+    assert optimize(Node) is Node
+    assert Node.properties["value"].element == String()
+    assert Node.properties["children"].element.items is Node
+
+
+def test_optimize_long_chains_of_models():
+    models = [Object.inline("Model0")]
+    for idx in range(1, 3000):
+        models.append(
+            Object.inline(
+                f"Model{idx}",
+                properties={"previous": Property(AllOf(models[-1]))},
+            )
+        )
+    _ = optimize(models[-1])
+    assert models[1].properties["previous"].element is models[0]
+
+
+def _outcome(element: Element, value: Any):
+    """Get a comparable outcome of validating a value."""
+    try:
+        result = element(value)
+    except (TypeError, ValidationError) as exc:
+        return ("error", type(exc))
+    if isinstance(result, Object):
+        return ("object", type(result).__name__, result._dict)
+    return ("ok", type(result), result)
+
+
+def _maybe(rand: random.Random, *values: Any) -> Any:
+    """Choose one of the values, or ``NotPassed()``."""
+    return rand.choice([NotPassed(), *values])
+
+
+def _random_element(rand: random.Random, depth: int = 0) -> Element:
+    """Build a random element, with plenty of redundant structure."""
+    enums: List[List[Any]] = [[1, 1], [1, True, "a"], [None]]
+    scalars: List[Callable[[], Element]] = [
+        lambda: Integer(
+            minimum=_maybe(rand, 0, 1, 3),
+            maximum=_maybe(rand, 2, 5),
+            multipleOf=_maybe(rand, NotPassed(), 2),
+        ),
+        lambda: Number(
+            exclusiveMinimum=_maybe(rand, 0.5, 2),
+            maximum=_maybe(rand, 4.5),
+        ),
+        lambda: String(
+            minLength=_maybe(rand, 1, 2),
+            maxLength=_maybe(rand, 2, 4),
+            enum=_maybe(rand, ["a", "ab", "a"], ["abc"]),
+        ),
+        lambda: Element(
+            minimum=_maybe(rand, 1),
+            minLength=_maybe(rand, 2),
+        ),
+        lambda: Element(enum=rand.choice(enums)),
+        Boolean,
+        Null,
+        Element,
+        Nothing,
+        lambda: Model,
+    ]
+    if depth > 2 or rand.random() < 0.3:
+        return rand.choice(scalars)()
+    compositions = [AllOf, AnyOf, OneOf]
+    kind = rand.random()
+    if kind < 0.7:
+        composition = rand.choice(compositions)
+        return composition(
+            *(
+                _random_element(rand, depth + 1)
+                for _ in range(rand.randint(1, 3))
+            ),
+            default=rand.choice([NotPassed(), NotPassed(), 1, "a"]),
+        )
+    if kind < 0.85:
+        return Array(_random_element(rand, depth + 1), maxItems=2)
+    return Not(_random_element(rand, depth + 1))
+
+
+_VALUES: List[Any] = [
+    NotPassed(),
+    None,
+    True,
+    False,
+    0,
+    1,
+    2,
+    3,
+    4,
+    6,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    "",
+    "a",
+    "ab",
+    "abc",
+    "abcde",
+    [],
+    [1],
+    [1, "a"],
+    ["a", "ab", "abc"],
+    {},
+    {"value": 1},
+    {"value": "a"},
+]
+
+
+def test_optimize_preserves_behaviour_of_random_elements():
+    rand = random.Random(0)
+    for _ in range(200):
+        element = _random_element(rand)
+        optimized = optimize(element)
+        for value in _VALUES:
+            assert _outcome(optimized, value) == _outcome(element, value), (
+                element,
+                optimized,
+                value,
+            )
@@ -0,0 +1,206 @@
+import json
+from threading import Thread
+
+import pytest
+
+from statham.schema import engine
+from statham.schema.compiled import compiled
+from statham.schema.elements import (
+    AnyOf,
+    Array,
+    Integer,
+    Object,
+    String,
+)
+from statham.schema.engine import Engine, validate
+from statham.schema.exceptions import ValidationError
+from statham.schema.profiling import Profile, ProfileEntry
+from statham.schema.property import Property
+
+
+class Child(Object):
+    value = Property(Integer(minimum=0), required=True)
+
+
+class Parent(Object):
+    name = Property(String(minLength=2), required=True)
+    children = Property(Array(Child))
+    either = Property(AnyOf(String(), Integer()), source="either-or")
+
+
+def _counts(profile):
+    return {
+        (entry.path, entry.keyword): (entry.calls, entry.failures)
+        for entry in profile.entries()
+    }
+
+
+def test_profile_is_only_installed_within_context():
+    assert engine.installed() is Engine
+    with Profile() as profile:
+        assert engine.installed() == profile._factory
+        assert not engine._use_compiled
+    assert engine.installed() is Engine
+    assert engine._use_compiled
+
+
+def test_validation_outside_profile_is_not_recorded():
+    profile = Profile()
+    _ = Parent({"name": "ab"})
+    assert profile.entries() == []
+
+
+def test_profile_records_elements_and_keywords():
+    with Profile() as profile:
+        _ = Parent({"name": "ab", "children": [{"value": 1}, {"value": 2}]})
+        with pytest.raises(ValidationError):
+            _ = Parent({"name": "a"})
+        with pytest.raises(ValidationError):
+            _ = Parent({"name": "ab", "children": [{"value": -1}]})
+    counts = _counts(profile)
+    assert counts[("Parent", None)] == (3, 2)
+    assert counts[("Parent", "required")] == (3, 0)
+    assert counts[("Parent.name", None)] == (3, 1)
+    assert counts[("Parent.name", "minLength")] == (3, 1)
+    assert counts[("Parent.children", None)] == (2, 1)
+    assert counts[("Parent.children[]", None)] == (3, 1)
+    assert counts[("Parent.children[].value", "minimum")] == (3, 1)
+    for entry in profile.entries():
+        assert 0 <= entry.own_seconds <= entry.seconds
+
+
+def test_profile_paths():
+    with Profile() as profile:
+        _ = Array(Parent)([{"name": "ab", "children": [], "either-or": 1}])
+    assert {entry.path for entry in profile.elements()} == {
+        "List[Parent]",
+        "List[Parent][]",
+        "List[Parent][].name",
+        "List[Parent][].children",
+        "List[Parent][].either",
+        "List[Parent][].either<str>",
+        "List[Parent][].either<int>",
+    }
+
+
+def test_profile_keywords_are_totalled():
+    with Profile() as profile:
+        _ = Parent({"name": "ab", "children": [{"value": 1}]})
+    keywords = {entry.keyword: entry for entry in profile.keywords()}
+    assert keywords["minimum"].calls == 1
+    assert keywords["type"].calls == sum(
+        entry.calls for entry in profile.entries() if entry.keyword == "type"
+    )
+    assert all(entry.path is None for entry in keywords.values())
+    assert [entry.own_seconds for entry in profile.keywords()] == sorted(
+        (entry.own_seconds for entry in keywords.values()), reverse=True
+    )
+
+
+def test_profile_does_not_use_compiled_functions():
+    class Model(Object):
+        value = Property(Integer(), required=True)
+
+    calls = []
+
+    @compiled(Model)
+    def _compiled_model(value):
+        calls.append(value)
+        return {"value": value["value"]}
+
+    with Profile() as profile:
+        _ = Model({"value": 1})
+    assert not calls
+    assert ("Model.value", "type") in _counts(profile)
+    _ = Model({"value": 1})
+    assert calls == [{"value": 1}]
+
+
+def test_profiles_may_be_nested():
+    with Profile() as outer:
+        with Profile() as inner:
+            _ = Child({"value": 1})
+        _ = Child({"value": 2})
+    assert _counts(inner)[("Child", None)] == (1, 0)
+    assert _counts(outer)[("Child", None)] == (1, 0)
+    assert engine.installed() is Engine
+
+
+def test_nested_profiles_may_be_exited_in_any_order():
+    outer, inner = Profile(), Profile()
+    outer.__enter__()
+    inner.__enter__()
+    outer.__exit__(None, None, None)
+    _ = Child({"value": 1})
+    assert engine.installed() == inner._factory
+    inner.__exit__(None, None, None)
+    _ = Child({"value": 2})
+    assert engine.installed() is Engine
+    assert engine._use_compiled
+    assert _counts(inner)[("Child", None)] == (1, 0)
+    assert not outer.entries()
+
+
+def test_profile_records_runs_exceeding_max_depth():
+    with Profile() as profile:
+        with pytest.raises(ValidationError):
+            _ = validate(Array(Array(Integer())), [[[1]]], max_depth=1)
+        _ = Child({"value": 1})
+    counts = _counts(profile)
+    assert counts[("List[List[int]]", None)] == (1, 1)
+    assert counts[("List[List[int]][]", None)] == (1, 1)
+    assert counts[("Child", None)] == (1, 0)
+
+
+def test_profile_records_other_threads():
+    with Profile() as profile:
+        threads = [
+            Thread(target=Child, args=({"value": idx},)) for idx in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert _counts(profile)[("Child.value", None)] == (4, 0)
+
+
+@pytest.fixture()
+def profile():
+    with Profile() as profile_:
+        _ = Child({"value": 1})
+    return profile_
+
+
+def test_profile_to_text(profile):
+    lines = profile.to_text().splitlines()
+    assert lines[0].split()[-2:] == ["path", "[keyword]"]
+    assert len(lines) == len(profile.entries()) + 1
+    assert any(line.endswith("  Child.value [minimum]") for line in lines)
+    assert len(profile.to_text(top=2).splitlines()) == 3
+
+
+def test_profile_to_json(profile):
+    entries = json.loads(profile.to_json())
+    assert [ProfileEntry(**entry) for entry in entries] == profile.entries()
+
+
+def test_profile_to_prometheus(profile):
+    lines = profile.to_prometheus(prefix="app").splitlines()
+    entries = profile.entries()
+    assert len(lines) == 4 * (len(entries) + 2)
+    assert lines[:2] == [
+        "# HELP app_calls_total Number of evaluations.",
+        "# TYPE app_calls_total counter",
+    ]
+    assert 'app_calls_total{path="Child.value",keyword="minimum"} 1' in lines
+    assert 'app_failures_total{path="Child",keyword=""} 0' in lines
+
+
+def test_prometheus_labels_are_escaped():
+    model = Object.inline('Say"\\', properties={"value": Property(Integer())})
+    with Profile() as profile:
+        _ = model({})
+    assert (
+        'statham_validation_calls_total{path="Say\\"\\\\",keyword=""} 1'
+        in profile.to_prometheus().splitlines()
+    )
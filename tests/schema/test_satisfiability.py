@@ -0,0 +1,292 @@
+from typing import Any, List
+
+import pytest
+
+from statham.schema import optimize  # pylint: disable=no-name-in-module
+from statham.schema.elements import (
+    AllOf,
+    AnyOf,
+    Array,
+    Boolean,
+    Element,
+    Integer,
+    Not,
+    Nothing,
+    Null,
+    Number,
+    Object,
+    OneOf,
+    String,
+)
+from statham.schema.exceptions import ValidationError
+from statham.schema.property import Property
+from statham.schema.satisfiability import (
+    find_unsatisfiable,
+    prune_unsatisfiable,
+    Unsatisfiable,
+)
+
+
+class Model(Object):
+    value = Property(Integer(), required=True)
+
+
+UNSATISFIABLE = [
+    (AllOf(String(), Integer()), "Sub-elements have no type in common."),
+    (AllOf(Element(), Nothing()), "allOf/1 is unsatisfiable."),
+    (AnyOf(Nothing(), Nothing()), "No sub-element is satisfiable."),
+    (OneOf(Nothing(), Nothing()), "No sub-element is satisfiable."),
+    (Not(Element()), "Negates an element which matches anything."),
+    (Integer(minimum=3, maximum=1), "No number is within the bounds."),
+    (Number(minimum=1, exclusiveMaximum=1), "No number is within the bounds."),
+    (
+        Number(exclusiveMinimum=1, maximum=2, minimum=2, exclusiveMaximum=2),
+        "No number is within the bounds.",
+    ),
+    (Integer(minimum=1.2, maximum=1.8), "No integer is within the bounds."),
+    (
+        Integer(exclusiveMinimum=1, exclusiveMaximum=2),
+        "No integer is within the bounds.",
+    ),
+    (String(minLength=3, maxLength=2), "minLength exceeds maxLength."),
+    (Array(Element(), minItems=3, maxItems=2), "minItems exceeds maxItems."),
+    (
+        Array(Nothing(), minItems=1),
+        "items is unsatisfiable, but minItems is set.",
+    ),
+    (
+        Array([String(), Nothing()], minItems=2),
+        "Required item items/1 is unsatisfiable.",
+    ),
+    (
+        Array([String()], additionalItems=False, minItems=2),
+        "additionalItems is unsatisfiable.",
+    ),
+    (Array(Element(), contains=Nothing()), "contains is unsatisfiable."),
+    (
+        Array(Element(), contains=String(), maxItems=0),
+        "contains requires an item, but maxItems is 0.",
+    ),
+    (
+        Object.inline("Bounds", minProperties=2, maxProperties=1),
+        "minProperties exceeds maxProperties.",
+    ),
+    (
+        Object.inline(
+            "Many", required=["a", "b"], maxProperties=1, properties={}
+        ),
+        "More properties are required than maxProperties.",
+    ),
+    (
+        Object.inline(
+            "Names",
+            required=["a"],
+            propertyNames=Nothing(),
+            properties={},
+        ),
+        "propertyNames is unsatisfiable.",
+    ),
+    (
+        Object.inline(
+            "Property", properties={"a": Property(Nothing(), required=True)}
+        ),
+        "Required property 'a' is unsatisfiable.",
+    ),
+    (
+        Object.inline(
+            "Pattern",
+            required=["ab"],
+            patternProperties={"^a": Nothing()},
+            properties={},
+        ),
+        "Required property 'ab' is unsatisfiable.",
+    ),
+    (
+        Object.inline(
+            "Additional",
+            required=["a"],
+            additionalProperties=False,
+            properties={},
+        ),
+        "Required property 'a' is unsatisfiable.",
+    ),
+    (String(const=1), "No value of const is valid."),
+    (Integer(enum=["a", True]), "No value of enum is valid."),
+    (Element(const="a", enum=["b"]), "No value of const is valid."),
+    (
+        Element(enum=[1, "a"], minimum=2, minLength=2),
+        "No value of enum is valid.",
+    ),
+    (
+        Element(minimum=3, maximum=1, const=2),
+        "No number is within the bounds. No value of const is valid.",
+    ),
+]
+
+
+SATISFIABLE: List[Element] = [
+    Element(),
+    Element(minimum=3, maximum=1),
+    Element(minLength=3, maxLength=2, minItems=3, maxItems=2),
+    Integer(minimum=1.2, maximum=2.2),
+    Number(minimum=1.2, maximum=1.8),
+    Number(minimum=1, maximum=1),
+    Array(Nothing()),
+    Array([String(), Nothing()], minItems=1),
+    Array(Element(), contains=String()),
+    AnyOf(Nothing(), String()),
+    OneOf(String(), Integer()),
+    AllOf(Element(minimum=1), Integer()),
+    Not(String()),
+    Element(enum=[1, "a"], minimum=2),
+    Model,
+    Object.inline("Optional", properties={"a": Property(Nothing())}),
+    Object.inline(
+        "Pattern",
+        required=["b"],
+        patternProperties={"^a": Nothing()},
+        properties={},
+    ),
+]
+
+
+VALUES: List[Any] = [
+    None,
+    True,
+    0,
+    1,
+    2,
+    1.5,
+    "a",
+    "ab",
+    [],
+    ["a"],
+    ["a", 1],
+    {},
+    {"a": 1},
+    {"a": 1, "b": 1, "value": 1},
+]
+
+
+@pytest.mark.parametrize("element,reason", UNSATISFIABLE)
+def test_find_unsatisfiable_element(element, reason):
+    assert find_unsatisfiable(element)[0] == Unsatisfiable("", element, reason)
+
+
+@pytest.mark.parametrize("element", SATISFIABLE)
+def test_satisfiable_element_is_not_reported(element):
+    assert find_unsatisfiable(element) == []
+
+
+@pytest.mark.parametrize("element,_", UNSATISFIABLE)
+def test_unsatisfiable_element_matches_no_values(element, _):
+    for value in VALUES:
+        with pytest.raises((TypeError, ValidationError)):
+            _ = element(value)
+
+
+def test_nothing_is_not_reported():
+    assert find_unsatisfiable(AnyOf(String(), Nothing())) == []
+
+
+def test_find_unsatisfiable_reports_pointers():
+    impossible = String(minLength=3, maxLength=2)
+    element = Object.inline(
+        "Parent",
+        properties={
+            "a/b~c": Property(Array(AnyOf(String(), impossible))),
+            "d": Property(Not(Element())),
+        },
+    )
+    assert [found.pointer for found in find_unsatisfiable(element)] == [
+        "/properties/a~1b~0c/items/anyOf/1",
+        "/properties/d",
+    ]
+
+
+def test_find_unsatisfiable_reports_each_model_once():
+    class Impossible(Object):
+        value = Property(Nothing(), required=True)
+
+    element = AnyOf(Impossible, Array(Impossible, minItems=1))
+    assert find_unsatisfiable(element) == [
+        Unsatisfiable("", element, "No sub-element is satisfiable."),
+        Unsatisfiable(
+            "/anyOf/0",
+            Impossible,
+            "Required property 'value' is unsatisfiable.",
+        ),
+        Unsatisfiable(
+            "/anyOf/1",
+            element.elements[1],
+            "items is unsatisfiable, but minItems is set.",
+        ),
+    ]
+
+
+def test_required_property_with_default_may_be_omitted():
+    element = Object.inline(
+        "Default",
+        properties={
+            "a": Property(
+                Integer(minimum=2, maximum=1, default=1), required=True
+            )
+        },
+    )
+    assert [found.pointer for found in find_unsatisfiable(element)] == [
+        "/properties/a"
+    ]
+
+
+def test_find_unsatisfiable_in_recursive_models():
+    class Node(Object):
+        value = Property(String(minLength=2, maxLength=1))
+
+    Node.properties["children"] = Property(Array(Node))
+    assert [found.pointer for found in find_unsatisfiable(Node)] == [
+        "/properties/value"
+    ]
+
+
+def test_prune_unsatisfiable():
+    element = AnyOf(
+        String(),
+        AllOf(String(), Integer(), default="a"),
+        Array(Integer(minimum=3, maximum=1)),
+    )
+    pruned = prune_unsatisfiable(element)
+    assert isinstance(pruned.elements[1], Nothing)
+    assert pruned.elements[1].default == "a"
+    assert pruned.elements[0] is element.elements[0]
+    assert pruned.elements[2] == Array(Nothing())
+    assert element.elements[2].items == Integer(minimum=3, maximum=1)
+    assert optimize(pruned) == AnyOf(String(), Array(Nothing()))
+
+
+def test_prune_unsatisfiable_models_in_place():
+    class Parent(Object):
+        child = Property(AnyOf(Model, AllOf(Model, Null())))
+
+    assert prune_unsatisfiable(Parent) is Parent
+    assert Parent.properties["child"].element == AnyOf(Model, Nothing())
+
+
+@pytest.mark.parametrize(
+    "element",
+    [element for element, _ in UNSATISFIABLE]
+    + SATISFIABLE
+    + [
+        AnyOf(Boolean(), AllOf(String(), Null()), default=True),
+        Array([Integer(), Integer(minimum=2, maximum=1)]),
+    ],
+)
+def test_prune_unsatisfiable_preserves_behaviour(element):
+    pruned = prune_unsatisfiable(element)
+    for value in VALUES:
+        try:
+            expected = element(value)
+        except (TypeError, ValidationError) as exc:
+            with pytest.raises(type(exc)):
+                _ = pruned(value)
+        else:
+            assert pruned(value) == expected
@@ -0,0 +1,175 @@
+import json
+import logging
+
+import pytest
+
+from statham.schema import engine
+from statham.schema.elements import Array, Element, Integer, Object, String
+from statham.schema.engine import Engine, validate
+from statham.schema.exceptions import ValidationError
+from statham.schema.profiling import Profile
+from statham.schema.property import Property
+from statham.schema.slowlog import shape, Shape, SlowValidationLog
+
+
+class Custom(Element):
+    """Element which is called by the engine, rather than evaluated."""
+
+    def __init__(self, calls):
+        super().__init__()
+        self.calls = calls
+
+    def __call__(self, value, property_=None):
+        self.calls.append(value)
+        return super().__call__(value, property_)
+
+
+class Child(Object):
+    value = Property(Integer(minimum=0), required=True)
+
+
+class Parent(Object):
+    name = Property(String(), required=True)
+    children = Property(Array(Child))
+
+
+def _records(caplog):
+    return [record.slow_validation for record in caplog.records]
+
+
+def test_log_is_only_installed_within_context():
+    log = SlowValidationLog(0)
+    with log:
+        assert engine.installed() == log._engine
+    assert engine.installed() is Engine
+    log.start()
+    assert engine.installed() == log._engine
+    log.stop()
+    assert engine.installed() is Engine
+
+
+def test_validations_over_threshold_are_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger="statham.schema.slowlog"):
+        with SlowValidationLog(0):
+            _ = Parent({"name": "ab", "children": [{"value": 1}] * 3})
+    (record,) = _records(caplog)
+    assert record.element == "Parent"
+    assert not record.failed
+    assert record.threshold == 0
+    assert record.seconds > 0
+    assert record.shape == Shape("dict", 2, 3, 9, 3, 2, 2, False)
+    assert record.slowest.path in {
+        "Parent",
+        "Parent.name",
+        "Parent.children",
+        "Parent.children[]",
+        "Parent.children[].value",
+    }
+    assert record.slowest.keyword is None
+    assert "Validation of Parent took" in caplog.records[0].getMessage()
+
+
+def test_validations_under_threshold_are_not_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger="statham.schema.slowlog"):
+        with SlowValidationLog(60):
+            _ = Parent({"name": "ab"})
+    assert not caplog.records
+
+
+def test_failed_validations_are_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger="statham.schema.slowlog"):
+        with SlowValidationLog(0):
+            with pytest.raises(ValidationError):
+                _ = validate(Array(Array(Integer())), [[[1]]], max_depth=1)
+            with pytest.raises(ValidationError):
+                _ = Parent({"name": "ab", "children": [{"value": -1}]})
+    first, second = _records(caplog)
+    assert first.failed and second.failed
+    assert first.element == "List[List[int]]"
+    assert second.element == "Parent"
+
+
+def test_nested_calls_are_logged_once(caplog):
+    calls = []
+    with caplog.at_level(logging.WARNING, logger="statham.schema.slowlog"):
+        with SlowValidationLog(0):
+            assert Array(Custom(calls))([1, 2]) == [1, 2]
+    assert calls == [1, 2]
+    assert [record.element for record in _records(caplog)] == ["List[Any]"]
+
+
+def test_sampling(caplog):
+    with caplog.at_level(logging.WARNING, logger="statham.schema.slowlog"):
+        with SlowValidationLog(0, sample_rate=0):
+            _ = Child({"value": 1})
+    assert not caplog.records
+    with pytest.raises(ValueError):
+        _ = SlowValidationLog(0, sample_rate=1.5)
+
+
+def test_unsampled_validations_use_enclosing_profile():
+    with Profile() as profile:
+        with SlowValidationLog(0, sample_rate=0):
+            _ = Child({"value": 1})
+    assert ("Child", None) in {
+        (entry.path, entry.keyword) for entry in profile.entries()
+    }
+
+
+def test_log_and_profile_may_be_exited_in_any_order(caplog):
+    profile, log = Profile(), SlowValidationLog(0)
+    with caplog.at_level(logging.WARNING, logger="statham.schema.slowlog"):
+        profile.__enter__()
+        log.__enter__()
+        profile.__exit__(None, None, None)
+        _ = Child({"value": 1})
+        assert engine._use_compiled
+        log.__exit__(None, None, None)
+        _ = Child({"value": 2})
+    assert engine.installed() is Engine
+    assert [record.element for record in _records(caplog)] == ["Child"]
+    assert not profile.entries()
+
+
+def test_custom_logger_and_level(caplog):
+    logger = logging.getLogger("custom")
+    with caplog.at_level(logging.DEBUG, logger="custom"):
+        with SlowValidationLog(0, logger=logger, level=logging.INFO):
+            _ = Child({"value": 1})
+    (record,) = caplog.records
+    assert record.name == "custom"
+    assert record.levelno == logging.INFO
+
+
+def test_record_to_dict(caplog):
+    with caplog.at_level(logging.WARNING, logger="statham.schema.slowlog"):
+        with SlowValidationLog(0):
+            _ = Child({"value": 1})
+    (record,) = _records(caplog)
+    result = json.loads(json.dumps(record.to_dict()))
+    assert result["element"] == "Child"
+    assert result["shape"]["type"] == "dict"
+    assert result["slowest"]["path"] in {"Child", "Child.value"}
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (None, Shape("NoneType", None, 0, 1, 0, 0, 0, False)),
+        ("abc", Shape("str", 3, 0, 1, 0, 0, 3, False)),
+        ([], Shape("list", 0, 0, 1, 0, 0, 0, False)),
+        (
+            {"a": [1, {"b": "cd"}], "e": {}},
+            Shape("dict", 2, 3, 6, 2, 2, 2, False),
+        ),
+    ],
+)
+def test_shape(value, expected):
+    assert shape(value) == expected
+
+
+def test_shape_is_bounded():
+    result = shape([[1, 2, 3]] * 100, limit=10)
+    assert result.nodes == 10
+    assert result.truncated
+    assert result.size == 100
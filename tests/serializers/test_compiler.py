@@ -0,0 +1,268 @@
+from importlib import import_module
+import os
+import sys
+from typing import Any, List
+
+from json_ref_dict import RefDict
+import pytest
+
+from statham.schema.constants import NotPassed
+from statham.schema.elements import (
+    Array,
+    Element,
+    Integer,
+    Number,
+    Object,
+    String,
+)
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.exceptions import ValidationError
+from statham.schema.parser import parse
+from statham.schema.property import Property
+from statham.serializers.compiler import compile_model
+from statham.serializers.python import (
+    serialize_python,
+    serialize_python_package,
+)
+
+
+SCHEMA_DIRECTORY = "tests/jsonschemas"
+
+
+def test_compile_model():
+    class Model(Object, additionalProperties=False):
+        value: str = Property(String(pattern="^a"), required=True)
+        amount: float = Property(Number(default=1))
+
+    assert compile_model(Model).source == (
+        """_Model_0 = frozenset({'value'})
+_Model_1 = frozenset({'value', 'amount'})
+_Model_2 = re.compile('^a')
+_Model_3 = Model.properties['amount'].element
+_Model_4 = Model.properties['amount']
+_Model_5 = _Model_3(NOT_PASSED, _Model_4)
+
+
+@compiled(Model)
+def _compiled_Model(value):
+    if (
+        not value.keys() >= _Model_0
+        or not value.keys() <= _Model_1
+    ):
+        raise ValidationError
+    results = {}
+    sub = value.get('value', NOT_PASSED)
+    if sub is NOT_PASSED:
+        results['value'] = NOT_PASSED
+    else:
+        if (
+            not isinstance(sub, str)
+            or not _Model_2.search(sub)
+        ):
+            raise ValidationError
+        results['value'] = sub
+    sub = value.get('amount', NOT_PASSED)
+    if sub is NOT_PASSED:
+        results['amount'] = _Model_5
+    else:
+        if not isinstance(sub, (float, int)) or isinstance(sub, bool):
+            raise ValidationError
+        results['amount'] = float(sub)
+    return results
+"""
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"patternProperties": {"^a": String()}},
+        {"additionalProperties": String()},
+        {"propertyNames": String(maxLength=3)},
+        {"const": {"value": "a"}},
+        {"enum": [{"value": "a"}]},
+        {"dependencies": {"value": ["other"]}},
+    ],
+)
+def test_models_with_other_keywords_are_not_compiled(kwargs):
+    model = Object.inline(
+        "Model", properties={"value": Property(String())}, **kwargs
+    )
+    assert compile_model(model) is None
+
+
+def test_serialize_compiled_python():
+    class Model(Object):
+        value = Property(String())
+
+    module = serialize_python(Model, compiled=True)
+    assert module.startswith(
+        """from statham.schema.compiled import NOT_PASSED, additional, compiled
+from statham.schema.constants import Maybe
+from statham.schema.elements import Object, String
+from statham.schema.exceptions import ValidationError
+from statham.schema.property import Property
+
+
+class Model(Object):
+"""
+    )
+    assert "@compiled(Model)" in module
+    assert "exec" not in module and "eval" not in module
+
+
+@pytest.fixture()
+def load(tmp_path, monkeypatch):
+    """Write generated modules, and import them."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    loaded = []
+
+    def _load(name, source):
+        (tmp_path / f"{name}.py").write_text(source)
+        loaded.append(name)
+        return import_module(name)
+
+    yield _load
+    for name in loaded:
+        del sys.modules[name]
+
+
+def _models(module):
+    return [
+        value
+        for value in vars(module).values()
+        if isinstance(value, ObjectMeta) and value is not Object
+    ]
+
+
+def _outcome(model, value):
+    try:
+        instance = model(value)
+    except (TypeError, ValidationError) as exc:
+        return type(exc), str(exc)
+    # pylint: disable=protected-access
+    values = list(instance._dict.items())
+    return type(instance), values, [type(value) for _, value in values]
+
+
+def _assert_equivalent(model, value):
+    compiled = vars(model)["__compiled__"]
+    outcome = _outcome(model, value)
+    type.__delattr__(model, "__compiled__")
+    try:
+        assert outcome == _outcome(model, value)
+    finally:
+        type.__setattr__(model, "__compiled__", compiled)
+
+
+UUID = "c9b0a3b4-1d2e-4f5a-8b6c-7d8e9f0a1b2c"
+
+SUB_VALUES: List[Any] = [
+    NotPassed(),
+    None,
+    True,
+    0,
+    3,
+    2.5,
+    "",
+    "foo",
+    UUID,
+    "2020-01-01T00:00:00Z",
+    [],
+    ["foo", 1],
+    {},
+    {"id": UUID},
+]
+
+
+@pytest.mark.parametrize(
+    "name",
+    sorted(
+        filename.split(".")[0]
+        for filename in os.listdir(SCHEMA_DIRECTORY)
+        if filename.endswith(".json")
+    ),
+)
+def test_compiled_models_are_equivalent(load, name):
+    module = load(
+        f"compiled_{name}",
+        serialize_python(
+            *parse(RefDict.from_uri(f"{SCHEMA_DIRECTORY}/{name}.json#/")),
+            compiled=True,
+        ),
+    )
+    models = _models(module)
+    assert models
+    for model in models:
+        for prop in model.properties.values():
+            for sub_value in SUB_VALUES:
+                value = {prop.source: sub_value, "extra": [{"a": 1}]}
+                for source in model.properties.required:
+                    value.setdefault(source, sub_value)
+                _assert_equivalent(model, value)
+        _assert_equivalent(model, {})
+
+
+class Renamed(Object, additionalProperties=False, maxProperties=3):
+    first_name = Property(String(minLength=1), source="first-name")
+    a = Property(Integer(const=True), source="b")
+    b = Property(Integer(enum=[1, True, 2.0]), source="a")
+    untyped: Any = Property(Element())
+
+
+class Parent(Object, required=["other"]):
+    nested = Property(Renamed)
+    items = Property(Array(Array(Number(multipleOf=0.5)), maxItems=2))
+    tags = Property(Array(String(), default=["a"]), source="the-tags")
+    invalid_default = Property(Integer(minimum=5, default=1))
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"other": 1},
+        {"other": 1, "nested": {}},
+        {"other": 1, "nested": {"first-name": "a", "a": 2.0, "b": True}},
+        {"other": 1, "nested": {"first_name": "a"}},
+        {"other": 1, "nested": {"a": True}},
+        {"other": 1, "nested": {"b": 1}},
+        {"other": 1, "nested": {"untyped": {"a": [{}]}, "a": 1, "b": 2}},
+        {"other": 1, "nested": {"a": 1, "b": 1, "untyped": 1, "c": 1}},
+        {"other": 1, "items": [[0.5, 1], [2.0, True]]},
+        {"other": 1, "items": [[0.5, 1], [2.0, 3]]},
+        {"other": 1, "items": [[], [], []]},
+        {"other": 1, "the-tags": ["b"], "tags": 1},
+        {"other": 1, "invalid_default": 6},
+        {"other": 1, "invalid_default": 4},
+        {"nested": {}},
+    ],
+)
+def test_compiled_models_with_renamed_properties_are_equivalent(load, value):
+    module = load(
+        "compiled_renamed", serialize_python(Parent, Renamed, compiled=True)
+    )
+    for model in (module.Parent, module.Renamed):
+        _assert_equivalent(model, value)
+    _assert_equivalent(module.Renamed, value.get("nested"))
+
+
+def test_compiled_package(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    class Model(Object):
+        value = Property(String())
+
+    modules = serialize_python_package(Model, compiled=True)
+    assert "@compiled(Model)" in modules["model.py"]
+    directory = tmp_path / "compiled_package"
+    directory.mkdir()
+    for filename, content in modules.items():
+        (directory / filename).write_text(content)
+    package = import_module("compiled_package")
+    try:
+        assert "__compiled__" in vars(package.Model)
+        assert package.Model({"value": "a"}).value == "a"
+    finally:
+        for name in list(sys.modules):
+            if name.startswith("compiled_package"):
+                del sys.modules[name]
@@ -0,0 +1,92 @@
+from statham.schema.elements import (
+    AnyOf,
+    Array,
+    Integer,
+    Object,
+    String,
+)
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.property import Property
+from statham.serializers.graph import _get_path, ElementGraph
+
+
+class Leaf(Object):
+    value = Property(String())
+
+
+class Branch(Object):
+    leaves = Property(Array(Leaf))
+    either = Property(AnyOf(Leaf, Integer()))
+
+
+class Tree(Object):
+    branch = Property(Branch)
+    leaf = Property(Leaf)
+
+
+def test_graph_visits_each_element_once():
+    graph = ElementGraph(Tree, Branch)
+    assert len(graph.elements) == len({id(elem) for elem in graph.elements})
+    assert graph.elements[:2] == [Tree, Branch]
+
+
+def test_graph_caches_immediate_children():
+    graph = ElementGraph(Tree)
+    assert graph.children(Tree) == [Branch, Leaf]
+    (array, any_of) = graph.children(Branch)
+    assert graph.children(array) == [Leaf]
+    assert graph.children(any_of) == [Leaf, any_of.elements[1]]
+
+
+def test_graph_object_classes():
+    assert ElementGraph(Leaf, Tree).object_classes == [Leaf, Tree, Branch]
+
+
+def test_graph_dependencies_are_nearest_object_classes():
+    graph = ElementGraph(Tree)
+    assert set(graph.dependencies(Tree)) == {Branch, Leaf}
+    assert graph.dependencies(Branch) == [Leaf]
+    assert graph.dependencies(Leaf) == []
+
+
+def test_graph_dependents():
+    graph = ElementGraph(Tree)
+    assert set(graph.dependents(Leaf)) == {Branch, Tree}
+    assert graph.dependents(Branch) == [Tree]
+    assert graph.dependents(Tree) == []
+
+
+def test_graph_element_types():
+    assert ElementGraph(Tree).element_types == {
+        ObjectMeta,
+        Array,
+        AnyOf,
+        Integer,
+        String,
+    }
+
+
+def test_graph_traverses_shared_sub_elements_once():
+    shared = Array(String())
+    layers = [shared]
+    for _ in range(100):
+        layers.append(AnyOf(layers[-1], layers[-1]))
+    graph = ElementGraph(layers[-1])
+    assert len(graph.elements) == len(layers) + 1
+
+
+def test_graph_handles_cycles():
+    class Cycle(Object):
+        pass
+
+    Cycle.properties["other"] = Property(Cycle)
+    graph = ElementGraph(Cycle)
+    assert graph.elements == [Cycle]
+    assert graph.dependencies(Cycle) == [Cycle]
+
+
+def test_get_path_uses_split_segments():
+    data = {"a": [{"b": 1}, {"b": 2}], "c": {"x": 3, "y": 4}}
+    assert _get_path(data, ("a", "b")) == [1, 2]
+    assert _get_path(data, ("c", "*")) == [3, 4]
+    assert _get_path(data, ("d",)) == []
@@ -18,7 +18,9 @@ from statham.schema.elements import (
     OneOf,
     String,
 )
+from statham.schema.fingerprint import fingerprint
 from statham.schema.property import Property, _Property
+from statham.serializers import json as json_serializer
 from statham.serializers.json import _serialize_element, serialize_json
 from tests.schema.parser.test_parse_object import (
     EmptyModel,
@@ -406,7 +408,7 @@ def test_serialize_element(element: Element, expected: Dict[str, Any]):
                         },
                         "title": "Child",
                         "type": "object",
-                        "description": "Model with name and reference to category."
+                        "description": "Model with name and reference to category.",
                     },
                     "Category": {
                         "properties": {"required_name": {"type": "string"}},
@@ -476,3 +478,73 @@ def test_serialize_json(elements, expected):
 )
 def test_serialize_json_with_definitions(elements, definitions, expected):
     assert serialize_json(*elements, definitions=definitions) == expected
+
+
+def test_serialize_json_uses_first_equal_definition():
+    element = Element(properties={"id": _Property(Integer(minimum=0))})
+    definitions = {
+        "uuid": String(format="uuid"),
+        "first": Integer(minimum=0),
+        "second": Integer(minimum=0),
+    }
+    schema = serialize_json(element, definitions=definitions)
+    assert schema["properties"] == {"id": {"$ref": "#/definitions/first"}}
+
+
+def test_serialize_json_uses_modified_definition():
+    definition = String()
+    _ = fingerprint(definition)
+    definition.minLength = 3
+    schema = serialize_json(
+        Array(String(minLength=3)), definitions={"x": definition}
+    )
+    assert schema["items"] == {"$ref": "#/definitions/x"}
+
+
+def test_serialize_json_does_not_compare_unrelated_definitions(monkeypatch):
+    comparisons = []
+    original = Element.__eq__
+
+    def _eq(self, other):
+        comparisons.append((self, other))
+        return original(self, other)
+
+    monkeypatch.setattr(Element, "__eq__", _eq)
+    definitions = {f"code{idx}": String(maxLength=idx) for idx in range(100)}
+    element = Element(
+        properties={
+            f"prop{idx}": _Property(String(maxLength=idx))
+            for idx in range(0, 100, 10)
+        }
+    )
+    schema = serialize_json(element, definitions=definitions)
+    assert schema["properties"]["prop50"] == {"$ref": "#/definitions/code50"}
+    assert all(
+        isinstance(other, String) and other.maxLength == self.maxLength
+        for self, other in comparisons
+    )
+
+
+def test_serialize_json_serializes_shared_elements_once(monkeypatch):
+    calls = []
+    shared = Array(String(format="uuid"))
+    original = json_serializer._Serializer.element
+
+    def _element(self, element):
+        calls.append(element)
+        return original(self, element)
+
+    monkeypatch.setattr(json_serializer._Serializer, "element", _element)
+    element = AnyOf(
+        *(Element(properties={"a": _Property(shared)}) for _ in range(5))
+    )
+    schema = serialize_json(element)
+    assert schema["anyOf"][0] == {
+        "properties": {
+            "a": {
+                "type": "array",
+                "items": {"type": "string", "format": "uuid"},
+            }
+        }
+    }
+    assert sum(call is shared for call in calls) == 1
@@ -7,7 +7,7 @@ from statham.schema.elements import Array, Element, Object, String
 from statham.schema.elements.meta import ObjectMeta
 from statham.schema.exceptions import SchemaParseError
 from statham.schema.property import Property
-from statham.serializers.orderer import orderer
+from statham.serializers.orderer import get_object_classes, orderer
 
 
 class Child(Object):
@@ -136,3 +136,70 @@ def test_orderer_detects_untyped_object_dependencies(kwargs):
         value = Property(Element(**kwargs))
 
     assert list(orderer(UntypedParent)) == [Child, UntypedParent]
+
+
+def test_orderer_declares_ready_classes_in_traversal_order():
+    class First(Object):
+        value = Property(Child)
+
+    class Second(Object):
+        value = Property(Related)
+
+    class Root(Object):
+        first = Property(First)
+        second = Property(Second)
+
+    # Traversal finds Root, First, Child, Second, Related.
+    assert list(orderer(Root)) == [Child, First, Related, Second, Root]
+
+
+def test_orderer_detects_indirect_cycles():
+    class Start(Object):
+        pass
+
+    class Middle(Object):
+        value = Property(Array(Start))
+
+    Start.properties["middle"] = Property(Middle)
+    with pytest.raises(SchemaParseError):
+        consume(orderer(Start))
+
+
+def test_orderer_declares_cycles_forward():
+    class Start(Object):
+        pass
+
+    class Middle(Object):
+        value = Property(Array(Start))
+
+    class End(Object):
+        middle = Property(Middle)
+
+    Start.properties["middle"] = Property(Middle)
+    Start.properties["end"] = Property(End)
+    Start.properties["self"] = Property(Start)
+    assert list(orderer(Start, forward=True)) == [Start, Middle, End]
+
+
+def test_get_object_classes_returns_each_class_once():
+    assert get_object_classes(Other, Parent, Child) == [
+        Other,
+        Parent,
+        Child,
+        Related,
+    ]
+
+
+def test_orderer_scales_to_many_models():
+    models = [Object.inline("Model0")]
+    for idx in range(1, 5000):
+        models.append(
+            Object.inline(
+                f"Model{idx}",
+                properties={
+                    "previous": Property(models[-1]),
+                    "first": Property(Array(models[0])),
+                },
+            )
+        )
+    assert list(orderer(*reversed(models))) == models
@@ -1,15 +1,22 @@
+# pylint: disable=too-many-lines
+from importlib import import_module
+import sys
 from typing import Any
 
 import pytest
 
 from statham.schema.constants import Maybe
-from statham.schema.elements import Element, Object, String
+from statham.schema.elements import Array, Element, Object, String
 
 # False positive: https://github.com/PyCQA/pylint/issues/3202
 from statham.schema.elements import Nothing  # pylint: disable=unused-import
 from statham.schema.parser import parse
 from statham.schema.property import Property
-from statham.serializers.python import serialize_python
+from statham.serializers.python import (
+    _module_names,
+    serialize_python,
+    serialize_python_package,
+)
 
 
 SCHEMA = {
@@ -134,6 +141,62 @@ class MyObject(Object):
     )
 
 
+def test_serialize_recursive_models_with_forward_references():
+    class Node(Object):
+        value = Property(String())
+
+    class Parent(Object):
+        pass
+
+    class Child(Object, additionalProperties=Parent):
+        parent = Property(Parent)
+
+    Node.properties["children"] = Property(Array(Node), required=True)
+    Parent.properties["child"] = Property(Child)
+    assert serialize_python(Node, Parent) == (
+        """from typing import List
+
+from statham.schema.constants import Maybe
+from statham.schema.elements import Array, Object, String
+from statham.schema.property import Property
+
+
+class Node(Object):
+
+    value: Maybe[str] = Property(String())
+
+    children: "List[Node]"
+
+
+class Parent(Object):
+
+    child: "Maybe[Child]"
+
+
+class Child(Object, additionalProperties=Parent):
+
+    parent: Maybe[Parent] = Property(Parent)
+
+
+Node.properties['children'] = Property(Array(Node), required=True)
+Parent.properties['child'] = Property(Child)
+"""
+    )
+
+
+def test_serialize_forward_class_arguments():
+    class Parent(Object):
+        pass
+
+    class Child(Object):
+        parent = Property(Parent)
+
+    Parent.additionalProperties = Child
+    module = serialize_python(Parent)
+    assert "class Parent(Object):\n\n    pass\n" in module
+    assert module.endswith("Parent.additionalProperties = Child\n")
+
+
 def test_parse_and_serialize_schema_with_no_args():
     schema = {"type": "object", "title": "NoProps"}
     assert serialize_python(*parse(schema)) == (
@@ -437,3 +500,137 @@ def test_serialize_object_with_dependencies():
     pass
 """
     )
+
+
+def test_serialize_python_package():
+    modules = serialize_python_package(*parse(SCHEMA))
+    assert list(modules) == [
+        "__init__.py",
+        "other.py",
+        "category.py",
+        "parent.py",
+    ]
+    assert modules["parent.py"] == (
+        """from statham.schema.constants import Maybe
+from statham.schema.elements import Object, String
+from statham.schema.property import Property
+
+from .category import Category
+
+
+class Parent(Object):
+
+    category: Category = Property(Category, required=True)
+
+    default: Maybe[str] = Property(String())
+"""
+    )
+    assert "_MODULES = {\n    'Category': 'category'," in modules["__init__.py"]
+
+
+@pytest.mark.parametrize(
+    "class_names,expected",
+    [
+        (["Parent", "HTTPResponse"], ["parent", "http_response"]),
+        (["Model", "Model_1"], ["model", "model_1"]),
+        (
+            ["FooBar", "Foo_Bar", "Foo_bar"],
+            ["foo_bar", "foo_bar_", "foo_bar__"],
+        ),
+        (
+            ["Class", "class", "Import_module"],
+            ["class_", "class__", "import_module"],
+        ),
+    ],
+)
+def test_package_module_names_are_distinct(class_names, expected):
+    assert list(_module_names(class_names).values()) == expected
+
+
+@pytest.fixture()
+def package(tmp_path, monkeypatch):
+    """Write a generated package, and import it."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    directory = tmp_path / "generated"
+    directory.mkdir()
+    for filename, content in serialize_python_package(*parse(SCHEMA)).items():
+        (directory / filename).write_text(content)
+    yield import_module("generated")
+    for name in list(sys.modules):
+        if name == "generated" or name.startswith("generated."):
+            del sys.modules[name]
+
+
+def test_package_imports_models_when_first_used(package):
+    assert not [name for name in sys.modules if name.startswith("generated.")]
+    assert sorted(package.__all__) == ["Category", "Other", "Parent"]
+    parent = package.Parent({"category": {"value": "a"}})
+    assert parent.category.value == "a"
+    assert package.Category is type(parent.category)
+    assert "generated.other" not in sys.modules
+    assert sorted(dir(package)).count("Other") == 1
+    with pytest.raises(AttributeError):
+        _ = package.Missing
+
+
+def test_package_declares_recursive_models_together(tmp_path, monkeypatch):
+    class Node(Object):
+        value = Property(String())
+
+    class Parent(Object):
+        pass
+
+    class Child(Object, additionalProperties=Parent):
+        parent = Property(Parent)
+
+    class Root(Object):
+        node = Property(Node)
+        parent = Property(Parent)
+
+    Node.properties["children"] = Property(Array(Node), required=True)
+    Parent.properties["child"] = Property(Child)
+    modules = serialize_python_package(Root)
+    assert sorted(modules) == [
+        "__init__.py",
+        "node.py",
+        "parent.py",
+        "root.py",
+    ]
+    assert "    'Child': 'parent',\n" in modules["__init__.py"]
+    assert modules["parent.py"].endswith(
+        """class Parent(Object):
+
+    child: "Maybe[Child]"
+
+
+class Child(Object, additionalProperties=Parent):
+
+    parent: Maybe[Parent] = Property(Parent)
+
+
+Parent.properties['child'] = Property(Child)
+"""
+    )
+    assert "from .node import Node\nfrom .parent import Parent\n" in (
+        modules["root.py"]
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    directory = tmp_path / "recursive"
+    directory.mkdir()
+    for filename, content in modules.items():
+        (directory / filename).write_text(content)
+    try:
+        package = import_module("recursive")
+        root = package.Root(
+            {
+                "node": {"children": [{"children": []}]},
+                "parent": {"child": {"parent": {}}},
+            }
+        )
+        assert isinstance(root.node.children[0], package.Node)
+        assert isinstance(root.parent.child.parent, package.Parent)
+        assert package.Child is type(root.parent.child)
+    finally:
+        for name in list(sys.modules):
+            if name == "recursive" or name.startswith("recursive."):
+                del sys.modules[name]
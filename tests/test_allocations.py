@@ -0,0 +1,9 @@
+import pytest
+
+from benchmarks.allocations import allocated, CASES, nodes
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case.name for case in CASES])
+def test_validation_allocates_within_budget(case):
+    per_node = allocated(case.element, case.value) / nodes(case.value)
+    assert per_node <= case.budget
@@ -0,0 +1,397 @@
+import json
+import os
+from threading import Event, Thread
+from time import perf_counter, sleep
+
+from black import assert_equivalent as assert_ast_equal
+from json_ref_dict import loader
+from json_ref_dict.loader import get_document
+import pytest
+
+from statham import batch
+from statham.__main__ import batch_main
+from statham.batch import (
+    BatchResult,
+    collect_inputs,
+    DependencyManifest,
+    format_report,
+    generate_batch,
+    is_batch,
+    MANIFEST_NAME,
+    output_paths,
+)
+from statham.cache import document_hash
+from statham.watch import DocumentStore, watch
+
+
+SCHEMA_DIRECTORY = "tests/jsonschemas"
+MODEL_DIRECTORY = "tests/models"
+SCHEMA_NAMES = sorted(
+    filename.split(".")[0]
+    for filename in os.listdir(SCHEMA_DIRECTORY)
+    if filename.endswith(".json")
+)
+
+
+def test_collect_inputs_from_directory():
+    assert collect_inputs(SCHEMA_DIRECTORY) == [
+        os.path.join(SCHEMA_DIRECTORY, f"{name}.json") for name in SCHEMA_NAMES
+    ]
+
+
+def test_collect_inputs_from_glob():
+    assert collect_inputs(f"{SCHEMA_DIRECTORY}/**/*.json") == sorted(
+        [
+            os.path.join(SCHEMA_DIRECTORY, f"{name}.json")
+            for name in SCHEMA_NAMES
+        ]
+        + [os.path.join(SCHEMA_DIRECTORY, "schemas", "common.json")]
+    )
+
+
+def test_collect_inputs_from_single_schema():
+    uri = f"{SCHEMA_DIRECTORY}/simple.json#/definitions/foo"
+    assert collect_inputs(uri) == [uri]
+
+
+def test_collect_inputs_from_manifest(tmp_path):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text(
+        "# Comments and blank lines are ignored.\n\n"
+        "b.json\n"
+        "a.json#/definitions/a\n"
+        "http://example.com/c.json\n"
+    )
+    assert collect_inputs(str(manifest), manifest=True) == [
+        str(tmp_path / "a.json#/definitions/a"),
+        str(tmp_path / "b.json"),
+        "http://example.com/c.json",
+    ]
+
+
+@pytest.mark.parametrize(
+    "input_arg,expected",
+    [
+        (SCHEMA_DIRECTORY, True),
+        ("schemas/*.json", True),
+        (f"{SCHEMA_DIRECTORY}/simple.json", False),
+        (f"{SCHEMA_DIRECTORY}/simple.json#/definitions/foo", False),
+    ],
+)
+def test_is_batch(input_arg, expected):
+    assert is_batch(input_arg) is expected
+
+
+def test_output_paths_mirror_input_directories():
+    assert output_paths(
+        ["schemas/a.json#/", "schemas/nested/b.yaml", "schemas/c.json"], "out"
+    ) == [
+        os.path.join("out", ".", "a.py"),
+        os.path.join("out", "nested", "b.py"),
+        os.path.join("out", ".", "c.py"),
+    ]
+
+
+def _assert_generated_models_match(output_dir):
+    for name in SCHEMA_NAMES:
+        with open(
+            os.path.join(output_dir, f"{name}.py"), encoding="utf8"
+        ) as file:
+            generated = file.read()
+        with open(
+            os.path.join(MODEL_DIRECTORY, f"{name}.py"), encoding="utf8"
+        ) as file:
+            assert_ast_equal(file.read(), generated)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_generate_batch(tmp_path, jobs):
+    inputs = collect_inputs(SCHEMA_DIRECTORY)
+    results = generate_batch(inputs, str(tmp_path), jobs=jobs)
+    assert [result.input for result in results] == [
+        f"{uri}#/" for uri in inputs
+    ]
+    assert not any(result.error for result in results)
+    assert all(result.seconds > 0 for result in results)
+    _assert_generated_models_match(tmp_path)
+
+
+def test_generate_batch_with_cache(tmp_path):
+    inputs = collect_inputs(SCHEMA_DIRECTORY)
+    cache_dir = str(tmp_path / "cache")
+    for _ in range(2):
+        results = generate_batch(
+            inputs, str(tmp_path / "out"), jobs=1, cache_dir=cache_dir
+        )
+        assert not any(result.error for result in results)
+    _assert_generated_models_match(tmp_path / "out")
+
+
+def test_generate_batch_reports_failures(tmp_path):
+    (tmp_path / "bad.json").write_text('{"$ref": "missing.json"}')
+    inputs = [str(tmp_path / "bad.json"), f"{SCHEMA_DIRECTORY}/simple.json"]
+    results = generate_batch(inputs, str(tmp_path / "out"), jobs=1)
+    assert results[0].error.startswith("DocumentParseError")
+    assert not os.path.exists(results[0].output)
+    assert results[1].error is None
+    assert os.path.exists(results[1].output)
+
+
+def test_generate_batch_reports_duplicate_outputs(tmp_path):
+    inputs = [
+        f"{SCHEMA_DIRECTORY}/simple.json#/",
+        f"{SCHEMA_DIRECTORY}/simple.json#/properties/related",
+    ]
+    results = generate_batch(inputs, str(tmp_path), jobs=1)
+    assert [result.error for result in results] == [
+        "Output path is not unique."
+    ] * 2
+
+
+def test_format_report():
+    report = format_report(
+        [
+            BatchResult("a.json#/", "out/a.py", 0.5),
+            BatchResult("b.json#/", "out/b.py", 0.25, "KeyError: 'b'"),
+        ],
+        1.0,
+    )
+    assert report.splitlines() == [
+        "ok        0.500s  a.json#/ -> out/a.py",
+        "FAILED    0.250s  b.json#/: KeyError: 'b'",
+        "Generated 1 of 2 modules in 1.000s, 1 failed.",
+    ]
+
+
+def test_format_report_omits_skipped_results():
+    report = format_report(
+        [
+            BatchResult("a.json#/", "out/a.py", 0.5),
+            BatchResult("b.json#/", "out/b.py", 0.0, skipped=True),
+        ],
+        1.0,
+    )
+    assert report.splitlines() == [
+        "ok        0.500s  a.json#/ -> out/a.py",
+        "Generated 1 of 2 modules in 1.000s, 0 failed, 1 up to date.",
+    ]
+
+
+def test_batch_main(tmp_path, capsys):
+    code = batch_main(["--input", SCHEMA_DIRECTORY, "--output", str(tmp_path)])
+    assert code == 0
+    _assert_generated_models_match(tmp_path)
+    assert "Generated 8 of 8 modules" in capsys.readouterr().err
+
+
+def test_batch_main_requires_output():
+    with pytest.raises(SystemExit):
+        _ = batch_main(["--input", SCHEMA_DIRECTORY])
+
+
+def test_batch_main_does_not_support_select(tmp_path):
+    with pytest.raises(SystemExit):
+        _ = batch_main(
+            [
+                "--input",
+                SCHEMA_DIRECTORY,
+                "--output",
+                str(tmp_path),
+                "--select",
+                "Model",
+            ]
+        )
+
+
+def test_batch_main_does_not_support_compiled(tmp_path):
+    with pytest.raises(SystemExit):
+        _ = batch_main(
+            [
+                "--input",
+                SCHEMA_DIRECTORY,
+                "--output",
+                str(tmp_path),
+                "--compiled",
+            ]
+        )
+
+
+def test_batch_main_fails_if_any_schema_fails(tmp_path):
+    (tmp_path / "bad.json").write_text('{"$ref": "missing.json"}')
+    code = batch_main(
+        [
+            "--input",
+            str(tmp_path / "*.json"),
+            "--output",
+            str(tmp_path / "out"),
+        ]
+    )
+    assert code == 1
+
+
+@pytest.fixture()
+def schemas(tmp_path):
+    """Write two schemas, one of which refers to a shared document."""
+
+    def _write(name, schema):
+        (tmp_path / name).write_text(json.dumps(schema))
+        get_document.cache_clear()
+
+    _write(
+        "shared.json",
+        {"type": "object", "properties": {"value": {"type": "integer"}}},
+    )
+    _write(
+        "parent.json",
+        {
+            "type": "object",
+            "title": "Parent",
+            "properties": {"shared": {"$ref": "shared.json#/"}},
+        },
+    )
+    _write("other.json", {"type": "object", "title": "Other"})
+    return _write
+
+
+def _generated(results):
+    return sorted(
+        os.path.basename(result.output)
+        for result in results
+        if not result.skipped
+    )
+
+
+def test_incremental_batch_skips_current_outputs(tmp_path, schemas):
+    inputs = [str(tmp_path / "parent.json"), str(tmp_path / "other.json")]
+    output_dir = str(tmp_path / "out")
+    generate = lambda: generate_batch(
+        inputs, output_dir, jobs=1, incremental=True
+    )
+    assert _generated(generate()) == ["other.py", "parent.py"]
+    assert _generated(generate()) == []
+    schemas(
+        "shared.json",
+        {"type": "object", "properties": {"value": {"type": "string"}}},
+    )
+    assert _generated(generate()) == ["parent.py"]
+    with open(os.path.join(output_dir, "parent.py"), encoding="utf8") as file:
+        assert "value: Maybe[str]" in file.read()
+    os.remove(os.path.join(output_dir, "other.py"))
+    assert _generated(generate()) == ["other.py"]
+
+
+@pytest.mark.usefixtures("schemas")
+def test_incremental_batch_regenerates_on_version_change(tmp_path, monkeypatch):
+    inputs = [str(tmp_path / "other.json")]
+    _ = generate_batch(inputs, str(tmp_path), jobs=1, incremental=True)
+    monkeypatch.setattr(batch, "__version__", "0.0.0")
+    results = generate_batch(inputs, str(tmp_path), jobs=1, incremental=True)
+    assert _generated(results) == ["other.py"]
+
+
+@pytest.mark.usefixtures("schemas")
+def test_incremental_batch_retries_failures(tmp_path):
+    inputs = [str(tmp_path / "parent.json")]
+    os.rename(tmp_path / "shared.json", tmp_path / "moved.json")
+    get_document.cache_clear()
+    results = generate_batch(inputs, str(tmp_path), jobs=1, incremental=True)
+    assert results[0].error
+    os.rename(tmp_path / "moved.json", tmp_path / "shared.json")
+    results = generate_batch(inputs, str(tmp_path), jobs=1, incremental=True)
+    assert _generated(results) == ["parent.py"]
+    assert not results[0].error
+
+
+def test_batch_loads_shared_documents_once(tmp_path, schemas, monkeypatch):
+    reads = []
+    read = loader._read_document_content
+    monkeypatch.setattr(
+        loader,
+        "_read_document_content",
+        lambda base_uri: reads.append(base_uri) or read(base_uri),
+    )
+    names = ("first", "second", "third")
+    for name in names:
+        schemas(
+            f"{name}.json",
+            {
+                "type": "object",
+                "title": name,
+                "properties": {"shared": {"$ref": "shared.json#/"}},
+            },
+        )
+    inputs = [str(tmp_path / f"{name}.json") for name in names]
+    results = generate_batch(inputs, str(tmp_path / "out"), jobs=1)
+    assert not any(result.error for result in results)
+    shared = str(tmp_path / "shared.json")
+    assert reads.count(shared) == 1
+    for result in results:
+        assert shared in result.documents
+
+
+@pytest.mark.usefixtures("schemas")
+def test_dependency_manifest_records_documents(tmp_path):
+    inputs = [str(tmp_path / "parent.json")]
+    _ = generate_batch(inputs, str(tmp_path / "out"), jobs=2)
+    manifest = DependencyManifest(str(tmp_path / "out" / MANIFEST_NAME))
+    (dependencies,) = manifest.entries.values()
+    assert list(manifest.entries) == ["parent.py"]
+    assert dependencies.input == f"{inputs[0]}#/"
+    assert dependencies.documents == {
+        str(tmp_path / name): document_hash(str(tmp_path / name))
+        for name in ("parent.json", "shared.json")
+    }
+
+
+def test_corrupt_dependency_manifest_is_ignored(tmp_path):
+    (tmp_path / MANIFEST_NAME).write_text("[1, 2, 3]")
+    assert DependencyManifest(str(tmp_path / MANIFEST_NAME)).entries == {}
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = perf_counter() + timeout
+    while not condition():
+        assert perf_counter() < deadline, "Timed out waiting for condition."
+        sleep(0.01)
+
+
+def test_watch_regenerates_changed_outputs(tmp_path, schemas):
+    reports = []
+    stop = Event()
+    thread = Thread(
+        target=watch,
+        args=(str(tmp_path / "*.json"), str(tmp_path / "out")),
+        kwargs={
+            "report": lambda results, _: reports.append(_generated(results)),
+            "interval": 0.01,
+            "stop": stop,
+        },
+    )
+    thread.start()
+    try:
+        _wait_for(lambda: len(reports) == 1)
+        assert reports[0] == ["other.py", "parent.py", "shared.py"]
+        schemas(
+            "shared.json",
+            {"type": "object", "properties": {"value": {"type": "string"}}},
+        )
+        _wait_for(lambda: len(reports) == 2)
+        assert reports[1] == ["parent.py", "shared.py"]
+        schemas("new.json", {"type": "object", "title": "New"})
+        _wait_for(lambda: len(reports) == 3)
+        assert reports[2] == ["new.py"]
+    finally:
+        stop.set()
+        thread.join()
+    assert not list(get_document)
+
+
+def test_document_store_keeps_documents_until_invalidated(tmp_path, schemas):
+    store = DocumentStore()
+    path = str(tmp_path / "shared.json")
+    document = store(path)
+    assert store(path) is document
+    schemas("shared.json", {"type": "string"})
+    assert store(path) is document
+    store.invalidate([path])
+    assert store(path) == {"type": "string"}
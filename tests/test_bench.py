@@ -0,0 +1,207 @@
+import json
+from typing import Any
+
+import pytest
+
+from statham.__main__ import bench_main
+from statham.bench import (
+    bench,
+    BenchReport,
+    format_bench,
+    generate_samples,
+    load_samples,
+    PHASES,
+)
+from statham.schema.elements import (
+    AnyOf,
+    Array,
+    Boolean,
+    Element,
+    Integer,
+    Null,
+    Number,
+    Object,
+    OneOf,
+    String,
+)
+from statham.schema.property import Property
+
+
+@pytest.fixture()
+def schema(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(
+        json.dumps(
+            {
+                "type": "object",
+                "title": "Model",
+                "properties": {
+                    "value": {"type": "string", "minLength": 2},
+                    "items": {
+                        "type": "array",
+                        "items": {
+                            "anyOf": [{"type": "string"}, {"type": "integer"}]
+                        },
+                    },
+                },
+            }
+        )
+    )
+    return str(path)
+
+
+def test_bench_with_generated_samples():
+    report = bench("tests/jsonschemas/simple.json#/", count=5, repeat=2)
+    assert set(report.phases) == set(PHASES)
+    assert all(seconds >= 0 for seconds in report.phases.values())
+    assert report.samples == 5
+    assert report.generated
+    assert report.failures == 0
+    assert len(report.latencies) == 10
+    paths = {entry.path for entry in report.elements}
+    assert {"List[SimpleSchema]", "List[SimpleSchema][]"} <= paths
+    assert "format" in {entry.keyword for entry in report.keywords}
+
+
+def test_bench_with_provided_samples(schema):
+    report = bench(
+        schema + "#/",
+        [{"value": "ab", "items": ["a", 1]}, {"value": "a"}, {"value": 1}],
+        repeat=1,
+    )
+    assert not report.generated
+    assert report.failures == 2
+    elements = {entry.path: entry for entry in report.elements}
+    assert set(elements) == {
+        "Model",
+        "Model.value",
+        "Model.items",
+        "Model.items[]",
+        "Model.items[]<str>",
+        "Model.items[]<int>",
+    }
+    counts = {
+        name: (entry.calls, entry.failures) for name, entry in elements.items()
+    }
+    assert counts["Model"] == (3, 2)
+    assert counts["Model.value"] == (3, 2)
+    assert counts["Model.items[]<str>"] == (2, 1)
+    # Options after the first match of "anyOf" are not evaluated.
+    assert counts["Model.items[]<int>"] == (1, 0)
+    for entry in report.elements:
+        assert 0 <= entry.own_seconds <= entry.seconds
+    keywords = {entry.keyword: entry for entry in report.keywords}
+    assert keywords["minLength"].failures == 1
+    assert keywords["type"].failures == 2
+
+
+def test_report_percentiles():
+    report = BenchReport({}, 4, True, 0, [0.4, 0.1, 0.3, 0.2], [], [])
+    assert report.percentile(50) == 0.2
+    assert report.percentile(99) == 0.4
+    assert report.percentile(0) == 0.1
+    assert report.throughput == pytest.approx(4)
+    assert report._replace(latencies=[]).percentile(50) == 0.0
+
+
+def test_format_bench(schema):
+    output = format_bench(bench(schema, count=3, repeat=1), top=1)
+    for phase in PHASES:
+        assert phase in output
+    assert "Validation of 3 generated samples, 3 times in total:" in output
+    assert "Most expensive elements:" in output
+    assert "Most expensive keywords:" in output
+    assert len(output.splitlines()) == 18
+
+
+class Nested(Object):
+    flag = Property(Boolean(), required=True)
+    nested: Any = Property(Element())
+
+
+class Model(Object):
+    id = Property(String(format="uuid"), required=True)
+    created = Property(String(format="date-time"), required=True)
+    name = Property(String(minLength=2, maxLength=4), required=True)
+    code = Property(String(pattern="^a+$", minLength=1), required=True)
+    kind = Property(String(enum=["a", "b"]), required=True)
+    version = Property(Integer(const=2), required=True)
+    count = Property(Integer(minimum=3, exclusiveMaximum=6), required=True)
+    size = Property(Number(exclusiveMinimum=0, multipleOf=0.5), required=True)
+    ratio = Property(Number(minimum=-1, maximum=1), required=True)
+    flags = Property(Array(Boolean(), minItems=1, maxItems=2), required=True)
+    empty = Property(Null(), required=True)
+    either = Property(AnyOf(String(), Integer()), required=True)
+    one = Property(OneOf(Null(), Nested), required=True)
+    children = Property(Array(Nested))
+
+
+def test_generated_samples_are_valid():
+    samples = generate_samples(Model, 50, seed=1)
+    assert samples == generate_samples(Model, 50, seed=1)
+    assert samples != generate_samples(Model, 50, seed=2)
+    for sample in samples:
+        _ = Model(sample)
+    assert any("children" in sample for sample in samples)
+
+
+@pytest.mark.parametrize(
+    "element",
+    [
+        Integer(maximum=-5),
+        Integer(exclusiveMinimum=200),
+        Integer(maximum=3, multipleOf=7),
+        Number(exclusiveMaximum=-3.5),
+        Number(minimum=1e6, multipleOf=0.5),
+        String(maxLength=0),
+        String(minLength=20),
+        Array(Integer(), maxItems=0),
+        Array(Integer(), minItems=5),
+    ],
+)
+def test_generated_samples_within_one_sided_bounds(element):
+    for sample in generate_samples(element, 20):
+        _ = element(sample)
+
+
+def test_generated_samples_are_bounded():
+    class Tree(Object):
+        value = Property(Integer(), required=True)
+
+    Tree.properties = {
+        **Tree.properties,
+        "children": Property(Array(Tree, minItems=1)),
+    }
+    for sample in generate_samples(Tree, 20):
+        _ = Tree(sample)
+
+
+def test_load_samples(tmp_path):
+    path = tmp_path / "samples.json"
+    path.write_text(json.dumps([{"a": 1}, 2]))
+    assert load_samples(str(path)) == [{"a": 1}, 2]
+    path = tmp_path / "samples.jsonl"
+    path.write_text('{"a": 1}\n\n[2]\n')
+    assert load_samples(str(path)) == [{"a": 1}, [2]]
+    path = tmp_path / "sample.json"
+    path.write_text(json.dumps({"a": 1}))
+    with pytest.raises(ValueError):
+        _ = load_samples(str(path))
+
+
+def test_bench_main(schema, tmp_path, capsys):
+    samples = tmp_path / "samples.jsonl"
+    samples.write_text('{"value": "ab"}\n{"value": "a"}\n')
+    code = bench_main(
+        ["--input", schema, "--samples", str(samples), "--repeat", "2"]
+    )
+    assert code == 0
+    output = capsys.readouterr().out
+    assert "Validation of 2 provided samples, 4 times in total:" in output
+
+
+def test_bench_main_with_invalid_samples(schema, tmp_path):
+    samples = tmp_path / "samples.json"
+    samples.write_text("{}")
+    with pytest.raises(SystemExit):
+        _ = bench_main(["--input", schema, "--samples", str(samples)])
@@ -0,0 +1,224 @@
+import json
+import os
+import subprocess
+import sys
+
+from json_ref_dict.loader import get_document
+import pytest
+
+from statham import cache as cache_module
+from statham.__main__ import main
+from statham.cache import record_documents, SchemaCache
+from statham.schema.elements import meta
+
+
+@pytest.fixture()
+def schemas(tmp_path):
+    """Write a schema with a remote reference, returning the root URI."""
+
+    def _write(name, schema):
+        (tmp_path / name).write_text(json.dumps(schema))
+        get_document.cache_clear()
+
+    _write(
+        "child.json",
+        {"type": "object", "properties": {"value": {"type": "integer"}}},
+    )
+    _write(
+        "parent.json",
+        {
+            "type": "object",
+            "title": "Parent",
+            "properties": {"child": {"$ref": "child.json#/"}},
+        },
+    )
+    _write.uri = f"{tmp_path / 'parent.json'}#/"
+    return _write
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return SchemaCache(str(tmp_path / "cache"))
+
+
+def _fail(*_args, **_kwargs):
+    raise AssertionError("Cache should have been hit.")
+
+
+def test_miss_then_hit(schemas, cache):
+    first = cache.load(schemas.uri)
+    second = cache.load(schemas.uri)
+    assert second.module == first.module == main(schemas.uri)
+    assert second.elements == first.elements
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.size > 0
+
+
+def test_hit_skips_resolution_and_parsing(schemas, cache, monkeypatch):
+    expected = cache.load(schemas.uri)
+    monkeypatch.setattr(cache_module, "RefDict", _fail)
+    monkeypatch.setattr(cache_module, "parse", _fail)
+    assert cache.load(schemas.uri).module == expected.module
+
+
+def test_hit_in_new_process_rebuilds_models(schemas, cache, monkeypatch):
+    expected = cache.load(schemas.uri)
+    monkeypatch.setattr(meta, "_PICKLED_MODELS", {})
+    monkeypatch.setattr(meta, "_REBUILT_MODELS", {})
+    parent = SchemaCache(cache.directory).load(schemas.uri).elements[0]
+    assert parent is not expected.elements[0]
+    assert parent == expected.elements[0]
+    assert parent({"child": {"value": 1}}).child.value == 1
+
+
+def test_referenced_document_change_is_a_miss(schemas, cache):
+    _ = cache.load(schemas.uri)
+    schemas(
+        "child.json",
+        {"type": "object", "properties": {"value": {"type": "string"}}},
+    )
+    entry = cache.load(schemas.uri)
+    assert "value: Maybe[str]" in entry.module
+    assert cache.stats().misses == 2
+
+
+def test_document_change_in_process_is_stored_with_new_content(
+    schemas, cache, tmp_path
+):
+    _ = cache.load(schemas.uri)
+    # Write without clearing loaded documents, as when editing a schema
+    # while a process is running.
+    (tmp_path / "child.json").write_text(
+        json.dumps(
+            {"type": "object", "properties": {"value": {"type": "string"}}}
+        )
+    )
+    assert "value: Maybe[str]" in cache.load(schemas.uri).module
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from statham.cache import SchemaCache; "
+            "cache = SchemaCache(sys.argv[1]); "
+            "print(cache.load(sys.argv[2]).module); "
+            "print(cache.stats().hits)",
+            cache.directory,
+            schemas.uri,
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    assert "value: Maybe[str]" in output
+    assert output.split()[-1] == "1"
+
+
+def test_version_change_is_a_miss(schemas, cache, monkeypatch):
+    _ = cache.load(schemas.uri)
+    monkeypatch.setattr(cache_module, "__version__", "0.0.0")
+    _ = cache.load(schemas.uri)
+    assert cache.stats().misses == 2
+
+
+def test_pointer_is_part_of_key(schemas, cache):
+    _ = cache.load(schemas.uri)
+    entry = cache.load(schemas.uri + "properties/child")
+    assert "class Child(Object)" in entry.module
+    assert cache.stats().misses == 2
+
+
+def test_selection_is_part_of_key(schemas, cache, tmp_path):
+    schemas(
+        "definitions.json",
+        {
+            "definitions": {
+                "parent": {"$ref": "parent.json#/"},
+                "other": {"type": "object", "title": "Other"},
+            }
+        },
+    )
+    uri = f"{tmp_path / 'definitions.json'}#/"
+    whole = cache.load(uri)
+    selected = cache.load(uri, select=["parent"])
+    assert "class Other(Object)" in whole.module
+    assert "class Other(Object)" not in selected.module
+    assert "class Parent(Object)" in selected.module
+    assert selected.module == main(uri, select=["parent"])
+    assert cache.load(uri, select=["parent"]).module == selected.module
+    assert (cache.stats().hits, cache.stats().misses) == (1, 2)
+
+
+def test_corrupt_entry_is_a_miss(schemas, cache):
+    _ = cache.load(schemas.uri)
+    entries = os.path.join(cache.directory, "entries")
+    for name in os.listdir(entries):
+        with open(os.path.join(entries, name), "wb") as file:
+            file.write(b"corrupt")
+    assert cache.get(schemas.uri) is None
+
+
+def test_missing_document_is_a_miss(schemas, cache, tmp_path):
+    _ = cache.load(schemas.uri)
+    os.remove(tmp_path / "child.json")
+    get_document.cache_clear()
+    assert cache.get(schemas.uri) is None
+
+
+def _entry_names(cache):
+    return set(os.listdir(os.path.join(cache.directory, "entries")))
+
+
+def test_least_recently_used_entries_are_evicted(schemas, cache):
+    cache.max_entries = 2
+    first, second = schemas.uri, schemas.uri + "properties/child"
+    _ = cache.load(first)
+    (first_name,) = _entry_names(cache)
+    _ = cache.load(second)
+    (second_name,) = _entry_names(cache) - {first_name}
+    entries = os.path.join(cache.directory, "entries")
+    os.utime(os.path.join(entries, first_name), (0, 0))
+    os.utime(os.path.join(entries, second_name), (1, 1))
+    _ = cache.load(first)  # A hit marks the entry as recently used.
+    _ = cache.load(schemas.uri + "properties")
+    stats = cache.stats()
+    assert (stats.entries, stats.evictions) == (2, 1)
+    assert first_name in _entry_names(cache)
+    assert second_name not in _entry_names(cache)
+
+
+def test_entries_are_evicted_over_max_size(schemas, cache):
+    cache.max_size = 1
+    _ = cache.load(schemas.uri)
+    assert cache.stats().entries == 0
+    assert cache.stats().evictions == 1
+
+
+def test_clear(schemas, cache):
+    _ = cache.load(schemas.uri)
+    cache.clear()
+    assert cache.stats().entries == 0
+    assert cache.get(schemas.uri) is None
+
+
+def test_record_documents(schemas, tmp_path):
+    with record_documents() as documents:
+        _ = main(schemas.uri)
+    assert documents == {
+        str(tmp_path / "parent.json"),
+        str(tmp_path / "child.json"),
+    }
+    assert not list(get_document)
+
+
+def test_main_with_cache(schemas, cache):
+    assert main(schemas.uri, cache=cache) == main(schemas.uri)
+    assert cache.stats().entries == 1
+
+
+def test_main_with_cache_compiled(schemas, cache):
+    module = main(schemas.uri, cache=cache, compiled=True)
+    assert module == main(schemas.uri, compiled=True)
+    assert "@compiled(" in module
+    assert main(schemas.uri, cache=cache) == main(schemas.uri)
+    assert cache.stats().entries == 1
@@ -1,5 +1,8 @@
 import pytest
 
+from statham.schema.elements import Element, Integer
+from statham.schema.elements.meta import ObjectMeta
+from statham.schema.helpers import keyword_table
 from statham.schema.parser import _title_format
 
 
@@ -39,3 +42,42 @@ def test_title_format_produces_expected_output(title: str, expected: str):
     assert (
         actual == expected
     ), f"Expected '{title}' --> '{expected}', got '{actual}'"
+
+
+def test_keyword_table_is_built_at_class_definition():
+    class MyElement(Element):
+        def __init__(self, value, *, flag: bool = False):
+            super().__init__()
+            self.value = value
+            self.flag = flag
+
+    assert "__keywords__" in vars(MyElement)
+    table = keyword_table(MyElement)
+    assert [param.name for param in table.parameters] == ["value", "flag"]
+    assert table.names == {"value", "flag"}
+    assert [param.name for param in table.keyword_only] == ["flag"]
+    assert table.keyword_only[0].default is False
+
+
+def test_keyword_table_is_not_inherited():
+    assert keyword_table(Integer) is not keyword_table(Element)
+    assert "items" not in keyword_table(Integer).names
+    assert "minimum" in keyword_table(Integer).names
+
+
+def test_keyword_table_uses_metaclass_constructor_for_models():
+    names = [param.name for param in keyword_table(ObjectMeta).keyword_only]
+    assert "additionalProperties" in names
+    assert "classdict" not in names
+
+
+def test_keyword_table_built_on_first_use_for_other_types():
+    class Other:
+        def __init__(self, *values, key=None):
+            self.values = values
+            self.key = key
+
+    assert "__keywords__" not in vars(Other)
+    table = keyword_table(Other)
+    assert table is keyword_table(Other)
+    assert table.parameters[0].kind == table.parameters[0].VAR_POSITIONAL
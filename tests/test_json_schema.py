@@ -11,6 +11,7 @@ from json_ref_dict.loader import get_document
 from json_ref_dict.ref_pointer import resolve_uri
 import pytest
 
+from statham.schema import optimize  # pylint: disable=no-name-in-module
 from statham.schema.parser import parse_element
 from statham.schema.exceptions import (
     FeatureNotImplementedError,
@@ -136,13 +137,16 @@ def _extract_tests(directory: str) -> Iterator[Param]:
                     yield pytest.param(param, marks=param.marks)  # type: ignore
 
 
+@pytest.mark.parametrize("optimized", [False, True], ids=["", "optimized"])
 @pytest.mark.parametrize("param", _extract_tests(DIRECTORY), ids=str)
-def test_jsonschema_official_test(param: Param):
+def test_jsonschema_official_test(param: Param, optimized: bool):
     schema = _load_schema(param.schema)
     try:
         element = parse_element(schema)
     except FeatureNotImplementedError:
         return
+    if optimized:
+        element = optimize(element)
     with no_raise() if param.valid else pytest.raises(  # type: ignore
         (TypeError, ValidationError)
     ):
@@ -1,3 +1,9 @@
+import pkgutil
+import subprocess
+import sys
+
+import pytest
+
 import statham
 
 
@@ -15,3 +21,51 @@ def test_that_library_version_is_semantic():
             assert (
                 False
             ), f"{subversion}={value} is not a valid integer version."
+
+
+PUBLIC_MODULES = sorted(
+    info.name
+    for info in pkgutil.walk_packages(statham.__path__, "statham.")
+    if not any(
+        part.startswith("_") and part != "__main__"
+        for part in info.name.split(".")
+    )
+)
+
+
+@pytest.mark.parametrize("module", PUBLIC_MODULES)
+def test_public_module_imports_in_fresh_interpreter(module):
+    subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+    )
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["dateutil", "json_ref_dict", "statham.schema.optimizer", "yaml"],
+)
+def test_elements_do_not_import_heavy_modules(module):
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, statham.schema.elements; print(*sys.modules)",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    assert module not in output.split()
+
+
+def test_schema_package_exposes_optimize():
+    # pylint: disable=import-outside-toplevel
+    import statham.schema
+    from statham.schema import optimize  # pylint: disable=no-name-in-module
+    from statham.schema.optimizer import optimize as _optimize
+
+    assert optimize is _optimize
+    with pytest.raises(AttributeError):
+        _ = statham.schema.missing
@@ -3,13 +3,23 @@ from unittest.mock import patch, mock_open
 
 import pytest
 
-from statham.__main__ import parse_args, parse_input_arg
+from statham.__main__ import package_main, parse_args, parse_input_arg
 
 
 def test_arg_parser_stdout():
-    with parse_args(["--input", "foo.py"]) as (input_uri, output):
+    with parse_args(["--input", "foo.py"]) as (input_uri, output, cache):
         assert output == stdout
         assert input_uri == "foo.py#/"
+        assert cache is None
+
+
+def test_arg_parser_cache():
+    with parse_args(["--input", "foo.py", "--cache", "bar"]) as (
+        _,
+        _,
+        cache,
+    ):
+        assert cache == "bar"
 
 
 @pytest.fixture()
@@ -29,11 +39,48 @@ def test_arg_parser_output_dir(_mock_open_file, _is_dir):
     with parse_args(["--input", "foo.py", "--output", "bar"]) as (
         input_uri,
         output,
+        cache,
     ):
         assert input_uri == "foo.py#/"
+        assert cache is None
         assert output.read() == "data"
 
 
 @pytest.mark.parametrize("input_arg", ["foo.json", "foo.json#/"])
 def test_input_argparse(input_arg: str):
     assert parse_input_arg(input_arg) == "foo.json#/"
+
+
+def test_package_main(tmp_path):
+    output = tmp_path / "models"
+    code = package_main(
+        ["--input", "tests/jsonschemas/simple.json", "--output", str(output)]
+    )
+    assert code == 0
+    assert sorted(path.name for path in output.iterdir()) == [
+        "__init__.py",
+        "nested_schema.py",
+        "simple_schema.py",
+    ]
+
+
+def test_package_main_compiled(tmp_path):
+    output = tmp_path / "models"
+    code = package_main(
+        [
+            "--input",
+            "tests/jsonschemas/simple.json",
+            "--output",
+            str(output),
+            "--compiled",
+        ]
+    )
+    assert code == 0
+    assert (
+        "@compiled(NestedSchema)" in (output / "nested_schema.py").read_text()
+    )
+
+
+def test_package_main_requires_output():
+    with pytest.raises(SystemExit):
+        _ = package_main(["--input", "tests/jsonschemas/simple.json"])